@@ -8,12 +8,17 @@ import json
 # Import game modules
 from game_structure import GameState, Player
 from map_system import Level, Tile, Camera
+from entity_system import World, Collider, Interactable
 from character_system import Character, Player as PlayerCharacter, NPC as NPCCharacter
 from dialogue_quest_system import DialogueManager, QuestManager, Quest
+from event_system import EventBus, LOCATION_ENTERED, NPC_TALKED
+from string_table import Localization, location_section
 from item_inventory import Inventory, ItemFactory
-from space_travel_system import SystemMap, Location
-from save_system import SaveSystem, SaveLoadMenu
+from space_travel_system import SystemMap, Location, MAP_ZOOM_STEPS, SpaceTravel as Autopilot
+from orbital_system import OrbitalSystem
+from save_system import SaveSystem, SaveLoadMenu, apply_ship_state
 from merchant_system import MerchantSystem
+from market_system import Market
 
 # Initialize Pygame
 pygame.init()
@@ -31,6 +36,10 @@ RED = (255, 0, 0)
 BLUE = (0, 0, 255)
 SPACE_BG = (5, 5, 20)
 
+# Courses offered from the ship cabin (the cheapest ones, so they fit on number keys)
+MAX_COURSE_OPTIONS = 7
+COURSE_PREFIX = "course:"  # Travel menu ids for plotted courses, e.g. "course:ceres"
+
 # Set up the display - pure Pygame, no OpenGL
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Asteroid Frontier")
@@ -58,6 +67,18 @@ class AsteroidFrontier:
         # Create game systems
         self.dialogue_manager = DialogueManager(SCREEN_WIDTH, SCREEN_HEIGHT)
         self.quest_manager = QuestManager()
+        self.dialogue_manager.quest_manager = self.quest_manager
+        
+        # Text comes from the string tables when they have been built (string_table.build_string_tables)
+        self.localization = Localization("en")
+        self.loaded_string_section = None
+        if self.localization.available:
+            self.dialogue_manager.strings = self.localization
+        self.dialogue_manager.load_dialogue_pack()  # Precompiled graphs, if the pack was built
+        
+        # Game events drive quest objectives instead of polling
+        self.event_bus = EventBus()
+        self.quest_manager.attach_event_bus(self.event_bus)
 
         # Initialize empty objects for safety
         self.current_level = None
@@ -68,6 +89,11 @@ class AsteroidFrontier:
         self.locations_data = self.load_locations()
         self.quests_data = self.load_quests()
         self.items_data = self.load_items()
+        self.quest_manager.load_quests(self.quests_data)
+        
+        # Resource prices for every location, recovering as the player travels
+        self.market = Market(self.locations_data)
+        self.market.attach_event_bus(self.event_bus)
         
         # Create solar system map
         self.system_map = self.create_system_map()
@@ -79,6 +105,11 @@ class AsteroidFrontier:
         # Create locations
         self.locations = self.create_locations()
         self.docked_location = "psyche_township"
+        self.sync_map_location()
+        self.course_options = {}  # Filled when the ship cabin's travel menu opens
+        self.autopilot = None  # Flies plotted courses (created with the first one)
+        self.course_destination = None  # Map body the autopilot is flying to
+        self.encounter_notice = None  # HUD text while an encounter holds the ship
         
         # Try to load initial player location - use a fallback to ensure we have a valid current_level
         success = self.load_location("psyche_township")
@@ -104,8 +135,12 @@ class AsteroidFrontier:
         self.show_map = False
         self.show_quest_log = False
 
-        # Initialize resource tracking
+        # Initialize resource tracking (the asteroid field fills this same dict once space is entered)
         self.collected_resources = {}
+        self.pending_ship_state = None  # Saved ship stats waiting for the space scene
+        
+        # Saving (F5/F9 and the save menus)
+        self.add_save_system()
     
     def load_npcs(self):
         """Load NPC data from JSON file"""
@@ -117,6 +152,27 @@ class AsteroidFrontier:
             print(f"Error loading NPCs: {e}")
             return []
 
+    def bind_npc_quest(self, npc):
+        """Point an NPC at the quest it should offer, given the current quest state"""
+        quest_ids = getattr(npc, 'quest_ids', [])
+        if not quest_ids:
+            return
+        
+        # Offer the first tracked quest that is active or unlocked
+        quest = self.quest_manager.next_quest_for(quest_ids)
+        if quest is None and not any(q in self.quest_manager.quests for q in quest_ids):
+            quest = Quest(quest_ids[0], f"{npc.name}'s Task", 
+                       "Help with an important task.", ["Complete the objective"])
+            quest.credit_reward = 100
+            quest.xp_reward = 50
+        npc.quest = quest
+        npc.quest_offered = quest is not None and quest.id in self.quest_manager.graph.active
+    
+    def refresh_npc_quests(self):
+        """Re-bind every NPC in the current location (after quest state changes wholesale, e.g. a load)"""
+        for npc in self.npcs:
+            self.bind_npc_quest(npc)
+    
     def load_npcs_from_json(self, location_id):
         """Load NPCs for a location from the npcs.json file"""
         try:
@@ -146,15 +202,11 @@ class AsteroidFrontier:
                 
                     # Set faction
                     npc.faction = npc_data.get("faction", "independent")
+                    npc.npc_id = npc_data.get("id")
                 
                     # Add quests if available
-                    quest_ids = npc_data.get("quests", [])
-                    if quest_ids:
-                        quest = Quest(quest_ids[0], f"{npc.name}'s Task", 
-                                   "Help with an important task.", ["Complete the objective"])
-                        quest.credit_reward = 100
-                        quest.xp_reward = 50
-                        npc.quest = quest
+                    npc.quest_ids = npc_data.get("quests", [])
+                    self.bind_npc_quest(npc)
                 
                     # Set full dialogue data for proper conversations
                     npc.full_dialogue = dialogue_data
@@ -229,16 +281,28 @@ class AsteroidFrontier:
             # Special locations
             {"id": "rusty_rocket", "name": "Rusty Rocket", "faction": "independent", "radius": 640, "angle": 50}
         ]
+        
+        # Stations, belts and POIs from locations.json join the map when they have an orbit
+        # ("orbit": {"radius": 600, "angle": 90, "connections": ["ceres"]})
+        extra_connections = {}
+        for loc in self.locations_data:
+            orbit = loc.get("orbit")
+            if orbit:
+                locations.append({"id": loc["id"], "name": loc["name"], "faction": loc.get("faction", "independent"),
+                                  "radius": orbit["radius"], "angle": orbit["angle"]})
+                extra_connections[loc["id"]] = orbit.get("connections", [])
     
         # Store the locations for space travel use
         self.map_locations = {}
+        
+        # Everything orbits the sun; positions advance with game time
+        self.orbits = OrbitalSystem(center=(center_x, center_y))
     
         # Add locations to map
         for loc in locations:
             # Calculate cartesian coordinates from orbital parameters
-            angle_rad = math.radians(loc["angle"])
-            x = center_x + loc["radius"] * math.cos(angle_rad)
-            y = center_y + loc["radius"] * math.sin(angle_rad)
+            self.orbits.add_body(loc["id"], loc["radius"], loc["angle"])
+            x, y = self.orbits.position(loc["id"])
         
             location = Location(loc["name"], f"{loc['name']} - {loc['faction']} control", 
                               f"{loc['id']}_map.csv", position=(x, y), faction=loc["faction"])
@@ -251,10 +315,17 @@ class AsteroidFrontier:
                 "pos": [x * 6, y * 6],  # Scale up for space travel
                 "color": self.get_faction_color(loc["faction"]),
                 "faction": loc["faction"],
-                "radius": loc["radius"],  # Store orbital data for possible animations
+                "radius": loc["radius"],  # Orbital data (the orbital system moves the position)
                 "angle": loc["angle"]
             }
     
+        # A body is as dangerous as the worst place on it (locations.json danger_level)
+        for loc in self.locations_data:
+            map_id = loc["id"] if loc["id"] in system_map.locations else loc.get("body")
+            if map_id in system_map.locations:
+                location = system_map.locations[map_id]
+                location.danger_level = max(location.danger_level, loc.get("danger_level", 0))
+    
         # Add orbital rings to the map
         system_map.orbital_rings = [150, 250, 350, 450, 650, 850, 1000]
     
@@ -288,12 +359,125 @@ class AsteroidFrontier:
                         dy = location.position[1] - dest.position[1]
                         distance = int(math.sqrt(dx*dx + dy*dy))
                         location.add_connection(conn, distance)
+        
+        # Connections from locations.json go both ways
+        for loc_id, connections in extra_connections.items():
+            location = system_map.locations[loc_id]
+            for conn in connections:
+                dest = system_map.locations.get(conn)
+                if dest:
+                    dx = location.position[0] - dest.position[0]
+                    dy = location.position[1] - dest.position[1]
+                    distance = int(math.sqrt(dx*dx + dy*dy))
+                    location.add_connection(conn, distance)
+                    dest.add_connection(loc_id, distance)
     
         # Set player location - start at Earth, Luna, or Mars
         system_map.set_player_location("mars")
     
         return system_map
     
+    def map_location_for(self, location_id):
+        """The system map body a location is on (itself if it's on the map, else its "body" in locations.json)"""
+        if location_id in self.system_map.locations:
+            return location_id
+        for loc in self.locations_data:
+            if loc.get('id') == location_id:
+                return loc.get('body')
+        return None
+    
+    def landing_site(self, map_id):
+        """Where the ship docks at a system map body (a location with a map if there is one)"""
+        if any(loc.get('id') == map_id for loc in self.locations_data):
+            return map_id
+        for loc in self.locations_data:
+            if loc.get('body') == map_id:
+                return loc['id']
+        return map_id
+    
+    def sync_map_location(self):
+        """Keep the system map's player location on the body the ship is docked at"""
+        map_id = self.map_location_for(self.docked_location) if self.docked_location else None
+        if map_id:
+            self.system_map.set_player_location(map_id)
+    
+    def get_course_options(self):
+        """Planned routes from the ship's body, cheapest first (menu ids -> travel option)"""
+        options = self.system_map.get_travel_options("cost")
+        cheapest = sorted(options.items(), key=lambda item: item[1]["cost"])[:MAX_COURSE_OPTIONS]
+        return {COURSE_PREFIX + map_id: option for map_id, option in cheapest}
+    
+    def plot_course(self, map_id):
+        """Fly a planned route on autopilot: pay its cost now, dock when the trip's events have played out"""
+        option = self.system_map.get_travel_options("cost").get(map_id)
+        if option is None:
+            print(f"No route to {map_id}")
+            return False
+        
+        if self.autopilot is None:
+            self.autopilot = Autopilot(self.system_map, self.player)
+        
+        # Charges the planned cost and queues the trip's events on its scheduler
+        if not self.autopilot.start_travel(map_id, "cost"):
+            print(f"Can't start the trip to {map_id} ({option['cost']} credits needed)")
+            return False
+        
+        self.course_destination = map_id
+        self.docked_location = None  # Underway
+        print(f"Course plotted to {map_id} via {' -> '.join(option['route'])} for {option['cost']} credits")
+        return True
+    
+    def update_autopilot(self, dt):
+        """Advance a plotted course, stopping for encounters and docking on arrival"""
+        if self.autopilot is None or self.course_destination is None:
+            return
+        
+        self.autopilot.update(dt)
+        
+        if self.autopilot.travel_state == "encounter":
+            if self.encounter_notice is None:
+                encounter = self.autopilot.current_encounter["type"].replace("_", " ").title()
+                self.encounter_notice = f"{encounter}! Use the helm to break away"
+                print(f"Autopilot stopped: {encounter}")
+        elif self.autopilot.travel_state == "idle":
+            # complete_travel() has moved the map location to the destination
+            self.docked_location = self.landing_site(self.course_destination)
+            print(f"Autopilot arrived at {self.course_destination}, docked at {self.docked_location}")
+            self.course_destination = None
+            self.encounter_notice = None
+    
+    def advance_orbits(self, dt):
+        """Move planets along their orbits and push the new positions to the map and space scene"""
+        moved = self.orbits.advance(dt)
+        if not moved:
+            return
+        
+        positions = self.orbits.positions(moved)
+        self.system_map.update_positions(positions)
+        
+        for loc_id, (x, y) in positions.items():
+            self.map_locations[loc_id]["pos"] = [x * 6, y * 6]  # Space mode is 6x the map scale
+            if self.space_travel and loc_id in self.space_travel.locations:
+                self.space_travel.locations[loc_id]['pos'] = [x * 6, y * 6]
+    
+    def zoom_map(self, steps, focus=None):
+        """Change the map tab's zoom level, keeping the point under focus (screen pixels) in place"""
+        if not hasattr(self, 'map_offset'):
+            self.map_offset = [0, 0]
+        old_zoom = getattr(self, 'map_zoom', 0)
+        self.map_zoom = max(0, min(len(MAP_ZOOM_STEPS) - 1, old_zoom + steps))
+        if self.map_zoom == old_zoom or not hasattr(self, 'map_view'):
+            return
+        
+        # Zoom around the mouse, or the middle of the map if there isn't one
+        origin, map_area = self.map_view
+        if focus is None or not map_area.collidepoint(focus):
+            focus = map_area.center
+        ratio = MAP_ZOOM_STEPS[self.map_zoom] / MAP_ZOOM_STEPS[old_zoom]
+        for axis in (0, 1):
+            from_origin = focus[axis] - origin[axis]
+            self.map_offset[axis] = int(round(from_origin - (from_origin - self.map_offset[axis]) * ratio))
+    
     def get_faction_color(self, faction):
         """Get color based on faction"""
         if faction == "earth":
@@ -426,10 +610,12 @@ class AsteroidFrontier:
 
             # Load NPCs from JSON
             self.npcs = self.load_npcs_from_json(location_id)
+            self.load_location_strings(location_id)
         
             # Update camera with map size
             self.camera.set_map_size(self.current_level["width"], self.current_level["height"])
         
+            self.event_bus.publish(LOCATION_ENTERED, location=location_id)
             return True
         
         except Exception as e:
@@ -437,6 +623,26 @@ class AsteroidFrontier:
             self.create_default_level()
             return False  # Still return False to indicate failure
     
+    def load_location_strings(self, location_id):
+        """Swap in the NPC string table for a location, dropping the previous one"""
+        if not self.dialogue_manager.strings:
+            return
+        
+        section = location_section(location_id)
+        if section != self.loaded_string_section:
+            if self.loaded_string_section:
+                self.localization.unload_section(self.loaded_string_section)
+            self.localization.load_section(section)
+            self.loaded_string_section = section
+    
+    def talk_to_npc(self, npc):
+        """Open dialogue with an NPC and let listeners know about it"""
+        self.dialogue_manager.start_dialogue(npc, self.player)
+        self.game_state = GameState.DIALOGUE
+        
+        location = self.current_level.get("name") if self.current_level else None
+        self.event_bus.publish(NPC_TALKED, npc=getattr(npc, 'npc_id', None), location=location)
+    
     def create_default_level(self):
         """Create a simple default level as fallback"""
         print("Creating default level")
@@ -465,44 +671,34 @@ class AsteroidFrontier:
             self.near_exit = False
             return False
         
-        # Make sure we have the objects sprite group
-        if "objects" not in self.current_level or not self.current_level["objects"]:
-            return False
-    
-        # Get all exit objects
-        exits = [obj for obj in self.current_level["objects"] if hasattr(obj, 'is_exit')]
-    
-        if not exits:
+        # Make sure we have the level's entity world
+        world = self.current_level.get("world")
+        if world is None:
             self.near_exit = False
             return False
     
-        # Check each exit tile
-        for exit_tile in exits:
-            # Calculate distance to exit
-            dx = self.player.rect.centerx - exit_tile.rect.centerx
-            dy = self.player.rect.centery - exit_tile.rect.centery
-            distance = math.sqrt(dx**2 + dy**2)
+        # Find the closest exit within interaction range
+        nearest_exit = world.find_nearest_interactable(self.player.rect.centerx, self.player.rect.centery,
+                                                       TILE_SIZE * 1.5, "exit")
+        if nearest_exit:
+            self.near_exit = True
         
-            # If within interaction range
-            if distance < TILE_SIZE * 1.5:
-                self.near_exit = True
-            
-                # Only show travel menu if E key is pressed
-                keys = pygame.key.get_pressed()
-                if keys[pygame.K_e]:
-                    # Special handling for ship cabin
-                    if self.current_level and self.current_level.get("name") == "ship_cabin":
-                        print("Exit from ship cabin detected")
-                        self.process_ship_cabin_exit()
-                        return True
-                    else:
-                        # Regular travel for other locations
-                        print("E key pressed, showing travel menu")
-                        self.show_travel_options()
-                        return True
-            
-                # Display hint even if E is not pressed
-                return False
+            # Only show travel menu if E key is pressed
+            keys = pygame.key.get_pressed()
+            if keys[pygame.K_e]:
+                # Special handling for ship cabin
+                if self.current_level and self.current_level.get("name") == "ship_cabin":
+                    print("Exit from ship cabin detected")
+                    self.process_ship_cabin_exit()
+                    return True
+                else:
+                    # Regular travel for other locations
+                    print("E key pressed, showing travel menu")
+                    self.show_travel_options()
+                    return True
+        
+            # Display hint even if E is not pressed
+            return False
     
         # Not near any exit
         self.near_exit = False
@@ -535,6 +731,10 @@ class AsteroidFrontier:
             # Always add EVA option from ship cabin
             valid_destinations.append("eva")
             print("Can perform EVA")
+            
+            # Planned courses to other bodies (not while one is being flown)
+            self.course_options = self.get_course_options() if self.course_destination is None else {}
+            valid_destinations.extend(self.course_options)
             return valid_destinations
     
         # Find current location in data
@@ -608,6 +808,10 @@ class AsteroidFrontier:
             print("Starting EVA operation")
             return self.perform_eva()
     
+        # Planned courses (picked from the ship cabin's travel menu)
+        if location_id.startswith(COURSE_PREFIX):
+            return self.plot_course(location_id[len(COURSE_PREFIX):])
+    
         # Special handling for space
         if location_id == "space":
             # This should now be handled at the helm console in the ship
@@ -685,18 +889,12 @@ class AsteroidFrontier:
         # Reset helm proximity state
         self.near_helm = False
     
-        # Find helm tiles in the map
+        # Find helm tiles registered in the level's entity world
         helm_positions = []
-        for y, row in enumerate(self.current_level.get("layout", [])):
-            for x, tile in enumerate(row):
-                if tile == 'H':  # Helm tile
-                    helm_positions.append((x * TILE_SIZE, y * TILE_SIZE))
-    
-        if not helm_positions:
-            # Search for helm tiles in the map data directly
-            for sprite in self.current_level["all_sprites"]:
-                if hasattr(sprite, 'tile_type') and sprite.tile_type == 'helm':
-                    helm_positions.append((sprite.rect.x, sprite.rect.y))
+        world = self.current_level.get("world")
+        if world is not None:
+            for _, _, collider in world.find_interactables("helm"):
+                helm_positions.append((collider.rect.x, collider.rect.y))
     
         # Check if player is near any helm position
         for helm_x, helm_y in helm_positions:
@@ -741,6 +939,16 @@ class AsteroidFrontier:
         """Handle player interaction with the ship's helm"""
         print("Interacting with ship helm")
     
+        # A plotted course keeps the helm until it arrives; taking it during an encounter breaks away
+        if self.course_destination is not None:
+            if self.autopilot.travel_state == "encounter":
+                print("Breaking away from the encounter")
+                self.autopilot.resume_travel()
+                self.encounter_notice = None
+                return True
+            print("Autopilot engaged")
+            return False
+    
         # Check if we're docked
         if hasattr(self, 'docked_location') and self.docked_location:
             # If docked, undock and enter space
@@ -761,6 +969,13 @@ class AsteroidFrontier:
             if not hasattr(self, 'space_travel') or self.space_travel is None:
                 from space_travel import SpaceTravel, AsteroidField
                 self.space_travel = SpaceTravel(SCREEN_WIDTH, SCREEN_HEIGHT)
+                self.space_travel.event_bus = self.event_bus
+                
+                # The hold is shared with the rest of the game, and a loaded save may have ship stats waiting
+                self.space_travel.asteroid_field.collected_resources = self.collected_resources
+                if getattr(self, 'pending_ship_state', None):
+                    apply_ship_state(self.space_travel, self.pending_ship_state)
+                    self.pending_ship_state = None
             
                 # Add locations to space travel
                 for loc_id, loc_data in self.map_locations.items():
@@ -773,9 +988,10 @@ class AsteroidFrontier:
                     )
         
             # If we're docked somewhere, position the ship near that location
-            if hasattr(self, 'docked_location') and self.docked_location and self.docked_location in self.map_locations:
+            dock_map_id = self.map_location_for(self.docked_location) if getattr(self, 'docked_location', None) else None
+            if dock_map_id in self.map_locations:
                 # Position ship near the docked location
-                dock_loc = self.map_locations[self.docked_location]
+                dock_loc = self.map_locations[dock_map_id]
                 self.space_travel.ship_pos[0] = dock_loc["pos"][0] + random.randint(-50, 50)
                 self.space_travel.ship_pos[1] = dock_loc["pos"][1] + random.randint(-50, 50)
                 print(f"Positioning ship near {self.docked_location}")
@@ -808,6 +1024,7 @@ class AsteroidFrontier:
             "floor": pygame.sprite.Group(),
             "objects": pygame.sprite.Group(),
             "all_sprites": pygame.sprite.Group(),
+            "world": World(),
             "width": SCREEN_WIDTH * 2,
             "height": SCREEN_HEIGHT * 2
         }
@@ -937,6 +1154,8 @@ class AsteroidFrontier:
             # Add to level
             self.current_level["objects"].add(point)
             self.current_level["all_sprites"].add(point)
+            point.entity_id = self.current_level["world"].create_entity(
+                Collider(point.rect), Interactable("repair", point))
     
         # Place player below the ship
         self.player.rect.centerx = ship_exterior.rect.centerx
@@ -1026,37 +1245,29 @@ class AsteroidFrontier:
         self.near_repair = False
         self.current_repair_point = None
     
-        # Find repair points
-        repair_points = [obj for obj in self.current_level["objects"] if hasattr(obj, 'is_repair_point')]
+        # Find the closest repair point in the EVA world
+        world = self.current_level.get("world")
+        nearest = None
+        if world is not None:
+            nearest = world.find_nearest_interactable(self.player.rect.centerx, self.player.rect.centery,
+                                                      TILE_SIZE * 2, "repair")
     
-        if not repair_points:
-            print("No repair points found in EVA mode!")
-            return False
-    
-        for point in repair_points:
-            # Calculate distance to repair point center
-            dx = self.player.rect.centerx - point.rect.centerx
-            dy = self.player.rect.centery - point.rect.centery
-            distance = math.sqrt(dx**2 + dy**2)
-    
-            # If close enough to interact
-            if distance < TILE_SIZE * 2:
-                self.near_repair = True
-                self.current_repair_point = point
+        if nearest:
+            point = nearest[1].data
+            self.near_repair = True
+            self.current_repair_point = point
         
-                # Check for E key press
-                keys = pygame.key.get_pressed()
-                if keys[pygame.K_e]:
-                    print(f"Repairing {point.repair_type}")
-                    self.perform_repair(point)
-                    return True
-        
-                # Log only once when near a repair point
-                if not hasattr(self, '_near_repair_logged') or not self._near_repair_logged:
-                    self._near_repair_logged = True
-                    print(f"Player near {point.repair_type} repair point")
+            # Check for E key press
+            keys = pygame.key.get_pressed()
+            if keys[pygame.K_e]:
+                print(f"Repairing {point.repair_type}")
+                self.perform_repair(point)
+                return True
         
-                break  # Only handle one repair point at a time
+            # Log only once when near a repair point
+            if not hasattr(self, '_near_repair_logged') or not self._near_repair_logged:
+                self._near_repair_logged = True
+                print(f"Player near {point.repair_type} repair point")
     
         # Reset the logged state when not near any repair point
         if hasattr(self, '_near_repair_logged') and self._near_repair_logged and not self.near_repair:
@@ -1126,9 +1337,13 @@ class AsteroidFrontier:
             self.current_level["all_sprites"].remove(repair_point)
             print("Weapon system repaired!")
     
+        # Drop the repaired point from the EVA world
+        world = self.current_level.get("world")
+        if world is not None and hasattr(repair_point, 'entity_id'):
+            world.destroy_entity(repair_point.entity_id)
+        
         # Check if all repairs are done
-        repair_points = [obj for obj in self.current_level["objects"] if hasattr(obj, 'is_repair_point')]
-        if not repair_points:
+        if world is not None and not any(world.find_interactables("repair")):
             print("All repairs completed!")
             # Maybe show message or add reward?
 
@@ -1168,6 +1383,7 @@ class AsteroidFrontier:
     
         # Store the destination for when player uses the exit
         self.docked_location = location_id
+        self.sync_map_location()
     
         return success
         
@@ -1222,8 +1438,8 @@ class AsteroidFrontier:
         if self.current_level and "name" in self.current_level:
             self.game_state = GameState.MERCHANT
         
-            # Initialize merchant if needed
-            self.initialize_merchant_system()
+            # Initialize merchant if needed, and drop its lists from the last visit
+            self.initialize_merchant_system().refresh_items_list(self)
         
             return True
     
@@ -1232,7 +1448,7 @@ class AsteroidFrontier:
     def initialize_merchant_system(self):
         """Initialize or get the merchant system"""
         if not hasattr(self, 'merchant_system'):
-            self.merchant_system = MerchantSystem(SCREEN_WIDTH, SCREEN_HEIGHT)
+            self.merchant_system = MerchantSystem(SCREEN_WIDTH, SCREEN_HEIGHT, self.market)
             self.merchant_system.game = self
     
         return self.merchant_system
@@ -1290,6 +1506,7 @@ class AsteroidFrontier:
     def add_save_system(self):
         """Add the save system to the game"""
         self.save_system = SaveSystem(self)
+        self.save_system.attach_event_bus(self.event_bus)  # Autosave on docking and quest events
     
         # Track visited locations
         if not hasattr(self, 'visited_locations'):
@@ -1458,6 +1675,9 @@ class AsteroidFrontier:
         if location_name == "Ship Cabin" and hasattr(self, 'docked_location') and self.docked_location:
             docked_at = self.docked_location.replace("_", " ").title()
             location_name = f"Ship Cabin (Docked at {docked_at})"
+        elif location_name == "Ship Cabin" and self.course_destination:
+            destination = self.course_destination.replace("_", " ").title()
+            location_name = f"Ship Cabin (En route to {destination}, {int(self.autopilot.travel_progress * 100)}%)"
     
         location_text = font.render(f"Location: {location_name}", True, WHITE)
         screen.blit(location_text, (SCREEN_WIDTH - location_text.get_width() - 10, 10))
@@ -1485,10 +1705,19 @@ class AsteroidFrontier:
             if exit_text:
                 screen.blit(exit_text, (SCREEN_WIDTH//2 - exit_text.get_width()//2, SCREEN_HEIGHT - 60))
     
+        # Encounter on a plotted course
+        if self.encounter_notice:
+            encounter_text = font.render(self.encounter_notice, True, (255, 80, 80))
+            screen.blit(encounter_text, (SCREEN_WIDTH//2 - encounter_text.get_width()//2, 50))
+    
         # Helm interaction prompt
         if hasattr(self, 'near_helm') and self.near_helm:
             helm_text = None
-            if hasattr(self, 'docked_location') and self.docked_location:
+            if self.encounter_notice:
+                helm_text = font.render("Press E to break away", True, (255, 80, 80))
+            elif self.course_destination is not None:
+                helm_text = font.render("Autopilot engaged", True, (0, 255, 255))
+            elif hasattr(self, 'docked_location') and self.docked_location:
                 helm_text = font.render(f"Press E to undock and launch into space", True, (0, 255, 255))
             else:
                 helm_text = font.render("Press E to return to space flight", True, (0, 255, 255))
@@ -1756,7 +1985,7 @@ class AsteroidFrontier:
         if self.game_state == GameState.SPACE_TRAVEL:
             instructions = "Current ship position shown in white"
         else:
-            instructions = "Arrow keys: Move view | Home: Reset view"
+            instructions = "Arrow keys: Move view | +/- or wheel: Zoom | Home: Reset view"
 
         instr_text = item_font.render(instructions, True, WHITE)
         screen.blit(instr_text, (content_rect.x + 40, title_y + 40))
@@ -1771,15 +2000,19 @@ class AsteroidFrontier:
         # Initialize map_offset if it doesn't exist
         if not hasattr(self, 'map_offset'):
             self.map_offset = [0, 0]
+        if not hasattr(self, 'map_zoom'):
+            self.map_zoom = 0
 
-        # Calculate scale for drawing
-        map_scale = min(map_area.width/2000, map_area.height/2000)
+        # Calculate scale for drawing (whole map fits at zoom level 0)
+        map_scale = min(map_area.width/2000, map_area.height/2000) * MAP_ZOOM_STEPS[self.map_zoom]
+        self.map_view = ((map_area.x + 10, map_area.y + 10), map_area)  # For zooming around a point
     
-        # Draw the system map
+        # Draw the system map (only what's inside the border)
         self.system_map.draw(screen, 
                            offset=(map_area.x + 10 + self.map_offset[0], 
                                   map_area.y + 10 + self.map_offset[1]), 
-                           scale=map_scale)
+                           scale=map_scale,
+                           view_rect=map_area.inflate(-2, -2))
 
         # If in space mode, draw player's current position
         if self.game_state == GameState.SPACE_TRAVEL and hasattr(self, 'space_travel'):
@@ -1819,12 +2052,15 @@ class AsteroidFrontier:
         
             for loc_id in key_locations:
                 if loc_id in self.system_map.locations:
-                    locations_shown.append(self.system_map.locations[loc_id])
+                    locations_shown.append((loc_id, self.system_map.locations[loc_id]))
+            
+            # Cheapest itinerary to each of them (cached by the route planner)
+            travel_options = self.system_map.get_travel_options("cost")
         
             # Create a horizontal list of key locations
             location_y = location_list_y + 30
             location_x = content_rect.x + 40
-            for location in locations_shown:
+            for loc_id, location in locations_shown:
                 if location_x > content_rect.right - 150:
                     # Move to next row if we run out of space
                     location_x = content_rect.x + 40
@@ -1836,8 +2072,17 @@ class AsteroidFrontier:
                 faction_color = self.get_faction_color(location.faction)
                 pygame.draw.circle(screen, faction_color, (location_x, location_y + 8), 5)
             
-                # Draw location name
-                name_text = item_font.render(location.name, True, WHITE)
+                # Draw location name with how far it is
+                label = location.name
+                if loc_id == self.system_map.player_location:
+                    label += " (here)"
+                elif loc_id in travel_options:
+                    option = travel_options[loc_id]
+                    jumps = len(option["legs"])
+                    label += f" ({jumps} jump{'s' if jumps > 1 else ''}, {option['cost']} cr)"
+                else:
+                    label += " (no route)"
+                name_text = item_font.render(label, True, WHITE)
                 screen.blit(name_text, (location_x + 10, location_y))
             
                 location_x += name_text.get_width() + 40  # Space between locations
@@ -1906,6 +2151,11 @@ class AsteroidFrontier:
     
         completed_text = section_font.render("Completed Quests", True, (100, 255, 100))
         screen.blit(completed_text, (content_rect.x + 20, completed_y))
+        
+        # Quests unlocked but not yet taken
+        available_count = len(self.quest_manager.graph.available)
+        available_text = item_font.render(f"{available_count} new quests available", True, (180, 180, 180))
+        screen.blit(available_text, (content_rect.right - available_text.get_width() - 20, completed_y + 4))
     
         # Get completed quests
         completed_quests = []
@@ -1952,7 +2202,10 @@ class AsteroidFrontier:
         for i, destination in enumerate(self.travel_options):
             # Format destination name (replace underscores with spaces and capitalize)
             display_name = destination.replace("_", " ").title()
-            if destination == "eva":
+            if destination.startswith(COURSE_PREFIX):
+                course = self.course_options[destination]
+                display_name = f"Plot course to {course['location'].name} ({course['cost']} cr, {len(course['legs'])} jumps)"
+            elif destination == "eva":
                 display_name = "Perform EVA (Extravehicular Activity)"
             elif destination == "space":
                 display_name = "Enter Space"
@@ -2023,10 +2276,22 @@ class AsteroidFrontier:
                         elif event.key == pygame.K_DOWN:
                             self.map_offset[1] -= 50  # Move map up (view down)
                             return True
+                        elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                            self.zoom_map(1)
+                            return True
+                        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                            self.zoom_map(-1)
+                            return True
                         elif event.key == pygame.K_HOME:
-                            # Reset map position
+                            # Reset map position and zoom
                             self.map_offset = [0, 0]
+                            self.map_zoom = 0
                             return True
+                
+                # Mouse wheel zooms the map around the cursor
+                elif event.type == pygame.MOUSEWHEEL and self.show_map and self.active_tab == 2:
+                    self.zoom_map(event.y, pygame.mouse.get_pos())
+                    return True
             
                 return True  # Return from event handling if menu is open
         
@@ -2150,8 +2415,7 @@ class AsteroidFrontier:
                     # Then check NPC interactions
                     for npc in self.npcs:
                         if pygame.sprite.collide_rect(self.player, npc):
-                            self.dialogue_manager.start_dialogue(npc, self.player)
-                            self.game_state = GameState.DIALOGUE
+                            self.talk_to_npc(npc)
                             return True
                         
                     # Check for helm interaction in ship cabin
@@ -2173,14 +2437,21 @@ class AsteroidFrontier:
                         # Check for NPC interaction if we're close enough
                         for npc in self.npcs:
                             if pygame.sprite.collide_rect(self.player, npc):
-                                self.dialogue_manager.start_dialogue(npc, self.player)
-                                self.game_state = GameState.DIALOGUE
+                                self.talk_to_npc(npc)
                                 return True
     
             return True
     
     def update(self, dt):
         """Update game state"""
+        # Hand finished background saves back to the UI
+        if hasattr(self, 'save_system'):
+            self.save_system.update()
+        
+        # Planets keep moving whatever the player is doing, and so does a plotted course
+        self.advance_orbits(dt)
+        self.update_autopilot(dt)
+        
         if self.game_state == GameState.OVERWORLD:
             # Update player (only if menu is not open)
             keys = pygame.key.get_pressed()
@@ -2212,8 +2483,9 @@ class AsteroidFrontier:
                     if keys[pygame.K_DOWN]:
                         self.map_offset[1] -= 20  # Move map up (view down)
                     if keys[pygame.K_HOME]:
-                        # Reset map position
+                        # Reset map position and zoom
                         self.map_offset = [0, 0]
+                        self.map_zoom = 0
             
             # Check specifically for EVA mode
             if self.current_level and self.current_level.get("name") == "ship_eva":
@@ -2281,7 +2553,9 @@ def main():
         # Draw everything
         game.draw()
     
-    # Clean up
+    # Clean up (let any save still being written finish first)
+    if hasattr(game, 'save_system'):
+        game.save_system.shutdown()
     pygame.quit()
     sys.exit()
 
@@ -2,8 +2,12 @@ import random
 import math
 import pygame
 
+from entity_system import World, Position, Velocity, Spin, Collider, Renderable, MovementSystem, RenderSystem
+
 class Resource:
     """Class for resources that can be collected from asteroids"""
+    __slots__ = ('name', 'value', 'rarity', 'color')
+    
     def __init__(self, name, value, rarity=1.0, color=(200, 200, 200)):
         self.name = name
         self.value = value  # Base value in credits
@@ -74,19 +78,31 @@ class ResourceRegistry:
         # Shouldn't reach here, but just in case
         return possible_resources[0]
 
+def roll_asteroid_resources(rng=random):
+    """Roll the resources one asteroid drops (no pygame needed, so simulations can use it)"""
+    resources = {}
+    
+    # Force some basic resources to ensure drops
+    resources["iron"] = rng.randint(5, 10)
+    resources["copper"] = rng.randint(3, 8)
+    
+    # Add a chance for rarer resources
+    if rng.random() < 0.3:  # 30% chance
+        resources["gold"] = rng.randint(1, 5)
+    
+    if rng.random() < 0.2:  # 20% chance
+        resources["uranium"] = rng.randint(1, 3)
+    
+    return resources
+
+
 class Asteroid:
-    """Class for asteroids that can be mined for resources"""
-    def __init__(self, x, y, size=None, resource_registry=None):
-        # Position and movement
-        self.x = x
-        self.y = y
+    """Asteroid component - what can be mined from an entity (position and motion live in the World)"""
+    # Fixed attribute layout - no per-instance __dict__, so big fields stay cheap
+    __slots__ = ('size', 'max_health', 'health', 'resource_registry', 'resources', 'vertices', 'image')
+    
+    def __init__(self, size=None, resource_registry=None):
         self.size = size if size else random.randint(20, 60)
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(-1, 1)
-        
-        # Velocity
-        self.velocity_x = random.uniform(-0.5, 0.5)
-        self.velocity_y = random.uniform(-0.5, 0.5)
         
         # Resources and health
         self.max_health = self.size * 2  # Bigger asteroids take more hits
@@ -99,9 +115,6 @@ class Asteroid:
         # Create the asteroid shape
         self.vertices = self.generate_shape()
         self.create_image()
-        
-        # Collision detection
-        self.rect = pygame.Rect(x - self.size, y - self.size, self.size * 2, self.size * 2)
     
     def generate_shape(self):
         """Generate a random asteroid shape using vertices"""
@@ -116,7 +129,7 @@ class Asteroid:
             y = math.sin(angle) * distance
             vertices.append((x, y))
         
-        return vertices
+        return tuple(vertices)
     
     def create_image(self):
         """Create the asteroid's image surface"""
@@ -167,48 +180,23 @@ class Asteroid:
     
     def generate_resources(self):
         """Generate resources contained in this asteroid"""
-        resources = {}
-    
-        # Force some basic resources to ensure drops
-        resources["iron"] = random.randint(5, 10)
-        resources["copper"] = random.randint(3, 8)
-    
-        # Add a chance for rarer resources
-        if random.random() < 0.3:  # 30% chance
-            resources["gold"] = random.randint(1, 5)
-    
-        if random.random() < 0.2:  # 20% chance
-            resources["uranium"] = random.randint(1, 3)
+        resources = roll_asteroid_resources()
     
         # Debug
         print(f"Asteroid will drop: {resources}")
     
         return resources
     
-    def update(self, dt):
-        """Update asteroid position and rotation"""
-        # Move the asteroid
-        self.x += self.velocity_x * dt * 60  # Scale by delta time
-        self.y += self.velocity_y * dt * 60
-        
-        # Update rectangle for collision detection
-        self.rect.x = self.x - self.size
-        self.rect.y = self.y - self.size
-        
-        # Rotate the asteroid
-        self.rotation += self.rotation_speed * dt * 60
-        if self.rotation >= 360:
-            self.rotation -= 360
-        if self.rotation < 0:
-            self.rotation += 360
-    
     def take_damage(self, damage):
         """Apply damage to the asteroid"""
         self.health -= damage
         return self.health <= 0
     
-    def spawn_resource_particles(self):
-        """Create resource particles when the asteroid is destroyed"""
+    def spawn_resource_particles(self, x, y):
+        """Create resource particles when the asteroid is destroyed at (x, y)
+
+        Returns (particle, x, y, vel_x, vel_y) tuples for the field to add to its World.
+        """
         particles = []
         
         # Create particles for each resource
@@ -223,58 +211,22 @@ class Asteroid:
                 angle = random.uniform(0, math.pi * 2)
                 
                 particle = ResourceParticle(
-                    self.x, self.y,
-                    speed * math.cos(angle),
-                    speed * math.sin(angle),
                     resource_name,
                     resource.color,
                     amount // min(amount, 5)  # Distribute amount among particles
                 )
-                particles.append(particle)
+                particles.append((particle, x, y, speed * math.cos(angle), speed * math.sin(angle)))
         
         # Debug
         print(f"Created {len(particles)} resource particles")
 
         return particles
-    
-    def draw(self, screen, camera_offset):
-        """Draw the asteroid on the screen"""
-        # Create a copy of the image to rotate
-        rotated_image = pygame.transform.rotate(self.image, self.rotation)
-        rotated_rect = rotated_image.get_rect(center=(self.x - camera_offset[0], self.y - camera_offset[1]))
-        
-        # Draw the rotated image
-        screen.blit(rotated_image, rotated_rect)
-        
-        # Draw health bar for damaged asteroids (if below 90% health)
-        if self.health < self.max_health * 0.9:
-            health_percent = self.health / self.max_health
-            bar_width = self.size * 2
-            health_width = bar_width * health_percent
-            
-            bar_x = self.x - camera_offset[0] - bar_width // 2
-            bar_y = self.y - camera_offset[1] - self.size - 10
-            
-            # Background bar
-            pygame.draw.rect(screen, (100, 100, 100), (bar_x, bar_y, bar_width, 5))
-            
-            # Health bar
-            if health_percent > 0.6:
-                color = (0, 255, 0)  # Green
-            elif health_percent > 0.3:
-                color = (255, 255, 0)  # Yellow
-            else:
-                color = (255, 0, 0)  # Red
-                
-            pygame.draw.rect(screen, color, (bar_x, bar_y, health_width, 5))
 
 class ResourceParticle:
-    """Class for resource particles that can be collected"""
-    def __init__(self, x, y, vel_x, vel_y, resource_name, color, amount=1):
-        self.x = x
-        self.y = y
-        self.vel_x = vel_x
-        self.vel_y = vel_y
+    """Resource particle component - a collectable drop (position and drift live in the World)"""
+    __slots__ = ('resource_name', 'color', 'amount', 'size', 'max_size', 'collected', 'lifespan', 'age', 'image')
+    
+    def __init__(self, resource_name, color, amount=1):
         self.resource_name = resource_name
         self.color = color
         self.amount = amount
@@ -286,14 +238,6 @@ class ResourceParticle:
         
         # Create particle image
         self.create_image()
-        
-        # Collision rectangle
-        self.rect = pygame.Rect(
-            self.x - self.size // 2, 
-            self.y - self.size // 2, 
-            self.size, 
-            self.size
-        )
     
     def create_image(self):
         """Create the particle image"""
@@ -310,64 +254,32 @@ class ResourceParticle:
                          (self.size // 2 - 1, self.size // 2 - 1), 
                          self.size // 4)
     
-    def update(self, dt):
-        """Update particle position and lifespan"""
-        # Move particle
-        self.x += self.vel_x * dt * 60
-        self.y += self.vel_y * dt * 60
-        
-        # Slow down over time
-        self.vel_x *= 0.99
-        self.vel_y *= 0.99
-        
-        # Update rectangle
-        self.rect.x = self.x - self.size // 2
-        self.rect.y = self.y - self.size // 2
-        
-        # Age the particle
+    def age_by(self, dt):
+        """Age the particle; returns True once it should be removed"""
         self.age += dt * 60
         
         # Particles slowly shrink as they age
         if self.age > self.lifespan * 0.7:  # Start shrinking after 70% of lifespan
             life_remaining = 1.0 - (self.age - (self.lifespan * 0.7)) / (self.lifespan * 0.3)
-            self.size = max(1, int(self.max_size * life_remaining))
-            self.create_image()  # Recreate image with new size
+            size = max(1, int(self.max_size * life_remaining))
+            if size != self.size:
+                self.size = size
+                self.create_image()  # Recreate image with new size
         
-        # Return True if particle should be removed
         return self.age >= self.lifespan or self.collected
     
     def collect(self):
         """Mark the particle as collected"""
         self.collected = True
-    
-    def draw(self, screen, camera_offset):
-        """Draw the resource particle"""
-        # Add a pulsing glow effect
-        pulse = abs(math.sin(self.age / 30)) * 0.3 + 0.7  # Value between 0.7 and 1.0
-        
-        # Scale image for pulsing effect
-        scaled_size = int(self.size * pulse)
-        if scaled_size < 1:
-            scaled_size = 1
-            
-        scaled_image = pygame.transform.scale(self.image, (scaled_size, scaled_size))
-        
-        # Center position accounting for scaling
-        center_x = self.x - camera_offset[0]
-        center_y = self.y - camera_offset[1]
-        pos_x = center_x - scaled_size // 2
-        pos_y = center_y - scaled_size // 2
-        
-        # Draw particle
-        screen.blit(scaled_image, (pos_x, pos_y))
 
 class AsteroidField:
-    """Manager for multiple asteroids and resource particles"""
+    """Manager for the asteroids and resource particles - all stored as entities in one World"""
     def __init__(self, width, height):
         self.width = width
         self.height = height
-        self.asteroids = []
-        self.resource_particles = []
+        self.world = World()
+        self.movement = MovementSystem()
+        self.renderer = RenderSystem()
         self.resource_registry = ResourceRegistry()
         
         # Track collected resources
@@ -376,48 +288,74 @@ class AsteroidField:
         # Initialize asteroid field
         self.spawn_initial_asteroids()
     
+    def spawn_asteroid(self, x, y, size=None, velocity=None):
+        """Add an asteroid entity at (x, y); returns its id"""
+        asteroid = Asteroid(size, self.resource_registry)
+        if velocity is None:
+            velocity = (random.uniform(-0.5, 0.5), random.uniform(-0.5, 0.5))
+        rect = pygame.Rect(x - asteroid.size, y - asteroid.size, asteroid.size * 2, asteroid.size * 2)
+        return self.world.create_entity(
+            Position(x, y),
+            Velocity(velocity[0], velocity[1]),
+            Spin(random.uniform(0, 360), random.uniform(-1, 1)),
+            Collider(rect, asteroid.size),
+            # Bright outline and label for visibility, with the actual asteroid image on top
+            Renderable(asteroid.image, asteroid.size, outline=(255, 0, 0), label="Asteroid"),
+            asteroid
+        )
+    
+    def spawn_particle(self, particle, x, y, vel_x, vel_y):
+        """Add a resource particle entity; returns its id"""
+        return self.world.create_entity(
+            Position(x, y),
+            Velocity(vel_x, vel_y, 0.99),  # Slow down over time
+            Renderable(None, 5, fill=(0, 255, 0)),  # Drawn as a bright circle
+            particle
+        )
+    
+    def asteroid_count(self):
+        return self.world.count(Asteroid)
+    
     def spawn_initial_asteroids(self, count=20):
         """Spawn initial asteroids in the field"""
         for _ in range(count):
             x = random.randint(100, self.width - 100)
             y = random.randint(100, self.height - 100)
-            asteroid = Asteroid(x, y, None, self.resource_registry)
-            self.asteroids.append(asteroid)
+            self.spawn_asteroid(x, y)
     
     def update(self, dt, player_x, player_y, view_width, view_height):
         """Update all asteroids and resource particles"""
-        # Update asteroids
-        for asteroid in self.asteroids[:]:
-            asteroid.update(dt)
-            
-            # Remove asteroids that go too far off screen
-            if (asteroid.x < -self.width/2 or asteroid.x > self.width*1.5 or
-                asteroid.y < -self.height/2 or asteroid.y > self.height*1.5):
-                self.asteroids.remove(asteroid)
+        # Move everything at once
+        self.movement.process(self.world, dt)
+        
+        # Remove asteroids that go too far off screen
+        lost = [entity for entity, position, asteroid in self.world.query(Position, Asteroid)
+                if (position.x < -self.width/2 or position.x > self.width*1.5 or
+                    position.y < -self.height/2 or position.y > self.height*1.5)]
         
-        # Update resource particles
-        for particle in self.resource_particles[:]:
-            if particle.update(dt):
-                self.resource_particles.remove(particle)
+        # Age resource particles
+        lost.extend(entity for entity, particle in self.world.store(ResourceParticle) if particle.age_by(dt))
         
-        if len(self.asteroids) == 0:
+        for entity in lost:
+            self.world.destroy_entity(entity)
+        
+        if self.asteroid_count() == 0:
             print("No asteroids in field, generating some...")
             # Force spawn some asteroids near the player
             for _ in range(5):
                 x = player_x + random.randint(-500, 500)
                 y = player_y + random.randint(-500, 500)
                 size = random.randint(30, 60)
-                asteroid = Asteroid(x, y, size, self.resource_registry)
-                self.asteroids.append(asteroid)
+                self.spawn_asteroid(x, y, size)
                 print(f"Created asteroid at ({x}, {y}) with size {size}")
         else:
-            #print(f"Asteroid count: {len(self.asteroids)}")
             # Spawn new asteroids if needed
             self.maintain_asteroid_count(player_x, player_y, view_width, view_height)
     
     def maintain_asteroid_count(self, player_x, player_y, view_width, view_height, target_count=20):
         """Ensure there are enough asteroids in the field"""
-        if len(self.asteroids) < target_count:
+        asteroid_count = self.asteroid_count()
+        if asteroid_count < target_count:
             # Calculate spawn zones outside the visible area but not too far
             margin = 200  # How far outside the viewport to spawn
             
@@ -438,7 +376,7 @@ class AsteroidField:
             ]
             
             # Number of asteroids to spawn
-            spawn_count = target_count - len(self.asteroids)
+            spawn_count = target_count - asteroid_count
             
             for _ in range(spawn_count):
                 # Choose a random spawn area
@@ -449,55 +387,42 @@ class AsteroidField:
                 y = random.uniform(area[2], area[3])
                 
                 # Create asteroid that drifts toward the player (but not directly)
-                asteroid = Asteroid(x, y, None, self.resource_registry)
-                
-                # Adjust velocity to drift toward player
                 angle_to_player = math.atan2(player_y - y, player_x - x)
                 randomized_angle = angle_to_player + random.uniform(-0.5, 0.5)
                 speed = random.uniform(0.2, 0.7)
                 
-                asteroid.velocity_x = math.cos(randomized_angle) * speed
-                asteroid.velocity_y = math.sin(randomized_angle) * speed
-                
-                self.asteroids.append(asteroid)
+                self.spawn_asteroid(x, y, None, (math.cos(randomized_angle) * speed,
+                                                 math.sin(randomized_angle) * speed))
     
     def handle_weapon_hit(self, x, y, radius=10, damage=30):
         """Handle a weapon hitting asteroids"""
         destroyed_asteroids = []
         
-        for asteroid in self.asteroids[:]:
-            # Check if hit is within asteroid's radius
-            dx = asteroid.x - x
-            dy = asteroid.y - y
-            distance = math.sqrt(dx*dx + dy*dy)
+        # Collision system: every asteroid whose circle overlaps the hit
+        for entity, distance in list(self.world.find_in_radius(x, y, radius, Asteroid)):
+            asteroid = self.world.get_component(entity, Asteroid)
+            
+            # Apply damage based on proximity (more damage when closer to center)
+            proximity_factor = 1.0 - min(1.0, distance / (asteroid.size + radius))
+            hit_damage = damage * proximity_factor
             
-            if distance < asteroid.size + radius:
-                # Apply damage based on proximity (more damage when closer to center)
-                proximity_factor = 1.0 - min(1.0, distance / (asteroid.size + radius))
-                hit_damage = damage * proximity_factor
+            if asteroid.take_damage(hit_damage):
+                # Asteroid destroyed
+                destroyed_asteroids.append(asteroid)
                 
-                if asteroid.take_damage(hit_damage):
-                    # Asteroid destroyed
-                    destroyed_asteroids.append(asteroid)
-                    
-                    # Spawn resource particles
-                    new_particles = asteroid.spawn_resource_particles()
-                    self.resource_particles.extend(new_particles)
-                    
-                    # Remove from asteroid list
-                    self.asteroids.remove(asteroid)
+                # Spawn resource particles where it was
+                position = self.world.get_component(entity, Position)
+                for particle in asteroid.spawn_resource_particles(position.x, position.y):
+                    self.spawn_particle(*particle)
+                
+                self.world.destroy_entity(entity)
         
         return destroyed_asteroids
     
     def check_player_collision(self, player_x, player_y, player_radius):
         """Check if player collides with asteroids"""
-        for asteroid in self.asteroids:
-            dx = asteroid.x - player_x
-            dy = asteroid.y - player_y
-            distance = math.sqrt(dx*dx + dy*dy)
-            
-            if distance < asteroid.size + player_radius:
-                return asteroid
+        for entity, distance in self.world.find_in_radius(player_x, player_y, player_radius, Asteroid):
+            return self.world.get_component(entity, Asteroid)
         
         return None
     
@@ -515,23 +440,22 @@ class AsteroidField:
             # Cargo full - can't collect any more
             return []
 
-        # Debug
-        particle_count_before = len(self.resource_particles)
+        picked_up = []  # Entities to remove once the pass is done
 
-        for particle in self.resource_particles[:]:  # Use a copy for safe modification
+        for entity, position, velocity, particle in self.world.query(Position, Velocity, ResourceParticle):
             if particle.collected:
                 continue
                 
-            dx = particle.x - player_x
-            dy = particle.y - player_y
+            dx = position.x - player_x
+            dy = position.y - player_y
             distance = math.sqrt(dx*dx + dy*dy)
             
             if distance < collection_radius:
                 # Move particle toward player
                 speed = 5.0
-                angle = math.atan2(player_y - particle.y, player_x - particle.x)
-                particle.vel_x = math.cos(angle) * speed
-                particle.vel_y = math.sin(angle) * speed
+                angle = math.atan2(player_y - position.y, player_x - position.x)
+                velocity.dx = math.cos(angle) * speed
+                velocity.dy = math.sin(angle) * speed
                 
                 # Check if particle reaches player
                 if distance < 15: # Smaller distance for actual collection
@@ -559,7 +483,7 @@ class AsteroidField:
                         print(f"Resource collected: {particle.resource_name} x{particle.amount}")
                 
                         # Remove the particle
-                        self.resource_particles.remove(particle)
+                        picked_up.append(entity)
                     else:
                         # Not enough space - don't collect
                         print(f"Cargo full - can't collect {particle.amount} units of {particle.resource_name}")
@@ -569,57 +493,22 @@ class AsteroidField:
                     
                         # Don't try to collect any more resources
                         break
+        
+        for entity in picked_up:
+            self.world.destroy_entity(entity)
         return collected
     
     def draw(self, screen, camera_offset):
         """Draw all asteroids and resource particles, 3/12/25"""
-        # Debug info
-        #print(f"Camera offset: {camera_offset}")
-    
         # Draw a reference grid at world origin
         origin_x = 0 - camera_offset[0]
         origin_y = 0 - camera_offset[1]
         pygame.draw.line(screen, (255, 0, 0), (origin_x, origin_y-100), (origin_x, origin_y+100), 3)
         pygame.draw.line(screen, (255, 0, 0), (origin_x-100, origin_y), (origin_x+100, origin_y), 3)
     
-        # Draw asteroids as simple colored circles for testing
-        for asteroid in self.asteroids:
-            # Calculate screen position
-            screen_x = int(asteroid.x - camera_offset[0])
-            screen_y = int(asteroid.y - camera_offset[1])
-        
-            # Check if on or near screen
-            if (-asteroid.size <= screen_x <= screen.get_width() + asteroid.size and
-                -asteroid.size <= screen_y <= screen.get_height() + asteroid.size):
-            
-                # Draw bright outline for visibility
-                pygame.draw.circle(screen, (255, 0, 0), (screen_x, screen_y), asteroid.size, 3)
-            
-                # Add text label for easier identification
-                font = pygame.font.Font(None, 20)
-                label = font.render(f"Asteroid", True, (255, 255, 0))
-                screen.blit(label, (screen_x - label.get_width()//2, screen_y - label.get_height()//2))
-            
-                # Try to draw the actual asteroid image too
-                if hasattr(asteroid, 'image'):
-                    try:
-                        screen.blit(asteroid.image, (screen_x - asteroid.size, screen_y - asteroid.size))
-                    except Exception as e:
-                        print(f"Error drawing asteroid image: {e}")
-    
-        # Draw resource particles
-        for particle in self.resource_particles:
-            # Calculate screen position
-            screen_x = int(particle.x - camera_offset[0])
-            screen_y = int(particle.y - camera_offset[1])
-        
-            # Check if on screen
-            if (0 <= screen_x <= screen.get_width() and
-                0 <= screen_y <= screen.get_height()):
-            
-                # Draw as a bright circle
-                pygame.draw.circle(screen, (0, 255, 0), (screen_x, screen_y), 5)
+        # Asteroids and particles draw from their Renderable components
+        self.renderer.draw(self.world, screen, camera_offset)
     
     def get_collected_resources(self):
         """Get dictionary of collected resources"""
-        return self.collected_resources.copy()
\ No newline at end of file
+        return self.collected_resources.copy()
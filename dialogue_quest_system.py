@@ -4,6 +4,31 @@
 import pygame
 import json
 import os
+from collections import deque
+
+from text_layout import text_layout_cache
+from event_system import (RESOURCE_COLLECTED, LOCATION_ENTERED, NPC_TALKED, ASTEROID_DESTROYED,
+                          QUEST_STARTED, QUEST_COMPLETED)
+
+# Which game event advances each objective type from quests.json
+# (types not listed here - inspect, hack, decision... - are advanced manually)
+OBJECTIVE_EVENTS = {
+    "talk": NPC_TALKED,
+    "deliver": NPC_TALKED,
+    "travel": LOCATION_ENTERED,
+    "location": LOCATION_ENTERED,
+    "collect": RESOURCE_COLLECTED,
+    "mine": ASTEROID_DESTROYED
+}
+
+# Objective fields that the event payload must carry with the same value
+OBJECTIVE_FILTERS = ("location", "npc", "resource")
+
+# Objective types only tracked when they name their target (any conversation would count otherwise)
+OBJECTIVE_REQUIRED_FILTERS = {
+    "talk": "npc",
+    "deliver": "npc"
+}
 
 class DialogueNode:
     def __init__(self, text, responses=None, actions=None):
@@ -100,6 +125,280 @@ class DialogueTree:
         return tree
 
 
+# Conditions compiled dialogue can branch on - cheap checks against the NPC's current state
+DIALOGUE_PREDICATES = {
+    "first_meeting": lambda npc: not getattr(npc, 'met_player', False),
+    "met_player": lambda npc: getattr(npc, 'met_player', False),
+    "quest_unoffered": lambda npc: bool(getattr(npc, 'quest', None)) and not getattr(npc, 'quest_offered', False),
+    "quest_in_progress": lambda npc: (bool(getattr(npc, 'quest', None)) and getattr(npc, 'quest_offered', False)
+                                      and not getattr(npc.quest, 'completed', False)),
+    "quest_completed": lambda npc: (bool(getattr(npc, 'quest', None)) and getattr(npc, 'quest_offered', False)
+                                    and getattr(npc.quest, 'completed', False)),
+    "has_shop": lambda npc: bool(getattr(npc, 'has_shop', False))
+}
+PREDICATE_NAMES = tuple(DIALOGUE_PREDICATES)
+PREDICATE_INDEX = {name: i for i, name in enumerate(PREDICATE_NAMES)}
+
+
+class CompiledDialogue:
+    """Immutable dialogue graph for one NPC; nodes are materialized per NPC state on demand"""
+    def __init__(self, npc_name, nodes, start_node_id="start"):
+        self.npc_name = npc_name
+        # {node_id: ((condition, text, ((condition, text, next_node_id), ...), actions), ...)}
+        # The first variant whose condition holds is used; None always holds
+        self.nodes = nodes
+        self.start_node_id = start_node_id
+        self.materialized = {}  # {(node_id, state, quest_id): DialogueNode}
+    
+    @staticmethod
+    def evaluate(npc):
+        """Snapshot the predicate results for an NPC as a hashable state tuple"""
+        return tuple(DIALOGUE_PREDICATES[name](npc) for name in PREDICATE_NAMES)
+    
+    def get_node(self, node_id, state, quest=None, strings=None):
+        """Get the DialogueNode for node_id as it looks in the given state"""
+        quest_id = getattr(quest, 'id', None)
+        key = (node_id, state, quest_id, strings.language if strings else None)
+        node = self.materialized.get(key)
+        if node is None and node_id in self.nodes:
+            node = self._materialize(node_id, state, quest, strings)
+            self.materialized[key] = node
+        return node
+    
+    def _materialize(self, node_id, state, quest, strings):
+        """Pick the active variant, resolve string ids and fill in quest details"""
+        for condition, text, responses, actions in self.nodes[node_id]:
+            if condition is None or state[PREDICATE_INDEX[condition]]:
+                break
+        else:
+            return None
+        
+        resolve = strings.resolve if strings else str
+        quest_id = getattr(quest, 'id', None) or "quest_1"
+        quest_desc = getattr(quest, 'description', None) or "I need help with something."
+        text = resolve(text).replace("{quest_description}", quest_desc)
+        responses = [(resolve(response_text), next_node_id)
+                     for response_condition, response_text, next_node_id in responses
+                     if response_condition is None or state[PREDICATE_INDEX[response_condition]]]
+        actions = {key: quest_id if value == "{quest_id}" else value for key, value in actions.items()}
+        return DialogueNode(text, responses, actions)
+    
+    def to_dict(self):
+        """Convert to a JSON-friendly dict for the asset pack"""
+        return {
+            "npc_name": self.npc_name,
+            "start_node": self.start_node_id,
+            "nodes": {
+                node_id: [
+                    {"condition": condition, "text": text,
+                     "responses": [list(response) for response in responses], "actions": actions}
+                    for condition, text, responses, actions in variants
+                ]
+                for node_id, variants in self.nodes.items()
+            }
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a compiled graph from to_dict() output"""
+        nodes = {}
+        for node_id, variants in data["nodes"].items():
+            nodes[node_id] = tuple(
+                (variant["condition"], variant["text"],
+                 tuple(tuple(response) for response in variant["responses"]), variant["actions"])
+                for variant in variants
+            )
+        return cls(data["npc_name"], nodes, data.get("start_node", "start"))
+
+
+class DialogueSession:
+    """One conversation: a compiled graph viewed with the NPC state frozen at its start"""
+    def __init__(self, compiled, state, quest=None, strings=None):
+        self.compiled = compiled
+        self.state = state
+        self.quest = quest
+        self.strings = strings
+    
+    def get_node(self, node_id):
+        """Get a node by ID"""
+        return self.compiled.get_node(node_id, self.state, self.quest, self.strings)
+
+
+class DialogueCompiler:
+    """Turns an NPC's dialogue data from npcs.json into a CompiledDialogue"""
+    GREETING_TOPICS = ["default", "first_meeting", "returning_player"]
+    QUEST_TOPICS = ["quest_offer", "quest_accept", "quest_decline"]
+    
+    @staticmethod
+    def compile(npc_name, dialogue_data, builder=None, section=None):
+        """Compile full dialogue data (topic -> list of lines)
+        
+        With a StringTableBuilder, texts are stored as string ids: NPC lines in section, the rest in "ui".
+        """
+        def first_line(topic, fallback):
+            lines = dialogue_data.get(topic)
+            return lines[0] if isinstance(lines, list) and lines else fallback
+        
+        # Greeting depends on whether we've met the player before
+        start_variants = []
+        start_responses = []
+        if "about" in dialogue_data:
+            start_responses.append((None, "Tell me about yourself.", "about"))
+        
+        # Topic-specific dialogue options
+        for topic, messages in dialogue_data.items():
+            if topic not in DialogueCompiler.GREETING_TOPICS + ["about"] + DialogueCompiler.QUEST_TOPICS:
+                if isinstance(messages, list) and messages:
+                    start_responses.append((None, f"Tell me about {topic.replace('_', ' ')}.", topic))
+        
+        start_responses += [
+            ("quest_unoffered", "I heard you might have work for me?", "quest_offer"),
+            ("quest_in_progress", "About that task you gave me...", "quest_status"),
+            ("quest_completed", "I've completed your task.", "quest_complete"),
+            ("has_shop", "I'd like to see your wares.", "shop"),
+            (None, "Goodbye.", "exit")
+        ]
+        start_responses = tuple(start_responses)
+        
+        if "first_meeting" in dialogue_data:
+            start_variants.append(("first_meeting", first_line("first_meeting", "Hello!"), start_responses, {}))
+        if "returning_player" in dialogue_data:
+            start_variants.append(("met_player", first_line("returning_player", "Hello again!"), start_responses, {}))
+        start_variants.append((None, first_line("default", "Hello!"), start_responses, {}))
+        
+        nodes = {"start": tuple(start_variants)}
+        
+        # One node per topic, each leading back to the start
+        back = ((None, "Let's talk about something else.", "start"),)
+        for node_id, dialogue_lines in dialogue_data.items():
+            if node_id in DialogueCompiler.GREETING_TOPICS:
+                continue
+            if isinstance(dialogue_lines, list) and dialogue_lines:
+                nodes[node_id] = ((None, dialogue_lines[0], back, {}),)
+        
+        # Quest and shop nodes (only reachable through their conditional responses)
+        nodes["quest_offer"] = ((None, "{quest_description}", (
+            (None, "I'll help you out.", "quest_accept"),
+            (None, "I'm not interested right now.", "quest_decline")
+        ), {}),)
+        nodes["quest_accept"] = ((None, "Excellent! Thank you so much.", (
+            (None, "I'll get right on it.", "exit"),
+        ), {"quest_start": "{quest_id}"}),)
+        nodes["quest_decline"] = ((None, "I understand. If you change your mind, I'll be here.", (
+            (None, "Let's talk about something else.", "start"),
+            (None, "Goodbye for now.", "exit")
+        ), {}),)
+        nodes["quest_status"] = ((None, "How is the task coming along?", (
+            (None, "I'm still working on it.", "start"),
+            (None, "Can you remind me what to do?", "quest_reminder")
+        ), {}),)
+        nodes["quest_reminder"] = ((None, "{quest_description}", (
+            (None, "Thanks, I'll get back to it.", "exit"),
+            (None, "Let's talk about something else.", "start")
+        ), {}),)
+        nodes["shop"] = ((None, "Take a look at what I have available.", (
+            (None, "Let me see.", "shop_open"),
+            (None, "Maybe later.", "start")
+        ), {}),)
+        nodes["shop_open"] = ((None, "Here's what I have in stock.", (
+            (None, "Let's talk about something else.", "start"),
+            (None, "Goodbye.", "exit")
+        ), {"open_shop": True}),)
+        nodes["exit"] = ((None, "See you around!", (), {"end_dialogue": True}),)
+        
+        if builder:
+            npc_lines = set(lines[0] for lines in dialogue_data.values() if isinstance(lines, list) and lines)
+            nodes = DialogueCompiler._intern_nodes(nodes, builder, lambda text: section if text in npc_lines else "ui")
+        
+        return CompiledDialogue(npc_name, nodes)
+    
+    @staticmethod
+    def _intern_nodes(nodes, builder, section_for):
+        """Replace node and response texts with string ids ({placeholders} stay as text)"""
+        def intern(text):
+            if text.startswith("{"):
+                return text
+            return builder.intern(section_for(text), text)
+        
+        return {
+            node_id: tuple(
+                (condition, intern(text),
+                 tuple((response_condition, intern(response_text), next_node_id)
+                       for response_condition, response_text, next_node_id in responses),
+                 actions)
+                for condition, text, responses, actions in variants
+            )
+            for node_id, variants in nodes.items()
+        }
+    
+    @staticmethod
+    def compile_generic(npc_name):
+        """Compile the stock conversation for NPCs without dialogue data"""
+        start_text = "Hello there! What can I do for you today?"
+        about = (None, "Tell me about yourself.", "about")
+        events = (None, "What's going on around here?", "events")
+        goodbye = (None, "Goodbye.", "exit")
+        
+        nodes = {"start": (
+            ("quest_unoffered", start_text, (about, events, (None, "I heard you might have work for me?", "quest_offer")), {}),
+            ("quest_completed", "Thanks again for your help!", (about, events, goodbye), {}),
+            ("has_shop", start_text, (about, events, (None, "I'd like to see your wares.", "shop"), goodbye), {}),
+            (None, start_text, (about, events, goodbye), {})
+        )}
+        return CompiledDialogue(npc_name, nodes)
+    
+    @staticmethod
+    def build_pack(npcs_data, builder=None):
+        """Compile every NPC in npcs.json data into a pack (texts as string ids if given a builder)"""
+        from string_table import location_section
+        
+        dialogues = {}
+        for npc_data in npcs_data:
+            dialogue_data = npc_data.get("dialogue")
+            if dialogue_data:
+                section = location_section(npc_data.get("position", {}).get("location", "unknown"))
+                compiled = DialogueCompiler.compile(npc_data.get("name", "Unknown"), dialogue_data, builder, section)
+                dialogues[npc_data["id"]] = compiled.to_dict()
+        return {"string_table": builder is not None, "dialogues": dialogues}
+
+
+class DialogueLayout:
+    """Everything needed to draw and hit-test one dialogue node, computed once"""
+    def __init__(self, npc_name, text, response_texts, font, name_font, screen_width, screen_height, cache):
+        # Dialogue box sized to fit the responses
+        box_width = screen_width - 100
+        box_height = 150 + font.get_height() * len(response_texts)
+        box_x = 50
+        box_y = screen_height - box_height - 20
+        self.box = pygame.Rect(box_x, box_y, box_width, box_height)
+        
+        # NPC name and wrapped dialogue text
+        self.text_blits = []
+        if npc_name:
+            self.text_blits.append((name_font.render(npc_name, True, (255, 255, 255)), (box_x + 20, box_y + 15)))
+        lines, line_surfaces = cache.render_lines(text, font, box_width - 40, (255, 255, 255))
+        for i, line_surface in enumerate(line_surfaces):
+            self.text_blits.append((line_surface, (box_x + 20, box_y + 50 + i * 30)))
+        
+        # Response options with their normal and hover renderings
+        y_offset = 50 + len(lines) * 30 + 20
+        self.response_rects = []
+        self.response_surfaces = []
+        self.response_hover_surfaces = []
+        for i, response_text in enumerate(response_texts):
+            self.response_rects.append(pygame.Rect(box_x + 20, box_y + y_offset + i * 30, box_width - 40, 30))
+            label = f"{i+1}. {response_text}"
+            self.response_surfaces.append(font.render(label, True, (200, 200, 200)))
+            self.response_hover_surfaces.append(font.render(label, True, (255, 255, 0)))
+    
+    def response_at(self, pos):
+        """Index of the response under pos, or None"""
+        for i, response_rect in enumerate(self.response_rects):
+            if response_rect.collidepoint(pos):
+                return i
+        return None
+
+
 class DialogueManager:
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
@@ -108,171 +407,66 @@ class DialogueManager:
         self.current_npc = None
         self.player = None
         self.game_flags = {}  # Store game state flags here
+        self.quest_manager = None  # Set by the game so accepted quests get tracked
+        self.dialogue_tree = None  # DialogueSession for the current conversation
+        self.compiled_dialogues = {}  # {npc_id: CompiledDialogue}, built once per NPC
+        self.strings = None  # Localization, when string tables have been built
         self.font = pygame.font.Font(None, 28)
         self.name_font = pygame.font.Font(None, 32)
+        self.layout_cache = text_layout_cache
     
     def start_dialogue(self, npc, player):
         """Start a dialogue with an NPC"""
         self.current_npc = npc
         self.player = player
-    
-        # Check if NPC has full dialogue data from JSON
-        if hasattr(npc, 'full_dialogue') and npc.full_dialogue:
-            print(f"Using full dialogue data for {npc.name}")
-            # Create a dialogue tree using the full dialogue data
-            self.dialogue_tree = DialogueTree(npc.name)
-    
-            # Add nodes based on full dialogue
-            dialogue_data = npc.full_dialogue
-    
-            # Determine which initial text to use
-            start_text = ""
-            if "first_meeting" in dialogue_data and not getattr(npc, 'met_player', False):
-                start_text = dialogue_data.get("first_meeting", ["Hello!"])[0]
-                npc.met_player = True
-            elif "returning_player" in dialogue_data and getattr(npc, 'met_player', False):
-                start_text = dialogue_data.get("returning_player", ["Hello again!"])[0]
-            else:
-                start_text = dialogue_data.get("default", ["Hello!"])[0]
-    
-            # Check for different dialogue options based on NPC state
-            has_quest = hasattr(npc, 'quest') and npc.quest
-            quest_offered = getattr(npc, 'quest_offered', False)
-            quest_completed = has_quest and getattr(npc.quest, 'completed', False)
-            has_shop = getattr(npc, 'has_shop', False)
-        
-            # Get quest description if NPC has a quest
-            quest_desc = "I need help with something."
-            if has_quest and hasattr(npc.quest, 'description'):
-                quest_desc = npc.quest.description
-    
-            # Create appropriate dialogue options
-            responses = []
-            if "about" in dialogue_data:
-                responses.append(("Tell me about yourself.", "about"))
-        
-            # Add topic-specific dialogue options
-            for topic, messages in dialogue_data.items():
-                if topic not in ["default", "first_meeting", "returning_player", "about"]:
-                    if isinstance(messages, list) and messages:
-                        # Don't add topics that are conditionally shown elsewhere
-                        if topic != "quest_offer" and topic != "quest_accept" and topic != "quest_decline":
-                            responses.append((f"Tell me about {topic.replace('_', ' ')}.", topic))
-        
-            if has_quest and not quest_offered:
-                responses.append(("I heard you might have work for me?", "quest_offer"))
-            elif has_quest and quest_offered and not quest_completed:
-                responses.append(("About that task you gave me...", "quest_status"))
-            elif has_quest and quest_completed:
-                responses.append(("I've completed your task.", "quest_complete"))
-            
-            if has_shop:
-                responses.append(("I'd like to see your wares.", "shop"))
         
-            responses.append(("Goodbye.", "exit"))
-    
-            # Add the start node
-            self.dialogue_tree.add_node("start", start_text, responses)
-    
-            # Add other dialogue nodes
-            for node_id, dialogue_lines in dialogue_data.items():
-                # Skip special nodes we handle separately
-                if node_id in ["default", "first_meeting", "returning_player"]:
-                    continue
-                
-                if isinstance(dialogue_lines, list) and dialogue_lines:
-                    # Use first line as the text
-                    node_text = dialogue_lines[0]
-                    # Add a way back to the start
-                    node_responses = [("Let's talk about something else.", "start")]
-                    self.dialogue_tree.add_node(node_id, node_text, node_responses)
-    
-            # Add special nodes for quests, shops, etc.
-            if has_quest and not quest_offered:
-                self.dialogue_tree.add_node("quest_offer", quest_desc, [
-                    ("I'll help you out.", "quest_accept"),
-                    ("I'm not interested right now.", "quest_decline")
-                ])
-        
-                self.dialogue_tree.add_node("quest_accept", "Excellent! Thank you so much.", [
-                    ("I'll get right on it.", "exit")
-                ], {"quest_start": npc.quest.id if hasattr(npc.quest, 'id') else "quest_1"})
-        
-                self.dialogue_tree.add_node("quest_decline", "I understand. If you change your mind, I'll be here.", [
-                    ("Let's talk about something else.", "start"),
-                    ("Goodbye for now.", "exit")
-                ])
-            
-            if has_quest and quest_offered and not quest_completed:
-                self.dialogue_tree.add_node("quest_status", "How is the task coming along?", [
-                    ("I'm still working on it.", "start"),
-                    ("Can you remind me what to do?", "quest_reminder")
-                ])
-            
-                self.dialogue_tree.add_node("quest_reminder", quest_desc, [
-                    ("Thanks, I'll get back to it.", "exit"),
-                    ("Let's talk about something else.", "start")
-                ])
-    
-            if has_shop:
-                self.dialogue_tree.add_node("shop", "Take a look at what I have available.", [
-                    ("Let me see.", "shop_open"),
-                    ("Maybe later.", "start")
-                ])
+        # Freeze the NPC's state for this conversation and view the cached graph through it
+        compiled = self.get_compiled_dialogue(npc)
+        state = compiled.evaluate(npc)
+        self.dialogue_tree = DialogueSession(compiled, state, getattr(npc, 'quest', None), self.strings)
         
-                self.dialogue_tree.add_node("shop_open", "Here's what I have in stock.", [
-                    ("Let's talk about something else.", "start"),
-                    ("Goodbye.", "exit")
-                ], {"open_shop": True})
-    
-            self.dialogue_tree.add_node("exit", "See you around!", [], {"end_dialogue": True})
-    
-            # Start the dialogue
-            self.active_dialogue = self.dialogue_tree.get_node("start")
-            return self.active_dialogue
+        if getattr(npc, 'full_dialogue', None) and "first_meeting" in npc.full_dialogue:
+            npc.met_player = True
+        
+        # Start the dialogue
+        self.active_dialogue = self.dialogue_tree.get_node(compiled.start_node_id)
+        return self.active_dialogue
     
-        else:
-            # Use the original method for NPCs without full dialogue data
-            # Your existing code for loading default dialogue here...
-            # Create a dialogue tree for this NPC
-            self.dialogue_tree = DialogueTree(npc.name)
-    
-            # Add nodes to the dialogue tree
-            # Start node
-            start_text = "Hello there! What can I do for you today?DEF"
-    
-            # Different dialogue based on whether NPC has a quest
-            if hasattr(npc, 'quest') and npc.quest and not getattr(npc, 'quest_offered', False):
-                self.dialogue_tree.add_node("start", start_text, [
-                    ("Tell me about yourself.", "about"),
-                    ("What's going on around here?", "events"),
-                    ("I heard you might have work for me?", "quest_offer")
-                ])
-            elif hasattr(npc, 'quest') and npc.quest and getattr(npc.quest, 'completed', False):
-                self.dialogue_tree.add_node("start", "Thanks again for your help!", [
-                    ("Tell me about yourself.", "about"),
-                    ("What's going on around here?", "events"),
-                    ("Goodbye.", "exit")
-                ])
-            elif hasattr(npc, 'has_shop') and npc.has_shop:
-                self.dialogue_tree.add_node("start", start_text, [
-                    ("Tell me about yourself.", "about"),
-                    ("What's going on around here?", "events"),
-                    ("I'd like to see your wares.", "shop"),
-                    ("Goodbye.", "exit")
-                ])
+    def get_compiled_dialogue(self, npc):
+        """Get the compiled dialogue graph for an NPC, compiling it the first time"""
+        key = getattr(npc, 'npc_id', None) or npc.name
+        compiled = self.compiled_dialogues.get(key)
+        if compiled is None:
+            if getattr(npc, 'full_dialogue', None):
+                print(f"Compiling dialogue for {npc.name}")
+                compiled = DialogueCompiler.compile(npc.name, npc.full_dialogue)
             else:
-                self.dialogue_tree.add_node("start", start_text, [
-                    ("Tell me about yourself.", "about"),
-                    ("What's going on around here?", "events"),
-                    ("Goodbye.", "exit")
-                ])
-    
-            # Add remaining default dialogue nodes
-            # (keeping your existing code for default dialogue)
+                compiled = DialogueCompiler.compile_generic(npc.name)
+            self.compiled_dialogues[key] = compiled
+        return compiled
+    
+    def load_dialogue_pack(self, filename="dialogue_pack.json"):
+        """Preload compiled dialogue graphs from the asset pack, if it has been built"""
+        try:
+            with open(os.path.join('assets', 'dialogues', filename), 'r') as file:
+                pack = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
         
-            self.active_dialogue = self.dialogue_tree.get_node("start")
-            return self.active_dialogue
+        # A pack compiled against string tables is useless without them
+        if pack.get("string_table") and not self.strings:
+            return False
+        
+        for npc_id, compiled_data in pack["dialogues"].items():
+            self.compiled_dialogues[npc_id] = CompiledDialogue.from_dict(compiled_data)
+        return True
+    
+    def save_dialogue_pack(self, npcs_data, filename="dialogue_pack.json"):
+        """Compile all NPC dialogue and write it to the asset pack"""
+        pack = DialogueCompiler.build_pack(npcs_data)
+        with open(os.path.join('assets', 'dialogues', filename), 'w') as file:
+            json.dump(pack, file, separators=(',', ':'))
+        return len(pack["dialogues"])
     
     def choose_response(self, index):
         """Select a dialogue response"""
@@ -306,12 +500,16 @@ class DialogueManager:
             
         if "quest_start" in actions and self.current_npc and self.player:
             quest_id = actions["quest_start"]
-            self.current_npc.offer_quest(self.player)
-            # In a real game, you'd find the quest by ID
+            quest = self.current_npc.offer_quest(self.player)
+            if quest and self.quest_manager:
+                self.quest_manager.start_quest(quest.id, self.player)
             
         if "quest_complete" in actions and self.player:
             quest_id = actions["quest_complete"]
-            self.player.complete_quest(quest_id)
+            if self.quest_manager and quest_id in self.quest_manager.active_quests:
+                self.quest_manager.complete_quest(quest_id, self.player)
+            else:
+                self.player.complete_quest(quest_id)
             
         if "give_item" in actions and self.player:
             item_id = actions["give_item"]
@@ -364,6 +562,16 @@ class DialogueManager:
         """Check if a dialogue is currently active"""
         return self.active_dialogue is not None
     
+    def get_layout(self):
+        """Get the cached layout (pre-rendered text and response rects) for the active node"""
+        node = self.active_dialogue
+        npc_name = self.current_npc.name if self.current_npc else None
+        response_texts = tuple(response_text for response_text, _ in node.responses)
+        key = ("dialogue", npc_name, node.text, response_texts, self.font, self.screen_width, self.screen_height)
+        return self.layout_cache.get(key, lambda: DialogueLayout(
+            npc_name, node.text, response_texts, self.font, self.name_font,
+            self.screen_width, self.screen_height, self.layout_cache))
+    
     def draw(self, surface=None):
         """Draw the dialogue UI"""
          # Use provided surface or fall back to global screen
@@ -372,70 +580,34 @@ class DialogueManager:
         if not self.active_dialogue:
             return
             
-        node = self.active_dialogue
+        layout = self.get_layout()
         
-        # Create dialogue box
-        box_width = self.screen_width - 100
-        text_height = self.font.get_height() * len(node.responses)
-        box_height = 150 + text_height
+        # Draw dialogue box background
+        pygame.draw.rect(target, (0, 0, 0), layout.box)
+        pygame.draw.rect(target, (255, 255, 255), layout.box, 2)
         
-        box_x = 50
-        box_y = self.screen_height - box_height - 20
+        # Draw NPC name and dialogue text
+        target.blits(layout.text_blits, doreturn=False)
         
-        # Draw dialogue box background
-        dialogue_box = pygame.Rect(box_x, box_y, box_width, box_height)
-        pygame.draw.rect(target, (0, 0, 0), dialogue_box)
-        pygame.draw.rect(target, (255, 255, 255), dialogue_box, 2)
-        
-        # Draw NPC name
-        if self.current_npc:
-            name_text = self.name_font.render(self.current_npc.name, True, (255, 255, 255))
-            target.blit(name_text, (box_x + 20, box_y + 15))
-        
-        # Draw dialogue text
-        text_lines = self._wrap_text(node.text, box_width - 40)
-        for i, line in enumerate(text_lines):
-            text_surface = self.font.render(line, True, (255, 255, 255))
-            target.blit(text_surface, (box_x + 20, box_y + 50 + i * 30))
-        
-        # Draw response options
-        y_offset = 50 + len(text_lines) * 30 + 20
-        for i, (response_text, _) in enumerate(node.responses):
-            # Highlight the option if mouse is hovering over it
-            color = (200, 200, 200)
-            response_rect = pygame.Rect(box_x + 20, box_y + y_offset + i * 30, box_width - 40, 30)
-            
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            if response_rect.collidepoint(mouse_x, mouse_y):
-                color = (255, 255, 0)
+        # Draw response options, highlighting the one under the mouse
+        hovered = layout.response_at(pygame.mouse.get_pos())
+        for i, response_rect in enumerate(layout.response_rects):
+            if i == hovered:
                 pygame.draw.rect(target, (50, 50, 50), response_rect)
-            
-            response_surface = self.font.render(f"{i+1}. {response_text}", True, color)
-            target.blit(response_surface, (box_x + 20, box_y + y_offset + i * 30))
+                target.blit(layout.response_hover_surfaces[i], response_rect.topleft)
+            else:
+                target.blit(layout.response_surfaces[i], response_rect.topleft)
     
     def handle_click(self, pos):
         """Handle mouse clicks on dialogue options"""
         if not self.active_dialogue:
             return False
-            
-        node = self.active_dialogue
-        box_width = self.screen_width - 100
-        text_height = self.font.get_height() * len(node.responses)
-        box_height = 150 + text_height
-        
-        box_x = 50
-        box_y = self.screen_height - box_height - 20
         
-        # Calculate where response options start
-        text_lines = self._wrap_text(node.text, box_width - 40)
-        y_offset = 50 + len(text_lines) * 30 + 20
-        
-        # Check each response option
-        for i, _ in enumerate(node.responses):
-            response_rect = pygame.Rect(box_x + 20, box_y + y_offset + i * 30, box_width - 40, 30)
-            if response_rect.collidepoint(pos):
-                self.choose_response(i)
-                return True
+        # Same layout the last frame was drawn with
+        index = self.get_layout().response_at(pos)
+        if index is not None:
+            self.choose_response(index)
+            return True
         
         return False
     
@@ -455,22 +627,113 @@ class DialogueManager:
     
     def _wrap_text(self, text, max_width):
         """Wrap text to fit within width"""
-        words = text.split(' ')
-        lines = []
-        current_line = []
-        
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            if self.font.size(test_line)[0] <= max_width:
-                current_line.append(word)
-            else:
-                lines.append(' '.join(current_line))
-                current_line = [word]
+        return list(self.layout_cache.wrap(text, self.font, max_width))
+
+
+class QuestGraph:
+    """Quest prerequisite DAG with incrementally maintained availability"""
+    def __init__(self):
+        self.prerequisites = {}  # {quest_id: set of prerequisite ids}
+        self.dependents = {}     # {quest_id: [quest ids that need it]}
+        self.order = []          # Quest ids in topological order (None until re-sorted after add())
+        self.remaining = {}      # {quest_id: prerequisites not completed yet}
+        self.available = set()   # Can be started now
+        self.active = set()
+        self.completed = set()
+    
+    def build(self, quests):
+        """Build the graph from quests (keeps active/completed state); raises ValueError on cycles"""
+        prerequisites = {}
+        dependents = {quest.id: [] for quest in quests}
+        for quest in quests:
+            prerequisites[quest.id] = set(quest.prerequisite_quests)
+            for prerequisite in quest.prerequisite_quests:
+                if prerequisite not in dependents:
+                    raise ValueError(f"Quest '{quest.id}' requires unknown quest '{prerequisite}'")
+                dependents[prerequisite].append(quest.id)
         
-        if current_line:
-            lines.append(' '.join(current_line))
+        order = self.topological_order(prerequisites, dependents)
         
-        return lines
+        self.prerequisites = prerequisites
+        self.dependents = dependents
+        self.order = order
+        self.active &= set(prerequisites)
+        self.completed &= set(prerequisites)
+        
+        # Precompute availability from the current completion state
+        self.remaining = {}
+        self.available = set()
+        for quest_id, prereqs in prerequisites.items():
+            self.remaining[quest_id] = len(prereqs - self.completed)
+            if self.remaining[quest_id] == 0 and quest_id not in self.active and quest_id not in self.completed:
+                self.available.add(quest_id)
+    
+    def topological_order(self, prerequisites, dependents):
+        """Kahn's algorithm over known quests; raises ValueError if some sit on a cycle"""
+        in_degree = {quest_id: len(prereqs & prerequisites.keys()) for quest_id, prereqs in prerequisites.items()}
+        ready = deque(quest_id for quest_id, degree in in_degree.items() if degree == 0)
+        order = []
+        while ready:
+            quest_id = ready.popleft()
+            order.append(quest_id)
+            for dependent in dependents.get(quest_id, []):
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+        
+        if len(order) < len(prerequisites):
+            cycle = sorted(quest_id for quest_id, degree in in_degree.items() if degree > 0)
+            raise ValueError(f"Quest prerequisites form a cycle: {', '.join(cycle)}")
+        return order
+    
+    def add(self, quest):
+        """Add (or replace) one quest's edges; prerequisites may arrive later, build() validates the lot"""
+        for prerequisite in self.prerequisites.get(quest.id, ()):
+            self.dependents[prerequisite].remove(quest.id)
+        
+        prerequisites = set(quest.prerequisite_quests)
+        self.prerequisites[quest.id] = prerequisites
+        self.dependents.setdefault(quest.id, [])
+        for prerequisite in prerequisites:
+            self.dependents.setdefault(prerequisite, []).append(quest.id)
+        
+        self.remaining[quest.id] = len(prerequisites - self.completed)
+        if self.remaining[quest.id] == 0 and quest.id not in self.active and quest.id not in self.completed:
+            self.available.add(quest.id)
+        else:
+            self.available.discard(quest.id)
+        self.order = None
+    
+    def is_available(self, quest_id):
+        """Check if a quest can be started right now"""
+        return quest_id in self.available
+    
+    def mark_active(self, quest_id):
+        """Move a quest from available to active"""
+        self.available.discard(quest_id)
+        self.active.add(quest_id)
+    
+    def mark_completed(self, quest_id):
+        """Complete a quest and unlock the dependents whose last prerequisite it was"""
+        if quest_id in self.completed:
+            return []
+        self.available.discard(quest_id)
+        self.active.discard(quest_id)
+        self.completed.add(quest_id)
+        
+        unlocked = []
+        for dependent in self.dependents.get(quest_id, []):
+            self.remaining[dependent] -= 1
+            if self.remaining[dependent] == 0 and dependent not in self.active and dependent not in self.completed:
+                self.available.add(dependent)
+                unlocked.append(dependent)
+        return unlocked
+    
+    def available_in_order(self):
+        """Available quest ids in topological order (for display)"""
+        if self.order is None:
+            self.order = self.topological_order(self.prerequisites, self.dependents)
+        return [quest_id for quest_id in self.order if quest_id in self.available]
 
 
 class QuestManager:
@@ -478,62 +741,199 @@ class QuestManager:
         self.quests = {}
         self.active_quests = []
         self.completed_quests = []
+        self.graph = QuestGraph()
+        self.player = None  # Player whose quests are being tracked
+        self.event_bus = None
+        self.objective_index = {}  # {event_type: {quest_id: [objective_index, ...]}}
     
     def add_quest(self, quest):
         """Add a quest to the manager"""
         self.quests[quest.id] = quest
+        self.graph.add(quest)
+    
+    def is_available(self, quest_id):
+        """Check if a quest can be started (O(1) against the precomputed graph)"""
+        return self.graph.is_available(quest_id)
+    
+    def next_quest_for(self, quest_ids):
+        """Pick the quest an NPC should offer: the first of theirs that is active or available"""
+        for quest_id in quest_ids:
+            if quest_id in self.graph.active or quest_id in self.graph.available:
+                return self.quests[quest_id]
+        return None
+    
+    def attach_event_bus(self, event_bus):
+        """Subscribe to the game events that can advance quest objectives"""
+        self.event_bus = event_bus
+        for event_type in set(OBJECTIVE_EVENTS.values()):
+            event_bus.subscribe(event_type, self.handle_event)
     
     def start_quest(self, quest_id, player):
         """Start a quest for the player"""
-        if quest_id in self.quests and quest_id not in self.active_quests:
+        if self.graph.is_available(quest_id):
             quest = self.quests[quest_id]
-            if quest.is_available([q.id for q in self.completed_quests]):
-                self.active_quests.append(quest_id)
+            self.graph.mark_active(quest_id)
+            self.active_quests.append(quest_id)
+            if quest not in player.quests:
                 player.quests.append(quest)
-                return True
+            self.player = player
+            self._index_objectives(quest)
+            if self.event_bus:
+                self.event_bus.publish(QUEST_STARTED, quest=quest_id)
+            return True
         return False
     
     def complete_quest(self, quest_id, player):
         """Complete a quest and give rewards"""
-        if quest_id in self.active_quests:
+        if quest_id in self.graph.active:
             quest = self.quests[quest_id]
             if player.complete_quest(quest_id):
                 self.active_quests.remove(quest_id)
                 self.completed_quests.append(quest)
+                self.graph.mark_completed(quest_id)
+                self._unindex_objectives(quest)
+                if self.event_bus:
+                    self.event_bus.publish(QUEST_COMPLETED, quest=quest_id)
                 return True
         return False
     
     def update_objective(self, quest_id, objective_index, progress, player):
         """Update progress on a quest objective"""
-        if quest_id in self.active_quests:
+        if quest_id in self.graph.active:
             quest = self.quests[quest_id]
             if quest.update_objective(objective_index, progress):
                 # Quest is complete
                 return self.complete_quest(quest_id, player)
         return False
     
+    def get_state(self):
+        """Quest progress for saving: {"active": {quest_id: progress}, "completed": [quest_id, ...]}"""
+        return {
+            "active": {quest_id: list(self.quests[quest_id].objective_progress) for quest_id in self.active_quests},
+            "completed": [quest.id for quest in self.completed_quests]
+        }
+    
+    def restore_state(self, state, player):
+        """Put quests back the way get_state() found them (unknown quest ids are skipped)"""
+        active = {quest_id: progress for quest_id, progress in state.get("active", {}).items()
+                  if quest_id in self.quests}
+        completed = [quest_id for quest_id in state.get("completed", []) if quest_id in self.quests]
+        
+        # Reset everything, then rebuild availability from the restored sets
+        for quest in self.quests.values():
+            quest.objective_progress = [0] * len(quest.objectives)
+            quest.completed = False
+        self.objective_index = {}
+        self.graph.active = set(active)
+        self.graph.completed = set(completed)
+        self.graph.build(self.quests.values())
+        
+        self.active_quests = list(active)
+        self.completed_quests = [self.quests[quest_id] for quest_id in completed]
+        for quest in self.completed_quests:
+            quest.completed = True
+        for quest_id, progress in active.items():
+            quest = self.quests[quest_id]
+            quest.objective_progress = list(progress)[:len(quest.objectives)]
+            quest.objective_progress += [0] * (len(quest.objectives) - len(quest.objective_progress))
+            self._index_objectives(quest)
+        
+        player.quests = [self.quests[quest_id] for quest_id in active] + self.completed_quests
+        self.player = player
+    
+    def _index_objectives(self, quest):
+        """Register a quest's unfinished objectives under the events that advance them"""
+        for i, objective_type in enumerate(quest.objective_types):
+            event_type = OBJECTIVE_EVENTS.get(objective_type)
+            required = OBJECTIVE_REQUIRED_FILTERS.get(objective_type)
+            if required and required not in quest.objective_details[i]:
+                continue  # Left for scripted dialogue to advance
+            if event_type and quest.objective_progress[i] < quest.objective_targets[i]:
+                self.objective_index.setdefault(event_type, {}).setdefault(quest.id, []).append(i)
+    
+    def _unindex_objectives(self, quest, objective_index=None):
+        """Drop a quest (or one of its objectives) from the event index"""
+        for event_type, quests in list(self.objective_index.items()):
+            indexes = quests.get(quest.id)
+            if indexes is None:
+                continue
+            if objective_index is None:
+                del quests[quest.id]
+            elif objective_index in indexes:
+                indexes.remove(objective_index)
+                if not indexes:
+                    del quests[quest.id]
+            if not quests:
+                del self.objective_index[event_type]
+    
+    def handle_event(self, event_type, payload):
+        """Advance only the objectives indexed under this event type"""
+        interested = self.objective_index.get(event_type)
+        if not interested or not self.player:
+            return
+        
+        amount = payload.get("amount", 1)
+        for quest_id, indexes in list(interested.items()):
+            quest = self.quests[quest_id]
+            for i in list(indexes):
+                details = quest.objective_details[i]
+                if any(key in details and payload.get(key) != details[key]
+                       for key in OBJECTIVE_FILTERS):
+                    continue
+                
+                # Objectives that are done stop listening
+                if quest.objective_progress[i] + amount >= quest.objective_targets[i]:
+                    self._unindex_objectives(quest, i)
+                
+                if self.update_objective(quest_id, i, amount, self.player):
+                    break  # Quest finished and was unindexed
+    
     def load_quests_from_json(self, filename):
         """Load quests from a JSON file"""
         with open(os.path.join('assets', 'quests', filename), 'r') as file:
             data = json.load(file)
         
-        for quest_data in data["quests"]:
+        self.load_quests(data["quests"])
+    
+    def load_quests(self, quests_data):
+        """Create quests from already-loaded quest data"""
+        for quest_data in quests_data:
+            # Objectives may be plain strings or dicts with description/target/type/location
+            objectives = quest_data["objectives"]
+            details = [objective if isinstance(objective, dict) else {} for objective in objectives]
+            descriptions = [objective.get("description", "") if isinstance(objective, dict) else objective
+                            for objective in objectives]
+            
             quest = Quest(
                 quest_data["id"],
                 quest_data["title"],
                 quest_data["description"],
-                quest_data["objectives"]
+                descriptions
             )
             
-            quest.objective_targets = quest_data.get("objective_targets", [1] * len(quest.objectives))
-            quest.credit_reward = quest_data.get("credit_reward", 0)
-            quest.xp_reward = quest_data.get("xp_reward", 0)
-            quest.reputation_changes = quest_data.get("reputation_changes", {})
-            quest.prerequisite_quests = quest_data.get("prerequisite_quests", [])
+            quest.objective_details = details
+            quest.objective_types = [detail.get("type") for detail in details]
+            quest.objective_targets = quest_data.get("objective_targets",
+                                                     [detail.get("target", 1) for detail in details])
+            
+            rewards = quest_data.get("rewards", {})
+            quest.credit_reward = quest_data.get("credit_reward", rewards.get("credits", 0))
+            quest.xp_reward = quest_data.get("xp_reward", rewards.get("xp", 0))
+            quest.reputation_changes = quest_data.get("reputation_changes", rewards.get("reputation", {}))
+            quest.prerequisite_quests = quest_data.get("prerequisite_quests", quest_data.get("prerequisites", []))
+            quest.giver = quest_data.get("giver")
+            
+            # Deliveries go back to whoever gave the quest
+            for detail in details:
+                if detail.get("type") == "deliver" and "npc" not in detail and quest.giver:
+                    detail["npc"] = quest.giver
             
             # Would also handle item rewards here
             
-            self.add_quest(quest)
+            self.quests[quest.id] = quest
+        
+        # Build the prerequisite graph once everything is in (rejects cycles)
+        self.graph.build(self.quests.values())
 
 
 class Quest:
@@ -550,6 +950,9 @@ class Quest:
         self.item_rewards = []
         self.reputation_changes = {}  # {"faction": change_value}
         self.prerequisite_quests = []  # List of quest IDs that must be completed first
+        self.giver = None
+        self.objective_types = [None] * len(objectives)  # "talk", "collect"... for event tracking
+        self.objective_details = [{} for _ in objectives]  # Raw objective data (location, etc.)
     
     def update_objective(self, index, progress):
         """Update progress on a specific objective"""
@@ -559,8 +962,8 @@ class Quest:
                 self.objective_progress[index] = self.objective_targets[index]
             
             # Check if all objectives are complete
+            # (completed itself is set by Player.complete_quest when rewards are paid out)
             if all(self.objective_progress[i] >= self.objective_targets[i] for i in range(len(self.objectives))):
-                self.completed = True
                 return True
         return False
     
@@ -0,0 +1,296 @@
+# Asteroid Frontier RPG
+# Economy Simulator
+
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+from multiprocessing import Pool
+
+from asteroid import ResourceRegistry, roll_asteroid_resources
+from market_system import Market
+
+# Rough model of one mining run (tune alongside the real gameplay numbers)
+TRIP_SECONDS = 180          # Time spent in the field before heading back to dock
+FIRE_INTERVAL = 0.4         # Seconds between shots
+ASTEROID_SPACING = 400      # Average distance flown between asteroids
+BASE_CARGO = 100            # Cargo before any hold upgrade
+COLLISION_CHANCE = 0.15     # Chance of clipping each asteroid we mine
+COLLISION_DAMAGE = 40       # Hull damage per hit (shields soak up to their strength)
+REPAIR_COST_PER_POINT = 2   # Credits charged per point of hull damage at dock
+STARTING_CREDITS = 100
+
+# The order each strategy prefers when spending credits
+UPGRADE_STRATEGIES = {
+    "balanced": None,  # Always raise the lowest upgrade first
+    "miner": ["weapon", "cargo", "engine", "shield"],
+    "trader": ["cargo", "engine", "weapon", "shield"],
+    "cautious": ["shield", "weapon", "cargo", "engine"],
+    "none": [],
+}
+
+
+class SimulatedShip:
+    """Just the ship stats the upgrades write to"""
+    def __init__(self):
+        self.shield_strength = 0
+        self.max_shield_strength = 0
+
+
+class SimulatedAsteroidField:
+    """Cargo hold in the shape MerchantSystem expects from the real asteroid field"""
+    def __init__(self, resource_registry):
+        self.resource_registry = resource_registry
+        self.collected_resources = {}
+
+    def get_collected_resources(self):
+        return self.collected_resources
+
+
+class SimulatedSpaceTravel:
+    """Flight stats with the same defaults as SpaceTravel"""
+    def __init__(self, resource_registry):
+        self.weapon_damage = 30
+        self.thrust_power = 0.1
+        self.max_speed = 5.0
+        self.ship = SimulatedShip()
+        self.asteroid_field = SimulatedAsteroidField(resource_registry)
+
+
+class SimulatedPlayer:
+    def __init__(self, credits):
+        self.credits = credits
+
+
+class SimulatedGame:
+    """Headless stand-in for AsteroidFrontier with only what trading and upgrades touch"""
+    def __init__(self, locations_data, resource_registry):
+        self.player = SimulatedPlayer(STARTING_CREDITS)
+        self.ship_upgrades = {}
+        self.cargo_capacity = BASE_CARGO
+        self.locations_data = locations_data
+        self.space_travel = SimulatedSpaceTravel(resource_registry)
+
+
+def load_locations(path=os.path.join('assets', 'maps', 'locations.json')):
+    """Location data the same way the game loads it"""
+    with open(path, 'r') as file:
+        return json.load(file)["locations"]
+
+
+# Per-process state, set up once by init_worker()
+_worker = {}
+
+
+def init_worker(locations_data):
+    """Pool initializer: headless pygame fonts (MerchantSystem needs them) and shared data"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    pygame.font.init()
+
+    from merchant_system import MerchantSystem
+    _worker["merchant"] = MerchantSystem(800, 600)
+    _worker["registry"] = ResourceRegistry()
+    _worker["locations"] = locations_data
+
+
+def mine_trip(game, rng):
+    """Fly one mining run and fill the hold; returns hull damage taken"""
+    space_travel = game.space_travel
+    hold = space_travel.asteroid_field.collected_resources
+    used = sum(hold.values())
+    capacity = max(BASE_CARGO, game.cargo_capacity)
+    time_left = TRIP_SECONDS
+    damage = 0
+
+    while used < capacity:
+        # Fly to the next rock, then shoot it apart
+        size = rng.randint(20, 60)
+        shots = math.ceil(size * 2 / space_travel.weapon_damage)
+        time_left -= ASTEROID_SPACING / (space_travel.max_speed * 60) + shots * FIRE_INTERVAL
+        if time_left < 0:
+            break
+
+        if rng.random() < COLLISION_CHANCE:
+            damage += max(0, COLLISION_DAMAGE - space_travel.ship.shield_strength)
+
+        # Scoop up whatever fits, like AsteroidField.collect_resources
+        for resource_id, amount in roll_asteroid_resources(rng).items():
+            amount = min(amount, capacity - used)
+            if amount > 0:
+                hold[resource_id] = hold.get(resource_id, 0) + amount
+                used += amount
+
+    return damage
+
+
+def best_location(merchant, game):
+    """Location paying the most for the current hold"""
+    hold = game.space_travel.asteroid_field.collected_resources
+    best, best_value = None, -1
+    for location in game.locations_data:
+        value = sum(merchant.get_resource_price(resource_id, location["id"]) * amount
+                    for resource_id, amount in hold.items())
+        if value > best_value:
+            best, best_value = location["id"], value
+    return best
+
+
+def next_upgrade(merchant, game, strategy):
+    """The upgrade a strategy wants next (None once everything it wants is maxed)"""
+    order = UPGRADE_STRATEGIES[strategy]
+    if order is None:
+        candidates = sorted(merchant.available_upgrades,
+                            key=lambda upgrade: merchant.get_upgrade_level(game, upgrade.id))
+    else:
+        candidates = [upgrade for upgrade in merchant.available_upgrades if upgrade.id in order]
+        candidates.sort(key=lambda upgrade: order.index(upgrade.id))
+
+    for upgrade in candidates:
+        if merchant.get_upgrade_level(game, upgrade.id) < upgrade.max_level:
+            return upgrade
+    return None
+
+
+def buy_upgrades(merchant, game, strategy, trip, timings):
+    """Spend credits according to a strategy, noting the trip each level was bought on"""
+    while True:
+        upgrade = next_upgrade(merchant, game, strategy)
+        if upgrade is None:
+            return
+        level = merchant.get_upgrade_level(game, upgrade.id)
+        if not merchant.purchase_upgrade(game, upgrade.id):
+            return  # Save up for it
+        timings[f"{upgrade.id}_{level + 1}"] = trip
+
+
+def run_career(job):
+    """Simulate one career; returns its credit curve, upgrade timings and final prices"""
+    seed, trips, strategy = job
+    rng = random.Random(seed)
+    merchant = _worker["merchant"]
+    locations = _worker["locations"]
+
+    # Fresh game and market per career (the merchant only keeps UI state)
+    game = SimulatedGame(locations, _worker["registry"])
+    merchant.game = game
+    merchant.market = Market(locations, _worker["registry"])
+
+    credits_curve = []
+    timings = {}
+    for trip in range(1, trips + 1):
+        damage = mine_trip(game, rng)
+
+        # Dock at the best market and sell the whole hold
+        location_id = best_location(merchant, game)
+        merchant.sell_all(game, location_id)
+
+        game.player.credits -= min(game.player.credits, damage * REPAIR_COST_PER_POINT)
+        buy_upgrades(merchant, game, strategy, trip, timings)
+        merchant.market.tick()  # Same as LOCATION_ENTERED in the game
+
+        credits_curve.append(game.player.credits)
+
+    prices = {location["id"]: merchant.market.get_price_table(location["id"]) for location in locations}
+    return {"credits": credits_curve, "upgrades": timings, "prices": prices}
+
+
+def summarize(results, trips):
+    """Turn per-career results into averaged curves, upgrade timings and price equilibria"""
+    careers = len(results)
+    curve = []
+    for trip in range(trips):
+        values = sorted(result["credits"][trip] for result in results)
+        curve.append({
+            "trip": trip + 1,
+            "mean": round(statistics.fmean(values), 1),
+            "p10": values[int(careers * 0.1)],
+            "median": values[careers // 2],
+            "p90": values[min(careers - 1, int(careers * 0.9))],
+        })
+
+    upgrades = {}
+    for result in results:
+        for upgrade_level, trip in result["upgrades"].items():
+            upgrades.setdefault(upgrade_level, []).append(trip)
+    upgrade_timings = {
+        upgrade_level: {
+            "reached": round(len(trips_taken) / careers, 3),
+            "median_trip": statistics.median(trips_taken),
+        }
+        for upgrade_level, trips_taken in sorted(upgrades.items())
+    }
+
+    prices = {}
+    for location_id in results[0]["prices"]:
+        prices[location_id] = {
+            resource_id: round(statistics.fmean(result["prices"][location_id][resource_id] for result in results), 1)
+            for resource_id in results[0]["prices"][location_id]
+        }
+
+    return {"careers": careers, "trips": trips, "credits": curve,
+            "upgrades": upgrade_timings, "prices": prices}
+
+
+def simulate(careers=1000, trips=50, strategy="balanced", workers=None, seed=0):
+    """Run careers across worker processes and summarize them"""
+    locations = load_locations()
+    jobs = [(seed + i, trips, strategy) for i in range(careers)]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, careers // (workers * 4))
+
+    with Pool(workers, initializer=init_worker, initargs=(locations,)) as pool:
+        results = pool.map(run_career, jobs, chunksize)
+
+    report = summarize(results, trips)
+    report["strategy"] = strategy
+    return report
+
+
+def print_report(report):
+    """Readable summary of a simulation report"""
+    print(f"{report['careers']} careers x {report['trips']} trips ({report['strategy']} strategy)")
+
+    print("\nCredits after trip:  mean / p10 / median / p90")
+    step = max(1, report["trips"] // 10)
+    for point in report["credits"][step - 1::step]:
+        print(f"  {point['trip']:4d}: {point['mean']:10.1f} {point['p10']:8d} {point['median']:8d} {point['p90']:8d}")
+
+    print("\nUpgrades: share of careers reaching each level, median trip")
+    for upgrade_level, timing in report["upgrades"].items():
+        print(f"  {upgrade_level:10s} {timing['reached']:6.1%}  trip {timing['median_trip']}")
+
+    print("\nFinal prices:")
+    for location_id, table in report["prices"].items():
+        listing = ", ".join(f"{resource_id} {price:g}" for resource_id, price in table.items())
+        print(f"  {location_id}: {listing}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-simulate mining and trading careers")
+    parser.add_argument("--careers", type=int, default=1000)
+    parser.add_argument("--trips", type=int, default=50)
+    parser.add_argument("--strategy", choices=sorted(UPGRADE_STRATEGIES), default="balanced")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the full report as JSON")
+    args = parser.parse_args()
+
+    report = simulate(args.careers, args.trips, args.strategy, args.workers, args.seed)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# Example usage:
+# python economy_simulator.py --careers 5000 --trips 40 --strategy miner --output economy.json
+# report = simulate(careers=200, trips=20)
@@ -0,0 +1,292 @@
+# Asteroid Frontier RPG
+# Entity Component System
+
+import math
+
+import pygame
+
+
+class Position:
+    """World position of an entity"""
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x=0, y=0):
+        self.x = x
+        self.y = y
+
+
+class Velocity:
+    """Per-frame movement of an entity (in units per 1/60 s, like the rest of the game)"""
+    __slots__ = ('dx', 'dy', 'drag')
+
+    def __init__(self, dx=0, dy=0, drag=1.0):
+        self.dx = dx
+        self.dy = dy
+        self.drag = drag  # Velocity kept each update (0.99 slowly brakes)
+
+
+class Spin:
+    """Rotation in degrees and degrees per 1/60 s"""
+    __slots__ = ('angle', 'speed')
+
+    def __init__(self, angle=0.0, speed=0.0):
+        self.angle = angle
+        self.speed = speed
+
+
+class Collider:
+    """Collision bounds of an entity - shares the rect of its sprite when it has one"""
+    __slots__ = ('rect', 'radius')
+
+    def __init__(self, rect, radius=0):
+        self.rect = rect
+        self.radius = radius  # For circle checks (find_in_radius); 0 means a point
+
+
+class Renderable:
+    """How the render system draws an entity, centered on its Position"""
+    __slots__ = ('image', 'radius', 'fill', 'outline', 'label')
+
+    def __init__(self, image=None, radius=0, fill=None, outline=None, label=None):
+        self.image = image      # Blitted centered (optional)
+        self.radius = radius    # Used for culling and the circles below
+        self.fill = fill        # Color of a filled circle (optional)
+        self.outline = outline  # Color of a 3px ring (optional)
+        self.label = label      # Text drawn over the entity (optional)
+
+
+class Interactable:
+    """Marks an entity the player can use ("exit", "helm", "repair", ...)"""
+    __slots__ = ('kind', 'data')
+
+    def __init__(self, kind, data=None):
+        self.kind = kind
+        self.data = data  # Whatever the handler needs (repair type, sprite, etc.)
+
+
+class ComponentStore:
+    """Dense storage for one component type (sparse set: entity -> index into dense lists)"""
+    __slots__ = ('entities', 'components', 'index')
+
+    def __init__(self):
+        self.entities = []    # entities[i] owns components[i]
+        self.components = []
+        self.index = {}       # {entity_id: position in the dense lists}
+
+    def add(self, entity, component):
+        """Add or replace the component for an entity"""
+        position = self.index.get(entity)
+        if position is not None:
+            self.components[position] = component
+            return
+        self.index[entity] = len(self.entities)
+        self.entities.append(entity)
+        self.components.append(component)
+
+    def remove(self, entity):
+        """Remove an entity's component by swapping the last entry into its slot"""
+        position = self.index.pop(entity, None)
+        if position is None:
+            return None
+
+        component = self.components[position]
+        last_entity = self.entities.pop()
+        last_component = self.components.pop()
+
+        # Fill the hole unless we just removed the last entry
+        if position < len(self.entities):
+            self.entities[position] = last_entity
+            self.components[position] = last_component
+            self.index[last_entity] = position
+
+        return component
+
+    def get(self, entity):
+        """Get the component for an entity, or None"""
+        position = self.index.get(entity)
+        if position is None:
+            return None
+        return self.components[position]
+
+    def __contains__(self, entity):
+        return entity in self.index
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __iter__(self):
+        """Iterate (entity, component) pairs in dense order"""
+        return zip(self.entities, self.components)
+
+
+class World:
+    """Entity store: entities are plain ints, components live in one dense store per type"""
+    def __init__(self):
+        self.next_entity = 1
+        self.stores = {}  # {component class: ComponentStore}
+
+    def create_entity(self, *components):
+        """Create a new entity with the given components and return its id"""
+        entity = self.next_entity
+        self.next_entity += 1
+        for component in components:
+            self.add_component(entity, component)
+        return entity
+
+    def destroy_entity(self, entity):
+        """Remove an entity and all of its components"""
+        for store in self.stores.values():
+            store.remove(entity)
+
+    def store(self, component_type):
+        """Get (or create) the dense store for a component type"""
+        store = self.stores.get(component_type)
+        if store is None:
+            store = ComponentStore()
+            self.stores[component_type] = store
+        return store
+
+    def add_component(self, entity, component):
+        """Attach a component to an entity (keyed by the component's class)"""
+        self.store(type(component)).add(entity, component)
+
+    def remove_component(self, entity, component_type):
+        """Detach a component from an entity"""
+        store = self.stores.get(component_type)
+        if store:
+            return store.remove(entity)
+        return None
+
+    def get_component(self, entity, component_type):
+        """Get one component of an entity, or None"""
+        store = self.stores.get(component_type)
+        if store:
+            return store.get(entity)
+        return None
+
+    def count(self, component_type):
+        """How many entities have a component"""
+        store = self.stores.get(component_type)
+        return len(store) if store else 0
+
+    def has_component(self, entity, component_type):
+        """Check if an entity has a component"""
+        store = self.stores.get(component_type)
+        return store is not None and entity in store
+
+    def query(self, *component_types):
+        """Yield (entity, component, ...) for entities that have all the given components"""
+        stores = []
+        for component_type in component_types:
+            store = self.stores.get(component_type)
+            if not store:
+                return
+            stores.append(store)
+
+        # Walk the smallest store and look the others up by entity
+        driver = min(stores, key=len)
+        for entity, _ in list(driver):
+            components = []
+            for store in stores:
+                component = store.get(entity)
+                if component is None:
+                    break
+                components.append(component)
+            else:
+                yield (entity, *components)
+
+    def find_interactables(self, kind=None):
+        """Yield (entity, interactable, collider) for interactive entities, optionally of one kind"""
+        for entity, interactable, collider in self.query(Interactable, Collider):
+            if kind is None or interactable.kind == kind:
+                yield entity, interactable, collider
+
+    def find_nearest_interactable(self, x, y, max_distance, kind=None):
+        """Find the closest interactive entity whose center is within max_distance of (x, y)"""
+        best = None
+        best_distance_sq = max_distance * max_distance
+        for entity, interactable, collider in self.find_interactables(kind):
+            dx = x - collider.rect.centerx
+            dy = y - collider.rect.centery
+            distance_sq = dx * dx + dy * dy
+            if distance_sq < best_distance_sq:
+                best_distance_sq = distance_sq
+                best = (entity, interactable, collider)
+        return best
+
+    def find_in_radius(self, x, y, radius, component_type=None):
+        """Yield (entity, distance) for colliders whose circle overlaps a circle at (x, y)
+
+        With component_type, only entities that also have it are checked (e.g. Asteroid).
+        """
+        component_types = (Position, Collider) + ((component_type,) if component_type else ())
+        for entity, position, collider, *_ in self.query(*component_types):
+            dx = position.x - x
+            dy = position.y - y
+            distance = math.sqrt(dx * dx + dy * dy)
+            if distance < collider.radius + radius:
+                yield entity, distance
+
+
+class MovementSystem:
+    """Moves every entity with a Position and a Velocity (and turns anything with a Spin)"""
+    def process(self, world, dt):
+        step = dt * 60  # Velocities are per 1/60 s
+        for entity, position, velocity in world.query(Position, Velocity):
+            position.x += velocity.dx * step
+            position.y += velocity.dy * step
+            if velocity.drag != 1.0:
+                velocity.dx *= velocity.drag
+                velocity.dy *= velocity.drag
+
+        # Keep collision bounds in step with the position
+        for entity, position, collider in world.query(Position, Collider):
+            collider.rect.center = (position.x, position.y)
+
+        for entity, spin in world.store(Spin):
+            spin.angle = (spin.angle + spin.speed * step) % 360
+
+
+class RenderSystem:
+    """Draws every Renderable at its Position, skipping anything off screen"""
+    def __init__(self, font_size=20):
+        self.font = None
+        self.font_size = font_size
+        self.labels = {}  # {text: rendered surface}
+
+    def get_label(self, text):
+        label = self.labels.get(text)
+        if label is None:
+            if self.font is None:
+                self.font = pygame.font.Font(None, self.font_size)
+            label = self.font.render(text, True, (255, 255, 0))
+            self.labels[text] = label
+        return label
+
+    def draw(self, world, screen, camera_offset):
+        width, height = screen.get_width(), screen.get_height()
+        for entity, position, renderable in world.query(Position, Renderable):
+            screen_x = int(position.x - camera_offset[0])
+            screen_y = int(position.y - camera_offset[1])
+            radius = renderable.radius
+            if not (-radius <= screen_x <= width + radius and -radius <= screen_y <= height + radius):
+                continue
+
+            if renderable.fill:
+                pygame.draw.circle(screen, renderable.fill, (screen_x, screen_y), radius)
+            if renderable.outline:
+                pygame.draw.circle(screen, renderable.outline, (screen_x, screen_y), radius, 3)
+            if renderable.label:
+                label = self.get_label(renderable.label)
+                screen.blit(label, (screen_x - label.get_width() // 2, screen_y - label.get_height() // 2))
+            if renderable.image:
+                screen.blit(renderable.image, (screen_x - renderable.image.get_width() // 2,
+                                               screen_y - renderable.image.get_height() // 2))
+
+
+# Example usage:
+# world = World()
+# exit_tile = world.create_entity(Collider(rect), Interactable("exit"))
+# rock = world.create_entity(Position(x, y), Velocity(0.3, -0.1), Collider(rect, 40), Renderable(image, 40))
+# MovementSystem().process(world, dt)
+# nearest = world.find_nearest_interactable(player.rect.centerx, player.rect.centery, 48, "exit")
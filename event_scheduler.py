@@ -0,0 +1,83 @@
+# Asteroid Frontier RPG
+# Event Scheduler
+
+import heapq
+import itertools
+
+
+class EventScheduler:
+    """Events queued by when they happen (trip progress, game time...), popped in order from a heap"""
+    def __init__(self):
+        self.heap = []  # [when, sequence, event] entries; event is None once cancelled
+        self.entries = {}  # {event_id: entry} for cancelling
+        self.sequence = itertools.count()  # Keeps events at the same time in the order they were added
+        self.paused = False
+
+    def schedule(self, when, event):
+        """Queue an event; returns an id that can cancel it"""
+        event_id = next(self.sequence)
+        entry = [when, event_id, event]
+        self.entries[event_id] = entry
+        heapq.heappush(self.heap, entry)
+        return event_id
+
+    def cancel(self, event_id):
+        """Drop a queued event (it's skipped when it reaches the top of the heap)"""
+        entry = self.entries.pop(event_id, None)
+        if entry is None:
+            return False
+        entry[2] = None
+        return True
+
+    def cancel_where(self, predicate):
+        """Drop every queued event the predicate matches; returns how many"""
+        matching = [event_id for event_id, entry in self.entries.items() if predicate(entry[2])]
+        for event_id in matching:
+            self.cancel(event_id)
+        return len(matching)
+
+    def clear(self):
+        """Drop everything"""
+        self.heap = []
+        self.entries = {}
+
+    def pause(self):
+        """Hold every event until resume() (e.g. while an encounter plays out)"""
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def _discard_cancelled(self):
+        while self.heap and self.heap[0][2] is None:
+            heapq.heappop(self.heap)
+
+    def next_time(self):
+        """When the next event happens, or None if nothing is queued"""
+        self._discard_cancelled()
+        return self.heap[0][0] if self.heap else None
+
+    def pop_next(self, now):
+        """The next event due by now as (when, event), or None (also None while paused)"""
+        if self.paused:
+            return None
+        self._discard_cancelled()
+        if not self.heap or self.heap[0][0] > now:
+            return None
+        when, event_id, event = heapq.heappop(self.heap)
+        del self.entries[event_id]
+        return when, event
+
+    def pending(self):
+        """Queued events in the order they will happen, as (when, event)"""
+        return [(entry[0], entry[2]) for entry in sorted(self.entries.values())]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# Example usage:
+# scheduler = EventScheduler()
+# event_id = scheduler.schedule(0.4, {"type": "pirate_encounter"})
+# due = scheduler.pop_next(travel_progress)
+# scheduler.cancel(event_id)
@@ -0,0 +1,45 @@
+# Asteroid Frontier RPG
+# Game Event Bus
+
+# Game events published by the gameplay systems
+RESOURCE_COLLECTED = "resource_collected"  # resource, amount
+LOCATION_ENTERED = "location_entered"      # location
+NPC_TALKED = "npc_talked"                  # npc, location
+ASTEROID_DESTROYED = "asteroid_destroyed"  # amount, location
+QUEST_STARTED = "quest_started"            # quest
+QUEST_COMPLETED = "quest_completed"        # quest
+
+
+class EventBus:
+    """Publish/subscribe hub so systems react to game events instead of polling"""
+    def __init__(self):
+        self.subscribers = {}  # {event_type: [callback, ...]}
+
+    def subscribe(self, event_type, callback):
+        """Call callback(event_type, payload) whenever event_type is published"""
+        callbacks = self.subscribers.setdefault(event_type, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    def unsubscribe(self, event_type, callback):
+        """Stop sending event_type to callback"""
+        callbacks = self.subscribers.get(event_type)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+    def publish(self, event_type, **payload):
+        """Send an event to everyone subscribed to its type"""
+        callbacks = self.subscribers.get(event_type)
+        if not callbacks:
+            return 0
+
+        # Copy so handlers can (un)subscribe while we dispatch
+        for callback in list(callbacks):
+            callback(event_type, payload)
+        return len(callbacks)
+
+
+# Example usage:
+# bus = EventBus()
+# bus.subscribe(NPC_TALKED, lambda event_type, payload: print(payload["npc"]))
+# bus.publish(NPC_TALKED, npc="gus", location="psyche_township")
@@ -4,33 +4,117 @@
 import pygame
 import json
 import os
+import copy
+
+_placeholder_icon = None
+
+def get_placeholder_icon():
+    """Get the shared placeholder icon used by items without their own icon"""
+    global _placeholder_icon
+    if _placeholder_icon is None:
+        _placeholder_icon = pygame.Surface((32, 32))
+    return _placeholder_icon
+
+class ItemDefinition:
+    """Shared, read-only data for one kind of item - every stack of it points here"""
+    __slots__ = ('name', 'description', 'value', 'icon', 'stackable', 'max_stack', 'weight', 'type')
+    
+    def __init__(self, name, description, value, icon=None, stackable=False, max_stack=1, weight=1, type="item"):
+        for field, field_value in (('name', name), ('description', description), ('value', value),
+                                   ('icon', icon), ('stackable', stackable), ('max_stack', max_stack),
+                                   ('weight', weight), ('type', type)):
+            object.__setattr__(self, field, field_value)
+    
+    def __setattr__(self, field, value):
+        raise AttributeError("Item definitions are shared; use replace() to get a changed copy")
+    
+    def replace(self, **changes):
+        """The shared definition with some fields changed"""
+        fields = {field: getattr(self, field) for field in self.__slots__}
+        fields.update(changes)
+        return get_definition(**fields)
+
+
+_definitions = {}  # {field values: ItemDefinition} - one definition per distinct kind of item
+_icons = {}        # {icon filename: loaded surface}
+
+def get_definition(name, description, value, icon=None, stackable=False, max_stack=1, weight=1, type="item"):
+    """The shared definition for these fields (built on first use)"""
+    key = (name, description, value, icon, stackable, max_stack, weight, type)
+    definition = _definitions.get(key)
+    if definition is None:
+        definition = ItemDefinition(*key)
+        _definitions[key] = definition
+    return definition
+
+def load_icon(icon):
+    """Load an icon from assets/icons once and reuse it"""
+    surface = _icons.get(icon)
+    if surface is None:
+        try:
+            surface = pygame.image.load(os.path.join('assets', 'icons', icon)).convert_alpha()
+            surface = pygame.transform.scale(surface, (32, 32))
+        except (pygame.error, FileNotFoundError):
+            # If icon can't be loaded, create a colored square
+            surface = pygame.Surface((32, 32))
+            surface.fill((200, 200, 200))
+        _icons[icon] = surface
+    return surface
+
+
+def _definition_field(field):
+    """Item attribute stored on the shared definition (copy-on-write when set)"""
+    def get(self):
+        return getattr(self.definition, field)
+    
+    def set(self, value):
+        # Changing one item must not change every other item sharing the definition
+        if getattr(self.definition, field) != value:
+            self.definition = self.definition.replace(**{field: value})
+    
+    return property(get, set)
+
 
 class Item:
-    def __init__(self, item_id, name, description, value, icon=None):
+    # Per-instance state only; everything shared lives on the ItemDefinition
+    __slots__ = ('id', 'definition', 'quantity')
+    
+    name = _definition_field('name')
+    description = _definition_field('description')
+    value = _definition_field('value')  # Value in credits
+    icon = _definition_field('icon')
+    stackable = _definition_field('stackable')
+    max_stack = _definition_field('max_stack')
+    weight = _definition_field('weight')  # Weight in inventory units
+    type = _definition_field('type')
+    
+    def __init__(self, item_id, name, description, value, icon=None, **fields):
+        """fields: the rest of the definition (stackable, max_stack, weight, type)"""
         self.id = item_id
-        self.name = name
-        self.description = description
-        self.value = value  # Value in credits
-        self.icon = icon or pygame.Surface((32, 32))  # Default placeholder icon
-        self.stackable = False
-        self.max_stack = 1
         self.quantity = 1
-        self.weight = 1  # Weight in inventory units
         
         # Load icon if provided as string
         if isinstance(icon, str):
-            try:
-                self.icon = pygame.image.load(os.path.join('assets', 'icons', icon)).convert_alpha()
-                self.icon = pygame.transform.scale(self.icon, (32, 32))
-            except pygame.error:
-                # If icon can't be loaded, create a colored square
-                self.icon = pygame.Surface((32, 32))
-                self.icon.fill((200, 200, 200))
+            icon = load_icon(icon)
+        
+        # Built once with every field, so items of the same kind share it
+        self.definition = get_definition(name, description, value, icon or get_placeholder_icon(), **fields)
     
     def use(self, player):
         """Use the item - to be overridden by subclasses"""
         return False
     
+    def clone(self):
+        """Copy this item (subclasses copy their mutable fields too)"""
+        return copy.copy(self)
+    
+    def split(self, quantity):
+        """Take quantity off this stack as a new item of the same class"""
+        part = self.clone()
+        part.quantity = quantity
+        self.quantity -= quantity
+        return part
+    
     def to_dict(self):
         """Convert item to dictionary for saving"""
         return {
@@ -44,6 +128,17 @@ class Item:
             "type": self.__class__.__name__
         }
     
+    def instance_state(self):
+        """The per-instance part of the item (all a save needs for catalog items)"""
+        return {"id": self.id, "quantity": self.quantity}
+    
+    def to_save(self):
+        """Instance state for unmodified catalog items, the full dict for anything else"""
+        prototype = item_registry.get_prototype(self.id)
+        if prototype is not None and prototype.definition is self.definition:
+            return self.instance_state()
+        return self.to_dict()
+    
     @classmethod
     def from_dict(cls, data):
         """Create an item from a dictionary"""
@@ -63,10 +158,11 @@ class Item:
 
 
 class Weapon(Item):
+    __slots__ = ('damage', 'range', 'durability', 'max_durability', 'effects')
+    
     def __init__(self, item_id, name, description, value, icon=None, 
-                 damage=5, range=1, durability=100):
-        super().__init__(item_id, name, description, value, icon)
-        self.type = "weapon"
+                 damage=5, range=1, durability=100, **fields):
+        super().__init__(item_id, name, description, value, icon, type="weapon", **fields)
         self.damage = damage
         self.range = range  # 1 for melee, >1 for ranged
         self.durability = durability
@@ -78,16 +174,28 @@ class Weapon(Item):
         player.equip_item(self, "weapon")
         return True
     
+    def instance_state(self):
+        state = super().instance_state()
+        state["durability"] = self.durability
+        return state
+    
+    def clone(self):
+        """Copy the weapon with its own effects"""
+        item = super().clone()
+        item.effects = dict(self.effects)
+        return item
+    
     def repair(self, amount):
         """Repair the weapon's durability"""
         self.durability = min(self.max_durability, self.durability + amount)
 
 
 class Armor(Item):
+    __slots__ = ('defense', 'durability', 'max_durability', 'resistance')
+    
     def __init__(self, item_id, name, description, value, icon=None,
-                 defense=5, durability=100):
-        super().__init__(item_id, name, description, value, icon)
-        self.type = "armor"
+                 defense=5, durability=100, **fields):
+        super().__init__(item_id, name, description, value, icon, type="armor", **fields)
         self.defense = defense
         self.durability = durability
         self.max_durability = durability
@@ -98,20 +206,32 @@ class Armor(Item):
         player.equip_item(self, "armor")
         return True
     
+    def instance_state(self):
+        state = super().instance_state()
+        state["durability"] = self.durability
+        return state
+    
+    def clone(self):
+        """Copy the armor with its own resistances"""
+        item = super().clone()
+        item.resistance = dict(self.resistance)
+        return item
+    
     def repair(self, amount):
         """Repair the armor's durability"""
         self.durability = min(self.max_durability, self.durability + amount)
 
 
 class Consumable(Item):
+    __slots__ = ('effect_type', 'effect_value')
+    
     def __init__(self, item_id, name, description, value, icon=None,
-                 effect_type="heal", effect_value=10):
-        super().__init__(item_id, name, description, value, icon)
-        self.type = "consumable"
+                 effect_type="heal", effect_value=10, **fields):
+        fields.setdefault("stackable", True)
+        fields.setdefault("max_stack", 10)
+        super().__init__(item_id, name, description, value, icon, type="consumable", **fields)
         self.effect_type = effect_type  # "heal", "energy", "buff", etc.
         self.effect_value = effect_value
-        self.stackable = True
-        self.max_stack = 10
     
     def use(self, player):
         """Use the consumable item"""
@@ -130,13 +250,14 @@ class Consumable(Item):
 
 
 class QuestItem(Item):
+    __slots__ = ('quest_id',)
+    
     def __init__(self, item_id, name, description, value, icon=None,
-                 quest_id=None):
-        super().__init__(item_id, name, description, value, icon)
-        self.type = "quest_item"
+                 quest_id=None, **fields):
+        fields.setdefault("stackable", True)
+        fields.setdefault("max_stack", 99)
+        super().__init__(item_id, name, description, value, icon, type="quest_item", **fields)
         self.quest_id = quest_id
-        self.stackable = True
-        self.max_stack = 99
     
     def use(self, player):
         """Quest items typically can't be used directly"""
@@ -158,13 +279,13 @@ class QuestItem(Item):
 #         return True  # Remove item after adding credits
 
 class ResourceItem(Item):
+    __slots__ = ()
+    
     def __init__(self, item_id, name, description, value, quantity=1):
-        super().__init__(item_id, name, description, value)
-        self.type = "resource"
-        self.stackable = True
-        self.max_stack = 999
+        # Each unit takes up 1 capacity (weight is per unit)
+        super().__init__(item_id, name, description, value, type="resource",
+                         stackable=True, max_stack=999, weight=1)
         self.quantity = quantity
-        self.weight = quantity  # Each unit takes up 1 capacity
     
     def use(self, player):
         """Resources typically can't be used directly"""
@@ -172,45 +293,154 @@ class ResourceItem(Item):
 
 class Inventory:
     def __init__(self, capacity=20):
-        self.items = []
+        self.items = []  # Slots in display order (removing a slot closes the gap, order is kept)
         self.capacity = capacity
         self.weight = 0
         self.max_weight = 100  # Maximum weight the inventory can hold
+        self.slot_index = {}  # {id(item): its index in items}
+        self.stacks = {}  # {item_id: [items with that id, in the order they were added]}
+        self.totals = {}  # {item_id: total quantity}
+    
+    def _account(self, item, quantity_change):
+        """Keep weight and per-id totals in step with a quantity change"""
+        self.weight += item.weight * quantity_change
+        total = self.totals.get(item.id, 0) + quantity_change
+        if total > 0:
+            self.totals[item.id] = total
+        else:
+            self.totals.pop(item.id, None)
+    
+    def _attach(self, item):
+        """Put an item in a new slot"""
+        self.slot_index[id(item)] = len(self.items)
+        self.items.append(item)
+        self.stacks.setdefault(item.id, []).append(item)
+        self._account(item, item.quantity)
+    
+    def _detach(self, index):
+        """Take the item out of a slot (its quantity must already be accounted for)"""
+        item = self.items.pop(index)
+        del self.slot_index[id(item)]
+        
+        # Later slots shift up one; only their indexes need updating
+        for position in range(index, len(self.items)):
+            self.slot_index[id(self.items[position])] = position
+        
+        stacks = self.stacks[item.id]
+        stacks.remove(item)
+        if not stacks:
+            del self.stacks[item.id]
+        return item
     
     def add_item(self, item):
         """Add an item to the inventory"""
-        # Check if inventory is full
-        if len(self.items) >= self.capacity:
+        # Check if item would exceed weight limit
+        if self.weight + item.weight * item.quantity > self.max_weight:
             return False
         
-        # Check if item would exceed weight limit
-        if self.weight + item.weight > self.max_weight:
+        # A new slot is only needed for whatever doesn't fit on existing stacks
+        if len(self.items) >= self.capacity and item.quantity > self._stack_space(item):
             return False
         
-        # If item is stackable, check if we already have it
+        self._merge(item)
+        return True
+    
+    def _stack_space(self, item, planned=None):
+        """How many more of item fit on the stacks we already have (after planned changes)"""
+        if not item.stackable:
+            return 0
+        planned = planned or {}
+        space = 0
+        for inv_item in self.stacks.get(item.id, ()):
+            quantity = planned.get(id(inv_item), inv_item.quantity)
+            if quantity > 0:  # Stacks planned to empty are gone by the time adds happen
+                space += inv_item.max_stack - quantity
+        return space
+    
+    def _merge(self, item):
+        """Stack item onto existing stacks, putting any remainder in a new slot (no limit checks)"""
         if item.stackable:
-            for inv_item in self.items:
-                if inv_item.id == item.id and inv_item.quantity < inv_item.max_stack:
+            for inv_item in self.stacks.get(item.id, ()):
+                if inv_item.quantity < inv_item.max_stack:
                     # Calculate how many can be added to this stack
                     space_in_stack = inv_item.max_stack - inv_item.quantity
                     amount_to_add = min(space_in_stack, item.quantity)
                     
                     inv_item.quantity += amount_to_add
                     item.quantity -= amount_to_add
-                    self.weight += item.weight * amount_to_add
+                    self._account(inv_item, amount_to_add)
                     
-                    # If we've added all of the item, return success
+                    # If we've added all of the item, we're done
                     if item.quantity <= 0:
-                        return True
+                        return
         
         # If we get here, either the item isn't stackable or we still have some left
-        # Add as a new item in the inventory
         if item.quantity > 0:
-            self.items.append(item)
-            self.weight += item.weight * item.quantity
-            return True
+            self._attach(item)
+    
+    def apply_batch(self, adds=(), removes=()):
+        """Apply many adds and (item_id, quantity) removes at once - all of them or none
         
-        return False
+        The whole batch is planned first (one capacity and weight check) and only
+        committed if it fits, so a failed batch leaves the inventory untouched.
+        """
+        adds = list(adds)
+        removes = list(removes)
+        
+        # Plan removals: need enough of each id; note which slots would empty
+        planned = {}  # {id(stack): planned quantity}
+        weight = self.weight
+        slots = len(self.items)
+        removing = {}
+        for item_id, quantity in removes:
+            removing[item_id] = removing.get(item_id, 0) + quantity
+        for item_id, quantity in removing.items():
+            if self.totals.get(item_id, 0) < quantity:
+                return False
+            for stack in reversed(self.stacks[item_id]):
+                take = min(stack.quantity, quantity)
+                planned[id(stack)] = stack.quantity - take
+                weight -= stack.weight * take
+                quantity -= take
+                if planned[id(stack)] == 0:
+                    slots -= 1
+                if quantity <= 0:
+                    break
+        
+        # Plan adds: room on surviving stacks plus stacks this batch opens
+        room = {}  # {item_id: quantity that still fits on stacks}
+        for item in adds:
+            weight += item.weight * item.quantity
+            if not item.stackable:
+                slots += 1
+                continue
+            
+            if item.id not in room:
+                room[item.id] = self._stack_space(item, planned)
+            fit = min(room[item.id], item.quantity)
+            room[item.id] -= fit
+            remaining = item.quantity - fit
+            if remaining > 0:
+                slots += 1
+                room[item.id] += max(item.max_stack - remaining, 0)
+        
+        if slots > self.capacity or weight > self.max_weight:
+            return False
+        
+        # Commit
+        for item_id, quantity in removing.items():
+            self.remove_item_by_id(item_id, quantity)
+        for item in adds:
+            self._merge(item)
+        return True
+    
+    def add_items(self, items):
+        """Add several items atomically"""
+        return self.apply_batch(adds=items)
+    
+    def remove_items(self, removes):
+        """Remove several (item_id, quantity) pairs atomically"""
+        return self.apply_batch(removes=removes)
     
     def remove_item(self, index, quantity=1):
         """Remove an item from the inventory"""
@@ -218,47 +448,72 @@ class Inventory:
             item = self.items[index]
             
             if item.stackable and item.quantity > quantity:
-                item.quantity -= quantity
-                self.weight -= item.weight * quantity
-                return item.__class__(item.id, item.name, item.description, item.value, 
-                                    item.icon, quantity=quantity)
+                self._account(item, -quantity)
+                return item.split(quantity)
             else:
                 # Remove the entire item
-                removed_item = self.items.pop(index)
-                self.weight -= removed_item.weight * removed_item.quantity
-                return removed_item
+                self._account(item, -item.quantity)
+                return self._detach(index)
         
         return None
     
+    def remove_item_by_id(self, item_id, quantity=1):
+        """Remove a quantity of an item across its stacks; returns how many were removed"""
+        if self.totals.get(item_id, 0) < quantity:
+            return 0
+        
+        removed = 0
+        # Take from the last stacks first so earlier slots keep their place
+        for item in reversed(list(self.stacks[item_id])):
+            take = min(item.quantity, quantity - removed)
+            self._account(item, -take)
+            item.quantity -= take
+            removed += take
+            if item.quantity <= 0:
+                self._detach(self.slot_index[id(item)])
+            if removed >= quantity:
+                break
+        return removed
+    
     def get_item(self, index):
         """Get an item without removing it"""
         if 0 <= index < len(self.items):
             return self.items[index]
         return None
     
+    def find_item(self, item_id):
+        """Get the first stack of an item, or None"""
+        stacks = self.stacks.get(item_id)
+        return stacks[0] if stacks else None
+    
+    def count(self, item_id):
+        """Total quantity of an item across all stacks"""
+        return self.totals.get(item_id, 0)
+    
     def has_item(self, item_id, quantity=1):
         """Check if the inventory has a specific item"""
-        total_quantity = 0
-        for item in self.items:
-            if item.id == item_id:
-                total_quantity += item.quantity
-                if total_quantity >= quantity:
-                    return True
-        return False
+        return self.totals.get(item_id, 0) >= quantity
     
     def use_item(self, index, player):
         """Use an item at the specified index"""
         if 0 <= index < len(self.items):
             item = self.items[index]
+            quantity_before = item.quantity
             should_remove = item.use(player)
             
-            if should_remove:
+            if item.quantity < quantity_before:
+                # Consumables count themselves down
+                self._account(item, item.quantity - quantity_before)
+            elif should_remove:
                 if item.stackable and item.quantity > 1:
                     item.quantity -= 1
-                    self.weight -= item.weight
+                    self._account(item, -1)
                 else:
-                    self.items.pop(index)
-                    self.weight -= item.weight * item.quantity
+                    self._account(item, -item.quantity)
+                    item.quantity = 0
+            
+            if item.quantity <= 0:
+                self._detach(index)
             
             return True
         
@@ -274,11 +529,21 @@ class Inventory:
             self.items.sort(key=lambda x: x.type)
         elif key == "weight":
             self.items.sort(key=lambda x: x.weight)
+        
+        # Per-id stacks and slot positions follow the new order
+        self.stacks = {}
+        self.slot_index = {}
+        for index, item in enumerate(self.items):
+            self.stacks.setdefault(item.id, []).append(item)
+            self.slot_index[id(item)] = index
     
     def clear(self):
         """Clear the inventory"""
         self.items = []
         self.weight = 0
+        self.slot_index = {}
+        self.stacks = {}
+        self.totals = {}
     
     def to_dict(self):
         """Convert inventory to dictionary for saving"""
@@ -301,90 +566,192 @@ class Inventory:
         return inventory
 
 
-class ItemFactory:
+# Built-in item definitions, used for anything items.json doesn't define
+BUILTIN_ITEMS = {
+    "medkit": {
+        "class": "Consumable",
+        "name": "Medkit",
+        "description": "Restores 50 health points.",
+        "value": 25,
+        "effect_type": "heal",
+        "effect_value": 50
+    },
+    "energy_pack": {
+        "class": "Consumable",
+        "name": "Energy Pack",
+        "description": "Restores 30 energy points.",
+        "value": 20,
+        "effect_type": "energy",
+        "effect_value": 30
+    },
+    "space_pistol": {
+        "class": "Weapon",
+        "name": "Space Pistol",
+        "description": "Standard issue sidearm. Reliable but weak.",
+        "value": 100,
+        "damage": 15,
+        "range": 5,
+        "durability": 100
+    },
+    "mining_laser": {
+        "class": "Weapon",
+        "name": "Mining Laser",
+        "description": "Repurposed mining tool. High damage, short range.",
+        "value": 250,
+        "damage": 25,
+        "range": 3,
+        "durability": 80
+    },
+    "light_armor": {
+        "class": "Armor",
+        "name": "Light Armor",
+        "description": "Basic protection. Doesn't slow you down.",
+        "value": 150,
+        "defense": 10,
+        "durability": 100
+    },
+    "ore_sample": {
+        "class": "QuestItem",
+        "name": "Ore Sample",
+        "description": "A sample of rare ore from the asteroid. Someone might want this.",
+        "value": 50,
+        "quest_id": "q002"
+    },
+    # "credits": {
+    #     "class": "Currency",
+    #     "name": "Credits",
+    #     "description": "Standard currency used throughout the system.",
+    #     "value": 1
+    # }
+}
+
+# items.json "type" -> item class (anything else is a plain Item)
+ITEM_CLASSES = {
+    "weapon": Weapon,
+    "armor": Armor,
+    "consumable": Consumable,
+    "quest_item": QuestItem
+}
+
+# items.json effect types -> Consumable effect_type
+CONSUMABLE_EFFECTS = {
+    "heal": "heal",
+    "energy_restore": "energy"
+}
+
+
+class ItemRegistry:
+    """Item catalog loaded once into prototypes; new items are clones of them"""
+    def __init__(self):
+        self.prototypes = {}  # {item_id: Item} - never handed out, only cloned
+        self.by_type = {}     # {type: [item_id, ...]}
+        self.loaded = False
+    
+    def register(self, item):
+        """Add (or replace) a prototype"""
+        old = self.prototypes.get(item.id)
+        if old is not None:
+            self.by_type[old.type].remove(item.id)
+        self.prototypes[item.id] = item
+        self.by_type.setdefault(item.type, []).append(item.id)
+    
+    def load(self, filename="items.json"):
+        """Build prototypes from the built-in definitions and items.json (JSON wins)"""
+        for item_id, info in BUILTIN_ITEMS.items():
+            info = dict(info)
+            item_class = globals()[info.pop("class")]
+            self.register(item_class(item_id=item_id, **info))
+        
+        try:
+            with open(os.path.join('assets', 'items', filename), 'r') as file:
+                data = json.load(file)
+            for item_data in data["items"]:
+                self.register(self.prototype_from_json(item_data))
+        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+            print(f"Error loading items: {e}")
+        
+        self.loaded = True
+        return len(self.prototypes)
+    
     @staticmethod
-    def create_item(item_id, quantity=1):
-        """Create an item from a predefined list based on ID"""
-        # In a real game, these would probably be loaded from a database or file
-        items = {
-            "medkit": {
-                "class": Consumable,
-                "name": "Medkit",
-                "description": "Restores 50 health points.",
-                "value": 25,
-                "effect_type": "heal",
-                "effect_value": 50
-            },
-            "energy_pack": {
-                "class": Consumable,
-                "name": "Energy Pack",
-                "description": "Restores 30 energy points.",
-                "value": 20,
-                "effect_type": "energy",
-                "effect_value": 30
-            },
-            "space_pistol": {
-                "class": Weapon,
-                "name": "Space Pistol",
-                "description": "Standard issue sidearm. Reliable but weak.",
-                "value": 100,
-                "damage": 15,
-                "range": 5,
-                "durability": 100
-            },
-            "mining_laser": {
-                "class": Weapon,
-                "name": "Mining Laser",
-                "description": "Repurposed mining tool. High damage, short range.",
-                "value": 250,
-                "damage": 25,
-                "range": 3,
-                "durability": 80
-            },
-            "light_armor": {
-                "class": Armor,
-                "name": "Light Armor",
-                "description": "Basic protection. Doesn't slow you down.",
-                "value": 150,
-                "defense": 10,
-                "durability": 100
-            },
-            "ore_sample": {
-                "class": QuestItem,
-                "name": "Ore Sample",
-                "description": "A sample of rare ore from the asteroid. Someone might want this.",
-                "value": 50,
-                "quest_id": "q002"
-            },
-            # "credits": {
-            #     "class": Currency,
-            #     "name": "Credits",
-            #     "description": "Standard currency used throughout the system.",
-            #     "value": 1
-            # }
-        }
+    def prototype_from_json(item_data):
+        """Create a prototype item from one items.json entry"""
+        item_type = item_data.get("type", "item")
+        item_class = ITEM_CLASSES.get(item_type, Item)
+        properties = item_data.get("properties", {})
+        args = (item_data["id"], item_data.get("name", item_data["id"]),
+                item_data.get("description", ""), item_data.get("value", 0), item_data.get("icon"))
         
-        if item_id in items:
-            item_info = items[item_id]
-            item_class = item_info.pop("class")
-            item = item_class(item_id=item_id, **item_info)
-            
-            if hasattr(item, "quantity"):
-                item.quantity = quantity
-            
-            return item
+        # Definition overrides go in with the constructor so the definition is built once
+        fields = {field: item_data[field] for field in ("weight", "stackable", "max_stack") if field in item_data}
+        if fields.get("stackable") is False:
+            fields.setdefault("max_stack", 1)
         
-        return None
+        if item_class is Weapon:
+            item = Weapon(*args, damage=properties.get("damage", 5), range=properties.get("range", 1),
+                          durability=properties.get("durability", 100), **fields)
+        elif item_class is Armor:
+            item = Armor(*args, defense=properties.get("defense", 5),
+                         durability=properties.get("durability", 100), **fields)
+        elif item_class is Consumable:
+            effects = item_data.get("effects", [])
+            effect = effects[0] if effects else {}
+            item = Consumable(*args, effect_type=CONSUMABLE_EFFECTS.get(effect.get("type"), "buff"),
+                              effect_value=effect.get("value", 0), **fields)
+        elif item_class is QuestItem:
+            item = QuestItem(*args, **fields)
+        else:
+            item = Item(*args, type=item_type, **fields)
+        
+        return item
+    
+    def create(self, item_id, quantity=1):
+        """Clone a new item from its prototype, or None if the id is unknown"""
+        if not self.loaded:
+            self.load()
+        
+        prototype = self.prototypes.get(item_id)
+        if prototype is None:
+            return None
+        
+        item = prototype.clone()
+        item.quantity = quantity
+        return item
+    
+    def restore(self, state):
+        """Recreate a catalog item from its saved instance state, or None if the id is unknown"""
+        item = self.create(state["id"], state.get("quantity", 1))
+        if item is not None and "durability" in state and hasattr(item, "durability"):
+            item.durability = state["durability"]
+        return item
+    
+    def get_prototype(self, item_id):
+        """Read-only access to a definition (don't modify it)"""
+        if not self.loaded:
+            self.load()
+        return self.prototypes.get(item_id)
+    
+    def ids_of_type(self, item_type):
+        """All item ids of a type ("weapon", "consumable", ...)"""
+        if not self.loaded:
+            self.load()
+        return list(self.by_type.get(item_type, []))
+
+
+# Shared catalog
+item_registry = ItemRegistry()
+
+
+class ItemFactory:
+    @staticmethod
+    def create_item(item_id, quantity=1):
+        """Create an item from the catalog based on ID"""
+        return item_registry.create(item_id, quantity)
     
     @staticmethod
     def load_items_from_json(filename):
         """Load item definitions from a JSON file"""
-        with open(os.path.join('assets', 'items', filename), 'r') as file:
-            data = json.load(file)
-        
-        # This would parse the JSON and add items to the factory's items dictionary
-        # Not implemented here for brevity
-        pass
+        return item_registry.load(filename)
 
 
 # Example usage:
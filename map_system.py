@@ -6,7 +6,12 @@ import csv
 import os
 import random
 
+from entity_system import World, Collider, Interactable
+
 class Tile(pygame.sprite.Sprite):
+    # pygame's Sprite base still carries a __dict__, but the per-tile fields live in slots
+    __slots__ = ('image', 'rect', 'tile_type', 'is_exit')
+    
     def __init__(self, image, x, y, tile_type):
         super().__init__()
         self.image = image
@@ -27,6 +32,8 @@ class Map:
         self.all_sprites = pygame.sprite.Group()
         self.npc_positions = {}  # Dictionary to store NPC starting positions
         self.layout = []  # Store raw layout for easier access
+        self.tile_surfaces = {}  # Placeholder surfaces shared by every tile of the same color
+        self.world = World()  # Interactive entities (exits, helm) for the interaction checks
         
         # Colors for different tile types
         self.tile_colors = {
@@ -53,9 +60,12 @@ class Map:
         self.load_map(map_file)
     
     def create_placeholder_tile(self, color):
-        """Create a placeholder surface for a tile"""
-        surface = pygame.Surface((self.tile_size, self.tile_size))
-        surface.fill(color)
+        """Get the placeholder surface for a tile (one shared surface per color)"""
+        surface = self.tile_surfaces.get(color)
+        if surface is None:
+            surface = pygame.Surface((self.tile_size, self.tile_size))
+            surface.fill(color)
+            self.tile_surfaces[color] = surface
         return surface
     
     def load_map(self, map_file):
@@ -137,12 +147,14 @@ class Map:
             exit_tile.is_exit = True  # Make sure this attribute is set
             self.objects.add(exit_tile)
             self.all_sprites.add(exit_tile)
+            self.world.create_entity(Collider(exit_tile.rect), Interactable("exit", exit_tile))
             
         elif char == 'H':  # Hangar/Helm - special handling for ship controls
             helm = Tile(self.create_placeholder_tile(self.tile_colors['H']), pos_x, pos_y, 'helm')
             helm.tile_type = 'helm'  # Specifically mark as helm for interaction
             self.objects.add(helm)
             self.all_sprites.add(helm)
+            self.world.create_entity(Collider(helm.rect), Interactable("helm", helm))
             
         elif char in self.tile_colors:  # Other defined tile types
             tile_color = self.tile_colors[char]
@@ -186,6 +198,7 @@ class Map:
         exit_tile.is_exit = True
         self.objects.add(exit_tile)
         self.all_sprites.add(exit_tile)
+        self.world.create_entity(Collider(exit_tile.rect), Interactable("exit", exit_tile))
         
         # Set dimensions
         self.width = 25 * self.tile_size
@@ -260,7 +273,8 @@ class Level:
             "player_start": (self.map.start_x, self.map.start_y),
             "width": self.map.width,
             "height": self.map.height,
-            "layout": self.map.layout
+            "layout": self.map.layout,
+            "world": self.map.world
         }
         
     def get_data(self):
@@ -0,0 +1,124 @@
+# Asteroid Frontier RPG
+# Market System
+
+from array import array
+
+from asteroid import ResourceRegistry
+from event_system import LOCATION_ENTERED
+
+# Hand-tuned price multipliers per location (anything not listed trades at 1.0)
+LOCATION_PRICE_MULTIPLIERS = {
+    "psyche_township": {
+        "iron": 1.0,
+        "copper": 1.2,
+        "titanium": 1.5,
+        "gold": 0.9,
+        "platinum": 1.1,
+        "uranium": 0.8,
+        "neodymium": 1.2,
+        "alien_alloy": 1.5,
+        "dark_matter": 1.0
+    },
+    "rusty_rocket": {
+        "iron": 0.8,
+        "copper": 1.0,
+        "titanium": 1.2,
+        "gold": 1.5,
+        "platinum": 1.3,
+        "uranium": 1.0,
+        "neodymium": 0.9,
+        "alien_alloy": 1.2,
+        "dark_matter": 2.0
+    }
+}
+
+SUPPLY_ELASTICITY = 0.01   # Each unit sold (and not yet absorbed) lowers the price 1%
+MIN_PRICE_FACTOR = 0.25    # Flooding a market never drops prices below a quarter
+SUPPLY_RECOVERY = 0.8      # Share of the surplus left after each market tick
+
+
+class Market:
+    """Price tables for every location, nudged by supply and demand as the player trades"""
+    def __init__(self, locations_data=(), resource_registry=None):
+        self.resource_registry = resource_registry or ResourceRegistry()
+
+        # Column order shared by every table
+        self.resource_ids = list(self.resource_registry.resources)
+        self.resource_index = {resource_id: i for i, resource_id in enumerate(self.resource_ids)}
+
+        self.base_prices = {}  # {location_id: array of base prices}
+        self.prices = {}       # {location_id: array of current prices}
+        self.supply = {}       # {location_id: array of surplus units the market still has to absorb}
+
+        # Fallback table for places that aren't in locations.json (ship cabin, EVA...)
+        self.default_prices = self._build_table(None)
+
+        for location in locations_data:
+            self.add_location(location["id"])
+
+    def _build_table(self, location_id):
+        """Base prices for one location"""
+        multipliers = LOCATION_PRICE_MULTIPLIERS.get(location_id, {})
+        return array('i', (int(self.resource_registry.get_resource(resource_id).value
+                               * multipliers.get(resource_id, 1.0))
+                           for resource_id in self.resource_ids))
+
+    def add_location(self, location_id):
+        """Precompute the price table for a location"""
+        base = self._build_table(location_id)
+        self.base_prices[location_id] = base
+        self.prices[location_id] = array('i', base)
+        self.supply[location_id] = array('d', [0.0] * len(base))
+
+    def attach_event_bus(self, event_bus):
+        """Let markets recover a little every time the player arrives somewhere"""
+        event_bus.subscribe(LOCATION_ENTERED, lambda event_type, payload: self.tick())
+
+    def get_price(self, resource_id, location_id):
+        """Current price of one unit at a location (0 for unknown resources)"""
+        index = self.resource_index.get(resource_id)
+        if index is None:
+            return 0
+        return self.prices.get(location_id, self.default_prices)[index]
+
+    def get_price_table(self, location_id):
+        """{resource_id: price} for a location (for UI listings)"""
+        table = self.prices.get(location_id, self.default_prices)
+        return dict(zip(self.resource_ids, table))
+
+    def _reprice(self, location_id, index):
+        """Recompute one entry from its base price and the surplus"""
+        factor = max(MIN_PRICE_FACTOR, 1.0 - SUPPLY_ELASTICITY * self.supply[location_id][index])
+        self.prices[location_id][index] = int(self.base_prices[location_id][index] * factor)
+
+    def record_trade(self, location_id, resource_id, amount):
+        """Adjust a single price after the player sells (amount > 0) or buys (amount < 0)"""
+        index = self.resource_index.get(resource_id)
+        if index is None or location_id not in self.supply:
+            return
+        self.supply[location_id][index] += amount
+        self._reprice(location_id, index)
+
+    def record_sale(self, location_id, resource_id, amount):
+        """The player sold amount units here"""
+        self.record_trade(location_id, resource_id, amount)
+
+    def record_sales(self, location_id, amounts):
+        """The player sold a whole manifest ({resource_id: amount}) here"""
+        for resource_id, amount in amounts.items():
+            self.record_trade(location_id, resource_id, amount)
+
+    def tick(self, steps=1):
+        """Let every market absorb part of its surplus (or shortage)"""
+        decay = SUPPLY_RECOVERY ** steps
+        for location_id, supply in self.supply.items():
+            for index, surplus in enumerate(supply):
+                if surplus:
+                    supply[index] = surplus * decay if abs(surplus * decay) >= 0.5 else 0.0
+                    self._reprice(location_id, index)
+
+
+# Example usage:
+# market = Market(locations_data)
+# price = market.get_price("gold", "rusty_rocket")
+# market.record_sale("rusty_rocket", "gold", 10)
@@ -1,6 +1,12 @@
 ﻿import pygame
 import math
 
+from text_layout import TextLayoutCache
+
+# Merchant labels (prices, credits, quantities) churn, so they get their own cache
+# instead of evicting dialogue layouts from the shared one
+merchant_label_cache = TextLayoutCache(max_entries=128)
+
 # Add this to GameState
 # GameState.MERCHANT = 11 
 
@@ -177,7 +183,7 @@ class CargoUpgrade(ShipUpgrade):
 
 class MerchantSystem:
     """System for managing merchants and trading"""
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, market=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.font_large = pygame.font.Font(None, 36)
@@ -198,60 +204,29 @@ class MerchantSystem:
         self.scroll_offset = 0
         self.max_visible_items = 6
         
-        # Resource price multipliers (different per location)
-        self.resource_price_multipliers = {
-            "psyche_township": {
-                "iron": 1.0,
-                "copper": 1.2,
-                "titanium": 1.5,
-                "gold": 0.9,
-                "platinum": 1.1,
-                "uranium": 0.8,
-                "neodymium": 1.2,
-                "alien_alloy": 1.5,
-                "dark_matter": 1.0
-            },
-            "rusty_rocket": {
-                "iron": 0.8,
-                "copper": 1.0,
-                "titanium": 1.2,
-                "gold": 1.5,
-                "platinum": 1.3,
-                "uranium": 1.0,
-                "neodymium": 0.9,
-                "alien_alloy": 1.2,
-                "dark_matter": 2.0
-            }
-            # Add other locations as needed
-        }
+        # Precomputed per-location prices (shared with the game, or built on first use)
+        self.market = market
+        
+        # View model for the open tab, rebuilt only when its key changes or after a trade
+        self._cached_items = None
+        self._cached_rows = None  # Pre-rendered text for each row, parallel to _cached_items
+        self._cached_key = None
+        self._overlay = None
+    
+    def get_market(self):
+        """Get the market, creating one from the game's location data if needed"""
+        if self.market is None:
+            from market_system import Market
+            game = getattr(self, 'game', None)
+            registry = None
+            if game and getattr(game, 'space_travel', None) and hasattr(game.space_travel, 'asteroid_field'):
+                registry = game.space_travel.asteroid_field.resource_registry
+            self.market = Market(getattr(game, 'locations_data', []), registry)
+        return self.market
     
     def get_resource_price(self, resource_id, location_id="psyche_township"):
         """Get the price for a resource at a specific location"""
-        # Get base value from resource registry
-        resource_registry = None
-        
-        # Try to get resource registry from the game
-        if hasattr(self, 'game') and hasattr(self.game, 'space_travel') and hasattr(self.game.space_travel, 'asteroid_field'):
-            resource_registry = self.game.space_travel.asteroid_field.resource_registry
-        
-        if not resource_registry:
-            # Create a temporary registry if needed
-            from asteroid_resources import ResourceRegistry
-            resource_registry = ResourceRegistry()
-
-        resource = resource_registry.get_resource(resource_id)
-        if not resource:
-            return 0
-        
-        # Get base price
-        base_price = resource.value
-        
-        # Apply location-specific multiplier
-        multiplier = 1.0
-        if location_id in self.resource_price_multipliers and resource_id in self.resource_price_multipliers[location_id]:
-            multiplier = self.resource_price_multipliers[location_id][resource_id]
-        
-        return int(base_price * multiplier)
+        return self.get_market().get_price(resource_id, location_id)
 
     def get_upgrades(self, game):
         """Get list of available upgrades with their levels"""
@@ -316,39 +291,112 @@ class MerchantSystem:
         # Apply upgrade effects
         upgrade.apply_upgrade(game, current_level)
         
+        self.refresh_items_list(game)
+        
         return True
     
     def sell_resource(self, game, resource_id, amount=1, location_id="psyche_township"):
         """Sell a resource to the merchant"""
-        # Check if we have space travel with asteroid field
+        return self.sell_resources(game, {resource_id: amount}, location_id)
+    
+    def get_cargo_hold(self, game):
+        """The dict resources are sold from (None when there's no hold)"""
         if hasattr(game, 'space_travel') and hasattr(game.space_travel, 'asteroid_field'):
-            resources = game.space_travel.asteroid_field.collected_resources
+            return game.space_travel.asteroid_field.collected_resources
+        return getattr(game, 'collected_resources', None)  # Cargo restored before space was ever entered
+    
+    def quote_resources(self, game, amounts, location_id="psyche_township"):
+        """Price a whole manifest against one price table: ({resource_id: (amount, price)}, total)"""
+        prices = self.get_market().get_price_table(location_id)
+        quote = {}
+        total = 0
+        for resource_id, amount in amounts.items():
+            price = prices.get(resource_id, 0)
+            quote[resource_id] = (amount, price)
+            total += price * amount
+        return quote, total
+    
+    def sell_resources(self, game, amounts, location_id="psyche_township"):
+        """Sell several resources at once - all of it or nothing; returns credits earned"""
+        resources = self.get_cargo_hold(game)
+        if resources is None:
+            return False
         
-            if resource_id in resources and resources[resource_id] >= amount:
-                # Calculate sale value
-                price_per_unit = self.get_resource_price(resource_id, location_id)
-                total_price = price_per_unit * amount
-            
-                # Add credits to player
-                game.player.credits += total_price
-            
-                # Remove resource
-                resources[resource_id] -= amount
-                if resources[resource_id] <= 0:
-                    del resources[resource_id]
-            
-                # Force refresh of display items
-                self.refresh_items_list(game)
-            
-                return total_price
+        # Drop zero lines, and refuse the whole sale if any line can't be covered
+        amounts = {resource_id: amount for resource_id, amount in amounts.items() if amount > 0}
+        if not amounts:
+            return False
+        for resource_id, amount in amounts.items():
+            if resources.get(resource_id, 0) < amount:
+                return False
+        
+        # Calculate sale value
+        quote, total_price = self.quote_resources(game, amounts, location_id)
+        
+        # Commit: credits, cargo, then the market reacts to everything sold
+        game.player.credits += total_price
+        for resource_id, amount in amounts.items():
+            resources[resource_id] -= amount
+            if resources[resource_id] <= 0:
+                del resources[resource_id]
+        self.get_market().record_sales(location_id, amounts)
+        
+        # Force refresh of display items
+        self.refresh_items_list(game)
+        
+        return total_price
+    
+    def sell_all(self, game, location_id="psyche_township", resource_filter=None):
+        """Unload the hold; resource_filter is a set of ids or a function(resource_id) -> bool"""
+        resources = self.get_cargo_hold(game)
+        if not resources:
+            return False
+        
+        if resource_filter is None:
+            amounts = dict(resources)
+        elif callable(resource_filter):
+            amounts = {resource_id: amount for resource_id, amount in resources.items() if resource_filter(resource_id)}
+        else:
+            amounts = {resource_id: amount for resource_id, amount in resources.items() if resource_id in resource_filter}
+        
+        return self.sell_resources(game, amounts, location_id)
+    
+    def sell_to_threshold(self, game, cargo_threshold, location_id="psyche_township"):
+        """Sell until at most cargo_threshold units are left, best-paying resources first"""
+        resources = self.get_cargo_hold(game)
+        if not resources:
+            return False
+        
+        excess = sum(resources.values()) - cargo_threshold
+        if excess <= 0:
+            return False
+        
+        prices = self.get_market().get_price_table(location_id)
+        amounts = {}
+        for resource_id in sorted(resources, key=lambda r: prices.get(r, 0), reverse=True):
+            amount = min(resources[resource_id], excess)
+            amounts[resource_id] = amount
+            excess -= amount
+            if excess <= 0:
+                break
+        
+        return self.sell_resources(game, amounts, location_id)
     
-        return False
-
     def refresh_items_list(self, game):
         """Refresh the list of items after changes"""
         # Force recalculation of visible items on next draw
-        if hasattr(self, '_cached_items'):
-            del self._cached_items
+        self._cached_items = None
+        self._cached_rows = None
+    
+    def get_view_key(self, game):
+        """Everything the visible list depends on besides trades (which refresh explicitly)"""
+        return (self.selected_tab, game.player.credits, self.get_location_id(game))
+    
+    def get_location_id(self, game):
+        """Location whose prices apply to this trade screen"""
+        if game.current_level:
+            return game.current_level.get("name", "psyche_township")
+        return "psyche_township"
     
     def get_player_resources(self, game):
         """Get player's collected resources"""
@@ -416,6 +464,14 @@ class MerchantSystem:
                 print("Enter/Space pressed, performing selected action")
                 return self.perform_selected_action(game)
             
+            # Unload the whole hold
+            if self.selected_tab == "resources" and event.key == pygame.K_a:
+                credits_earned = self.sell_all(game, self.get_location_id(game))
+                if credits_earned:
+                    print(f"Sold all cargo for {credits_earned} credits!")
+                self.selected_index = 0
+                self.scroll_offset = 0
+            
             # Selling with specific quantity
             if self.selected_tab == "resources" and pygame.K_1 <= event.key <= pygame.K_9:
                 quantity = event.key - pygame.K_0  # 1-9
@@ -424,16 +480,26 @@ class MerchantSystem:
         return True
     
     def get_visible_items(self, game):
-        """Get list of items to display based on selected tab"""
+        """Get list of items to display based on selected tab (cached until something changes)"""
+        key = self.get_view_key(game)
+        if self._cached_items is None or key != self._cached_key:
+            self._cached_items = self.build_visible_items(game)
+            self._cached_rows = None
+            self._cached_key = key
+        return self._cached_items
+    
+    def build_visible_items(self, game):
+        """Compute the list of items for the selected tab"""
         if self.selected_tab == "upgrades":
             return self.get_upgrades(game)
         else:  # "resources"
             resources = self.get_player_resources(game)
+            prices = self.get_market().get_price_table(self.get_location_id(game))
             items = []
             
             for resource_id, amount in resources.items():
                 # Get price info
-                price = self.get_resource_price(resource_id, game.current_level.get("name", "psyche_township"))
+                price = prices.get(resource_id, 0)
                 
                 items.append({
                     "id": resource_id,
@@ -488,8 +554,7 @@ class MerchantSystem:
                 quantity = available
         
             # Sell the resource
-            location_id = game.current_level.get("name", "psyche_township")
-            credits_earned = self.sell_resource(game, resource_id, quantity, location_id)
+            credits_earned = self.sell_resource(game, resource_id, quantity, self.get_location_id(game))
         
             if credits_earned:
                 print(f"Sold {quantity} {selected_item['name']} for {credits_earned} credits!")
@@ -500,9 +565,10 @@ class MerchantSystem:
     def draw(self, screen, game):
         """Draw the merchant interface"""
         # Draw semi-transparent background
-        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))  # Black with alpha
-        screen.blit(overlay, (0, 0))
+        if self._overlay is None:
+            self._overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+            self._overlay.fill((0, 0, 0, 200))  # Black with alpha
+        screen.blit(self._overlay, (0, 0))
         
         # Draw merchant panel
         panel_width = self.screen_width - 200
@@ -517,11 +583,11 @@ class MerchantSystem:
             location = game.current_level["name"].replace("_", " ").title()
             merchant_name = f"{location} Trading Post"
         
-        title = self.font_large.render(merchant_name, True, (255, 255, 255))
+        title = self.render_text(merchant_name, self.font_large, (255, 255, 255))
         screen.blit(title, (panel_rect.centerx - title.get_width() // 2, panel_rect.y + 20))
         
         # Draw player credits
-        credits_text = self.font.render(f"Your Credits: {game.player.credits}", True, (255, 255, 0))
+        credits_text = self.render_text(f"Your Credits: {game.player.credits}", self.font, (255, 255, 0))
         screen.blit(credits_text, (panel_rect.right - credits_text.get_width() - 20, panel_rect.y + 20))
         
         # Draw tabs
@@ -533,7 +599,7 @@ class MerchantSystem:
         pygame.draw.rect(screen, (70, 70, 100) if self.selected_tab == "upgrades" else (30, 30, 50), upgrades_tab_rect)
         pygame.draw.rect(screen, (200, 200, 200), upgrades_tab_rect, 2)
         
-        upgrades_text = self.font.render("1. Ship Upgrades", True, (255, 255, 255))
+        upgrades_text = self.render_text("1. Ship Upgrades", self.font, (255, 255, 255))
         screen.blit(upgrades_text, (upgrades_tab_rect.centerx - upgrades_text.get_width() // 2, tab_y + 10))
         
         # Resources tab
@@ -541,7 +607,7 @@ class MerchantSystem:
         pygame.draw.rect(screen, (70, 70, 100) if self.selected_tab == "resources" else (30, 30, 50), resources_tab_rect)
         pygame.draw.rect(screen, (200, 200, 200), resources_tab_rect, 2)
         
-        resources_text = self.font.render("2. Sell Resources", True, (255, 255, 255))
+        resources_text = self.render_text("2. Sell Resources", self.font, (255, 255, 255))
         screen.blit(resources_text, (resources_tab_rect.centerx - resources_text.get_width() // 2, tab_y + 10))
         
         # Draw content based on selected tab
@@ -553,19 +619,20 @@ class MerchantSystem:
             self.draw_resources_tab(screen, game, content_rect)
         
         # Draw controls hint
-        controls = self.font_small.render(
-            "↑/↓: Navigate | Tab: Switch Tabs | Enter: Buy/Sell | 1-9: Sell Specific Amount | Esc: Exit",
-            True, (200, 200, 200)
+        controls = self.render_text(
+            "↑/↓: Navigate | Tab: Switch Tabs | Enter: Buy/Sell | 1-9: Sell Amount | A: Sell All | Esc: Exit",
+            self.font_small, (200, 200, 200)
         )
         screen.blit(controls, (panel_rect.centerx - controls.get_width() // 2, panel_rect.bottom - 30))
     
     def draw_upgrades_tab(self, screen, game, content_rect):
         """Draw the upgrades tab content"""
-        upgrades = self.get_upgrades(game)
+        upgrades = self.get_visible_items(game)
+        rows = self.get_row_surfaces(game)
         
         # Handle empty list
         if not upgrades:
-            empty_text = self.font.render("No upgrades available", True, (200, 200, 200))
+            empty_text = self.render_text("No upgrades available", self.font, (200, 200, 200))
             screen.blit(empty_text, (content_rect.centerx - empty_text.get_width() // 2, content_rect.y + 50))
             return
         
@@ -573,9 +640,9 @@ class MerchantSystem:
         header_y = content_rect.y
         pygame.draw.line(screen, (150, 150, 150), (content_rect.x, header_y + 30), (content_rect.right, header_y + 30), 1)
         
-        header_upgrade = self.font.render("Upgrade", True, (200, 200, 200))
-        header_stats = self.font.render("Stats", True, (200, 200, 200))
-        header_price = self.font.render("Price", True, (200, 200, 200))
+        header_upgrade = self.render_text("Upgrade", self.font, (200, 200, 200))
+        header_stats = self.render_text("Stats", self.font, (200, 200, 200))
+        header_price = self.render_text("Price", self.font, (200, 200, 200))
         
         screen.blit(header_upgrade, (content_rect.x + 10, header_y))
         screen.blit(header_stats, (content_rect.x + 200, header_y))
@@ -597,27 +664,16 @@ class MerchantSystem:
                 pygame.draw.rect(screen, (70, 70, 100), row_rect)
             
             # Draw upgrade info
-            upgrade = upgrade_info["upgrade"]
+            name_text, desc_text, stats_text, price_text = rows[actual_index]
             
             # Name and description
-            name_text = self.font.render(upgrade.name, True, (255, 255, 255))
             screen.blit(name_text, (content_rect.x + 10, row_y))
-            
-            desc_text = self.font_small.render(upgrade.description, True, (200, 200, 200))
             screen.blit(desc_text, (content_rect.x + 10, row_y + 25))
             
             # Stats
-            stats_text = self.font.render(upgrade_info["stats_text"], True, 
-                                        (255, 255, 255) if not upgrade_info["max_level"] else (150, 150, 150))
             screen.blit(stats_text, (content_rect.x + 200, row_y + 10))
             
             # Price
-            if upgrade_info["max_level"]:
-                price_text = self.font.render("MAXED", True, (150, 150, 150))
-            else:
-                price_text = self.font.render(f"{upgrade_info['price']} credits", True, 
-                                           (0, 255, 0) if upgrade_info["can_afford"] else (255, 0, 0))
-            
             screen.blit(price_text, (content_rect.right - price_text.get_width() - 10, row_y + 10))
         
         # Draw scroll indicators if needed
@@ -626,10 +682,11 @@ class MerchantSystem:
     def draw_resources_tab(self, screen, game, content_rect):
         """Draw the resources tab content"""
         resources = self.get_visible_items(game)
+        rows = self.get_row_surfaces(game)
         
         # Handle empty list
         if not resources:
-            empty_text = self.font.render("No resources to sell", True, (200, 200, 200))
+            empty_text = self.render_text("No resources to sell", self.font, (200, 200, 200))
             screen.blit(empty_text, (content_rect.centerx - empty_text.get_width() // 2, content_rect.y + 50))
             return
         
@@ -637,10 +694,10 @@ class MerchantSystem:
         header_y = content_rect.y
         pygame.draw.line(screen, (150, 150, 150), (content_rect.x, header_y + 30), (content_rect.right, header_y + 30), 1)
         
-        header_resource = self.font.render("Resource", True, (200, 200, 200))
-        header_amount = self.font.render("Amount", True, (200, 200, 200))
-        header_price = self.font.render("Price (ea.)", True, (200, 200, 200))
-        header_total = self.font.render("Total Value", True, (200, 200, 200))
+        header_resource = self.render_text("Resource", self.font, (200, 200, 200))
+        header_amount = self.render_text("Amount", self.font, (200, 200, 200))
+        header_price = self.render_text("Price (ea.)", self.font, (200, 200, 200))
+        header_total = self.render_text("Total Value", self.font, (200, 200, 200))
         
         screen.blit(header_resource, (content_rect.x + 10, header_y))
         screen.blit(header_amount, (content_rect.x + 200, header_y))
@@ -663,27 +720,58 @@ class MerchantSystem:
                 pygame.draw.rect(screen, (70, 70, 100), row_rect)
             
             # Draw resource info
-            name_text = self.font.render(resource["name"], True, (255, 255, 255))
+            name_text, amount_text, price_text, total_text = rows[actual_index]
             screen.blit(name_text, (content_rect.x + 10, row_y + 5))
-            
-            amount_text = self.font.render(str(resource["amount"]), True, (255, 255, 255))
             screen.blit(amount_text, (content_rect.x + 200, row_y + 5))
-            
-            price_text = self.font.render(f"{resource['price']} credits", True, (255, 255, 0))
             screen.blit(price_text, (content_rect.x + 300, row_y + 5))
-            
-            total_text = self.font.render(f"{resource['total_value']} credits", True, (0, 255, 0))
             screen.blit(total_text, (content_rect.right - total_text.get_width() - 10, row_y + 5))
             
             # Draw "sell" prompt for selected item
             if self.selected_index == actual_index:
-                sell_text = self.font_small.render("Press Enter to sell all, or 1-9 to sell specific amount", 
-                                                 True, (255, 200, 0))
+                sell_text = self.render_text("Press Enter to sell all, or 1-9 to sell specific amount", 
+                                             self.font_small, (255, 200, 0))
                 screen.blit(sell_text, (content_rect.centerx - sell_text.get_width() // 2, row_y + 28))
         
         # Draw scroll indicators if needed
         self.draw_scroll_indicators(screen, content_rect, len(resources))
     
+    def render_text(self, text, font, color):
+        """Render a label once and reuse the surface"""
+        return merchant_label_cache.get((text, font, color), lambda: font.render(text, True, color))
+    
+    def get_row_surfaces(self, game):
+        """Rendered text for every row of the visible list, rebuilt along with the list"""
+        items = self.get_visible_items(game)
+        if self._cached_rows is not None:
+            return self._cached_rows
+        
+        rows = []
+        for item in items:
+            if self.selected_tab == "upgrades":
+                upgrade = item["upgrade"]
+                if item["max_level"]:
+                    price_text = self.font.render("MAXED", True, (150, 150, 150))
+                else:
+                    price_text = self.font.render(f"{item['price']} credits", True, 
+                                                  (0, 255, 0) if item["can_afford"] else (255, 0, 0))
+                rows.append((
+                    self.font.render(upgrade.name, True, (255, 255, 255)),
+                    self.font_small.render(upgrade.description, True, (200, 200, 200)),
+                    self.font.render(item["stats_text"], True, 
+                                     (255, 255, 255) if not item["max_level"] else (150, 150, 150)),
+                    price_text
+                ))
+            else:  # "resources"
+                rows.append((
+                    self.font.render(item["name"], True, (255, 255, 255)),
+                    self.font.render(str(item["amount"]), True, (255, 255, 255)),
+                    self.font.render(f"{item['price']} credits", True, (255, 255, 0)),
+                    self.font.render(f"{item['total_value']} credits", True, (0, 255, 0))
+                ))
+        
+        self._cached_rows = rows
+        return rows
+    
     def draw_scroll_indicators(self, screen, content_rect, total_items):
         """Draw scroll indicators if there are more items than visible"""
         if self.scroll_offset > 0:
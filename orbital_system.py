@@ -0,0 +1,115 @@
+# Asteroid Frontier RPG
+# Orbital Mechanics
+
+import math
+from array import array
+
+# Kepler's third law: period grows with radius^1.5, anchored at Earth's orbit on the system map
+REFERENCE_RADIUS = 350      # Map units
+REFERENCE_PERIOD = 1800.0   # Game seconds for one orbit at the reference radius
+ORBIT_TICK = 0.5            # Positions are recomputed at most this often (game seconds)
+
+
+def orbital_period(radius):
+    """Seconds for one orbit at a given radius"""
+    return REFERENCE_PERIOD * (radius / REFERENCE_RADIUS) ** 1.5
+
+
+class OrbitalSystem:
+    """Bodies on circular orbits around the map center, advanced in one batch per game-time tick"""
+    def __init__(self, center=(0, 0)):
+        self.center = center
+        self.game_time = 0.0
+        self.tick = 0
+        self.positions_version = 0  # Bumped whenever positions are recomputed
+
+        # Parallel arrays, one slot per body
+        self.body_ids = []
+        self.body_index = {}
+        self.radius = array('d')
+        self.start_angle = array('d')   # Radians at game time 0
+        self.angular_speed = array('d') # Radians per game second
+        self.x = array('d')
+        self.y = array('d')
+        self.rounded = []  # Last whole-unit positions, to tell which bodies visibly moved
+
+    def add_body(self, body_id, radius, angle_degrees, period=None):
+        """Add a body at an orbital radius and starting angle (period defaults to Kepler's law)"""
+        self.body_index[body_id] = len(self.body_ids)
+        self.body_ids.append(body_id)
+        self.radius.append(radius)
+        self.start_angle.append(math.radians(angle_degrees))
+        self.angular_speed.append(2 * math.pi / (period or orbital_period(radius)))
+        self.x.append(0.0)
+        self.y.append(0.0)
+        self.rounded.append(None)
+        self._compute_slot(len(self.body_ids) - 1, self.tick * ORBIT_TICK)
+        self.positions_version += 1
+
+    def _compute_slot(self, i, time):
+        """Position one body at a time; returns True if it moved to a new whole-unit spot"""
+        angle = self.start_angle[i] + self.angular_speed[i] * time
+        self.x[i] = self.center[0] + self.radius[i] * math.cos(angle)
+        self.y[i] = self.center[1] + self.radius[i] * math.sin(angle)
+
+        whole = (int(self.x[i]), int(self.y[i]))
+        if whole != self.rounded[i]:
+            self.rounded[i] = whole
+            return True
+        return False
+
+    def _compute(self):
+        """Recompute every position for the current tick; returns ids of bodies that moved"""
+        center_x, center_y = self.center
+        time = self.tick * ORBIT_TICK
+        radius, start_angle, angular_speed = self.radius, self.start_angle, self.angular_speed
+        x, y, rounded = self.x, self.y, self.rounded
+        moved = []
+
+        # Inlined rather than calling _compute_slot - this runs for every body each tick
+        for i in range(len(self.body_ids)):
+            angle = start_angle[i] + angular_speed[i] * time
+            x[i] = center_x + radius[i] * math.cos(angle)
+            y[i] = center_y + radius[i] * math.sin(angle)
+
+            whole = (int(x[i]), int(y[i]))
+            if whole != rounded[i]:
+                rounded[i] = whole
+                moved.append(self.body_ids[i])
+
+        self.positions_version += 1
+        return moved
+
+    def advance(self, dt):
+        """Move game time forward; returns ids of bodies that moved (empty between ticks)"""
+        self.game_time += dt
+        tick = int(self.game_time / ORBIT_TICK)
+        if tick == self.tick:
+            return []
+        self.tick = tick
+        return self._compute()
+
+    def set_time(self, game_time):
+        """Jump to a game time (e.g. after loading) and return every body id"""
+        self.game_time = game_time
+        self.tick = int(game_time / ORBIT_TICK)
+        self._compute()
+        return list(self.body_ids)
+
+    def position(self, body_id):
+        """(x, y) of a body at the current tick"""
+        i = self.body_index[body_id]
+        return (self.x[i], self.y[i])
+
+    def positions(self, body_ids=None):
+        """{body_id: (x, y)} for the given bodies (all by default)"""
+        if body_ids is None:
+            body_ids = self.body_ids
+        return {body_id: self.position(body_id) for body_id in body_ids}
+
+
+# Example usage:
+# orbits = OrbitalSystem(center=(1000, 1000))
+# orbits.add_body("mars", 450, 315)
+# moved = orbits.advance(dt)
+# system_map.update_positions(orbits.positions(moved))
@@ -0,0 +1,99 @@
+# Asteroid Frontier RPG
+# Quadtree
+
+# Boxes are (left, top, right, bottom) in map units
+MAX_ITEMS = 8    # Items a node holds before it splits
+MAX_DEPTH = 8    # Nodes this deep never split (keeps piles of overlapping items cheap)
+
+
+def boxes_overlap(a, b):
+    """True if two boxes touch or overlap"""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def box_contains(outer, inner):
+    """True if inner lies completely inside outer"""
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and inner[2] <= outer[2] and inner[3] <= outer[3]
+
+
+def point_box(x, y):
+    """Zero-size box for a point"""
+    return (x, y, x, y)
+
+
+def segment_box(start, end):
+    """Bounding box of a line segment"""
+    return (min(start[0], end[0]), min(start[1], end[1]), max(start[0], end[0]), max(start[1], end[1]))
+
+
+class QuadTree:
+    """Map items bucketed by area, so drawing only looks at what overlaps the view"""
+    def __init__(self, bounds, depth=0):
+        self.bounds = bounds
+        self.depth = depth
+        self.items = {}  # {item_id: box} for items kept at this node
+        self.children = None
+
+    def clear(self):
+        """Remove every item"""
+        self.items = {}
+        self.children = None
+
+    def insert(self, item_id, box):
+        """Add an item; anything outside the bounds stays at the root and is always checked"""
+        node = self
+        while node.children is not None:
+            # Descend into the one child that fully holds the box; straddlers stay put
+            for child in node.children:
+                if box_contains(child.bounds, box):
+                    node = child
+                    break
+            else:
+                break
+
+        node.items[item_id] = box
+        if node.children is None and len(node.items) > MAX_ITEMS and node.depth < MAX_DEPTH:
+            node.split()
+
+    def split(self):
+        """Divide this node in four and push its items down where they fit"""
+        left, top, right, bottom = self.bounds
+        mid_x = (left + right) / 2
+        mid_y = (top + bottom) / 2
+        self.children = [
+            QuadTree((left, top, mid_x, mid_y), self.depth + 1),
+            QuadTree((mid_x, top, right, mid_y), self.depth + 1),
+            QuadTree((left, mid_y, mid_x, bottom), self.depth + 1),
+            QuadTree((mid_x, mid_y, right, bottom), self.depth + 1),
+        ]
+
+        items = self.items
+        self.items = {}
+        for item_id, box in items.items():
+            self.insert(item_id, box)
+
+    def query(self, box):
+        """Ids of every item whose box overlaps the given box"""
+        found = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            for item_id, item_box in node.items.items():
+                if boxes_overlap(box, item_box):
+                    found.append(item_id)
+            if node.children is not None:
+                stack.extend(child for child in node.children if boxes_overlap(box, child.bounds))
+        return found
+
+    def __len__(self):
+        count = len(self.items)
+        if self.children is not None:
+            count += sum(len(child) for child in self.children)
+        return count
+
+
+# Example usage:
+# tree = QuadTree((0, 0, 2000, 2000))
+# tree.insert("mars", point_box(1318, 682))
+# tree.insert(("earth", "mars"), segment_box(earth_pos, mars_pos))
+# visible = tree.query((view_left, view_top, view_right, view_bottom))
@@ -0,0 +1,120 @@
+# Asteroid Frontier RPG
+# Route Planner
+
+import heapq
+
+
+def distance_weight(system_map, location_id, connected_id, distance):
+    return distance
+
+
+def cost_weight(system_map, location_id, connected_id, distance):
+    return system_map._calculate_travel_cost(distance, system_map.locations[connected_id])
+
+
+def danger_weight(system_map, location_id, connected_id, distance):
+    # Every jump counts a little so equally safe routes prefer fewer hops
+    return system_map.locations[connected_id].danger_level + 0.01
+
+
+# What "shortest" means for each kind of route
+ROUTE_METRICS = {
+    "distance": distance_weight,
+    "cost": cost_weight,
+    "danger": danger_weight,
+}
+
+
+class RoutePlanner:
+    """Shortest routes between SystemMap locations, cached until the connections change"""
+    def __init__(self, system_map):
+        self.system_map = system_map
+        self.trees = {}  # {(metric, source): (totals, previous)} from one Dijkstra run
+
+    def invalidate(self):
+        """Forget every cached route (locations or connections changed)"""
+        self.trees.clear()
+
+    def shortest_tree(self, source, metric="distance"):
+        """Dijkstra from source: ({location_id: total weight}, {location_id: previous location})"""
+        key = (metric, source)
+        tree = self.trees.get(key)
+        if tree is not None:
+            return tree
+
+        weight = ROUTE_METRICS[metric]
+        locations = self.system_map.locations
+        totals = {source: 0}
+        previous = {}
+        heap = [(0, source)]
+        while heap:
+            total, location_id = heapq.heappop(heap)
+            if total > totals[location_id]:
+                continue  # Stale entry, a shorter way was already found
+
+            for connected_id, distance in locations[location_id].connected_locations.items():
+                if connected_id not in locations:
+                    continue
+                candidate = total + weight(self.system_map, location_id, connected_id, distance)
+                if candidate < totals.get(connected_id, float('inf')):
+                    totals[connected_id] = candidate
+                    previous[connected_id] = location_id
+                    heapq.heappush(heap, (candidate, connected_id))
+
+        tree = (totals, previous)
+        self.trees[key] = tree
+        return tree
+
+    def precompute(self, metric="distance"):
+        """Fill the cache for every source (all-pairs), e.g. while a loading screen is up"""
+        for location_id in self.system_map.locations:
+            self.shortest_tree(location_id, metric)
+
+    def find_route(self, source, destination, metric="distance"):
+        """Itinerary from source to destination, or None if it can't be reached"""
+        if source not in self.system_map.locations or destination not in self.system_map.locations:
+            return None
+        totals, previous = self.shortest_tree(source, metric)
+        if destination not in totals or destination == source:
+            return None
+
+        path = [destination]
+        while path[-1] != source:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return self.describe_route(path)
+
+    def describe_route(self, path):
+        """Legs and totals for a path of location ids"""
+        locations = self.system_map.locations
+        legs = []
+        for location_id, next_id in zip(path, path[1:]):
+            distance = locations[location_id].connected_locations[next_id]
+            legs.append({
+                "from": location_id,
+                "to": next_id,
+                "distance": distance,
+                "cost": self.system_map._calculate_travel_cost(distance, locations[next_id])
+            })
+
+        return {
+            "path": path,
+            "legs": legs,
+            "distance": sum(leg["distance"] for leg in legs),
+            "cost": sum(leg["cost"] for leg in legs),
+            "danger": max(locations[location_id].danger_level for location_id in path[1:])
+        }
+
+    def reachable_routes(self, source, metric="distance"):
+        """{destination: route} for every location reachable from source"""
+        if source not in self.system_map.locations:
+            return {}
+        totals, previous = self.shortest_tree(source, metric)
+        return {destination: self.find_route(source, destination, metric)
+                for destination in totals if destination != source}
+
+
+# Example usage:
+# planner = RoutePlanner(system_map)
+# route = planner.find_route("mars", "pallas", "cost")
+# print(" -> ".join(route["path"]), route["cost"])
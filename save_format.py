@@ -0,0 +1,177 @@
+# Asteroid Frontier RPG
+# Save File Format
+
+import json
+import lzma
+import os
+import struct
+import sys
+import zlib
+
+# Save container: header, small uncompressed meta (for the save menus), then the compressed body
+SAVE_MAGIC = b"AFSV"
+SAVE_CONTAINER_VERSION = 1
+SAVE_HEADER = struct.Struct("<4sHHBxII")  # magic, container version, schema version, compression, meta size, body size
+SAVE_EXTENSION = ".sav"
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_LZMA = 2
+COMPRESSORS = {
+    COMPRESSION_NONE: (lambda data: data, lambda data: data),
+    COMPRESSION_ZLIB: (lambda data: zlib.compress(data, 6), zlib.decompress),
+    COMPRESSION_LZMA: (lzma.compress, lzma.decompress),
+}
+
+# Layout of the current save schema: every section and the default for each field
+SAVE_SCHEMA_VERSION = 3
+SAVE_SCHEMA = {
+    "meta": {"schema": SAVE_SCHEMA_VERSION, "timestamp": "Unknown", "save_name": "save"},
+    "player": {"position": {"x": 0, "y": 0}, "health": 100, "max_health": 100, "credits": 0},
+    "inventory": {"items": []},
+    "resources": {},
+    "current_location": {"id": "psyche_township", "docked_location": None},
+    "ship": {},  # Empty until the ship has flown; its stats then come from the space scene
+    "game_flags": {"tutorial_completed": False},
+    "visited_locations": [],
+    "ship_upgrades": {},
+    "quests": {"active": {}, "completed": []},
+}
+
+# Fields copied into the uncompressed meta block so listings never touch the body
+META_FIELDS = {
+    "save_name": ("meta", "save_name"),
+    "timestamp": ("meta", "timestamp"),
+    "location": ("current_location", "id"),
+    "credits": ("player", "credits"),
+}
+
+
+def migrate_1_to_2(save_data):
+    """0.1 saves: string "version" in meta becomes an integer schema number"""
+    save_data["meta"].pop("version", None)
+    save_data["meta"]["schema"] = 2
+    return save_data
+
+
+def migrate_2_to_3(save_data):
+    """Upgrade levels and quest state are saved from 3 on (older saves start with none)"""
+    save_data["meta"]["schema"] = 3
+    return save_data
+
+
+# {schema version: function upgrading a save from that version to the next}
+MIGRATIONS = {
+    1: migrate_1_to_2,
+    2: migrate_2_to_3,
+}
+
+
+def schema_version(save_data):
+    """Schema number of a decoded save (the original JSON saves are version 1)"""
+    return save_data.get("meta", {}).get("schema", 1)
+
+
+def migrate_save(save_data):
+    """Upgrade a save to the current schema and fill in anything it is missing"""
+    save_data.setdefault("meta", {})
+    version = schema_version(save_data)
+    if version > SAVE_SCHEMA_VERSION:
+        raise ValueError(f"Save schema {version} is newer than this game ({SAVE_SCHEMA_VERSION})")
+
+    while version < SAVE_SCHEMA_VERSION:
+        save_data = MIGRATIONS[version](save_data)
+        version += 1
+
+    return apply_schema_defaults(save_data, SAVE_SCHEMA)
+
+
+def apply_schema_defaults(data, schema):
+    """Fill missing fields from the schema, recursing into sections"""
+    for key, default in schema.items():
+        if key not in data or data[key] is None and default is not None:
+            data[key] = json.loads(json.dumps(default))  # Fresh copy of mutable defaults
+        elif isinstance(default, dict) and default and isinstance(data[key], dict):
+            apply_schema_defaults(data[key], default)
+    return data
+
+
+def build_meta(save_data):
+    """The small block the save menus read"""
+    return {name: save_data[section][field] for name, (section, field) in META_FIELDS.items()}
+
+
+def encode_save(save_data, compression=COMPRESSION_ZLIB):
+    """Pack a save into the binary container"""
+    meta = json.dumps(build_meta(save_data), separators=(',', ':')).encode('utf-8')
+    body = json.dumps(save_data, separators=(',', ':')).encode('utf-8')
+    body = COMPRESSORS[compression][0](body)
+    header = SAVE_HEADER.pack(SAVE_MAGIC, SAVE_CONTAINER_VERSION, schema_version(save_data),
+                              compression, len(meta), len(body))
+    return header + meta + body
+
+
+def read_header(data):
+    """Unpack and check the container header: (schema, compression, meta size, body size)"""
+    if len(data) < SAVE_HEADER.size:
+        raise ValueError("Save file is truncated")
+    magic, container_version, schema, compression, meta_size, body_size = SAVE_HEADER.unpack_from(data, 0)
+    if magic != SAVE_MAGIC:
+        raise ValueError("Not a save file")
+    if container_version != SAVE_CONTAINER_VERSION or compression not in COMPRESSORS:
+        raise ValueError("Unsupported save container")
+    return schema, compression, meta_size, body_size
+
+
+def decode_save(data):
+    """Unpack a binary save and bring it up to the current schema"""
+    schema, compression, meta_size, body_size = read_header(data)
+    start = SAVE_HEADER.size + meta_size
+    body = data[start:start + body_size]
+    if len(body) != body_size:
+        raise ValueError("Save file is truncated")
+    save_data = json.loads(COMPRESSORS[compression][1](body))
+    return migrate_save(save_data)
+
+
+def read_save_meta(path):
+    """Read only the header and meta block of a save file"""
+    with open(path, 'rb') as f:
+        header = f.read(SAVE_HEADER.size)
+        schema, compression, meta_size, body_size = read_header(header)
+        return json.loads(f.read(meta_size))
+
+
+def load_save_file(path):
+    """Load a save in either format (.sav, or the old pretty-printed .json)"""
+    if path.endswith(SAVE_EXTENSION):
+        with open(path, 'rb') as f:
+            return decode_save(f.read())
+    with open(path, 'r') as f:
+        return migrate_save(json.load(f))
+
+
+def export_json(path, json_path=None):
+    """Write a save out as readable JSON for debugging (default: an exports folder next to it)"""
+    save_data = load_save_file(path)
+    if json_path is None:
+        folder, filename = os.path.split(path)
+        os.makedirs(os.path.join(folder, "exports"), exist_ok=True)
+        json_path = os.path.join(folder, "exports", filename.rsplit('.', 1)[0] + ".json")
+    with open(json_path, 'w') as f:
+        json.dump(save_data, f, indent=2)
+    return json_path
+
+
+if __name__ == "__main__":
+    # python save_format.py saves/quicksave.sav [out.json]
+    if len(sys.argv) < 2:
+        print("Usage: python save_format.py <save file> [json file]")
+        sys.exit(1)
+    print(f"Exported to {export_json(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)}")
+
+
+# Example usage:
+# data = encode_save(save_data, COMPRESSION_LZMA)
+# save_data = decode_save(data)
+# meta = read_save_meta("saves/quicksave.sav")
@@ -1,11 +1,234 @@
 import json
 import os
+import zlib
+import queue
+import struct
 import datetime
+import threading
 import pygame
 from pathlib import Path
 
 # Import GameState from game_structure
 from game_structure import GameState
+from save_format import (SAVE_EXTENSION, SAVE_SCHEMA_VERSION, build_meta, encode_save, export_json,
+                         load_save_file, migrate_save, read_save_meta)
+from event_system import LOCATION_ENTERED, QUEST_STARTED, QUEST_COMPLETED
+
+# Listing metadata for every save, kept next to the saves (not .sav/.json so it's never listed itself)
+SAVE_INDEX_FILE = "index.meta"
+SAVE_INDEX_VERSION = 2
+
+# Older saves are pretty-printed JSON; they still load, and are replaced on the next save to that slot
+LEGACY_SAVE_EXTENSION = ".json"
+
+
+def save_summary(filename, save_data):
+    """What the save menus show for a save"""
+    return {
+        "filename": filename,
+        "save_name": save_data["meta"].get("save_name", filename),
+        "timestamp": save_data["meta"].get("timestamp", "Unknown"),
+        "location": save_data["current_location"].get("id", "Unknown"),
+        "credits": save_data["player"].get("credits", 0)
+    }
+
+
+def write_file_atomic(path, data):
+    """Write bytes to a temp file, fsync it, then rename over path so a crash never leaves half a save"""
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    
+    # Make the rename itself durable (directories can't be opened on Windows)
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(os.path.dirname(path) or '.', os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def apply_ship_state(space_travel, ship_data):
+    """Put saved ship stats onto a space scene (stats that weren't saved keep the ship's own values)"""
+    # Ship stats
+    for stat in ("hull_strength", "shield_strength"):
+        if stat in ship_data:
+            setattr(space_travel.ship, stat, ship_data[stat])
+    
+    # Movement properties
+    for stat in ("thrust_power", "rotation_speed", "max_speed"):
+        if stat in ship_data:
+            setattr(space_travel, stat, ship_data[stat])
+
+
+class SaveWriter:
+    """Background thread that serializes save snapshots and writes them atomically"""
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.finished = queue.Queue()  # (callback, success, path, error) for the main thread
+        self.thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+        self.thread.start()
+    
+    def submit(self, path, save_data, callback=None, encode=None):
+        """Queue a snapshot for writing; callback(success, path, error) runs from dispatch()"""
+        def write():
+            if encode:
+                data = encode(save_data)
+            else:
+                data = json.dumps(save_data, indent=2).encode('utf-8')
+            write_file_atomic(path, data)
+        self.submit_task(write, path, callback)
+    
+    def submit_task(self, task, path, callback=None):
+        """Queue any file work (a function taking no arguments) to run on the writer thread"""
+        self.jobs.put((task, path, callback))
+    
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self.jobs.task_done()
+                return
+            
+            task, path, callback = job
+            try:
+                task()
+                self.finished.put((callback, True, path, None))
+            except Exception as e:
+                self.finished.put((callback, False, path, e))
+            finally:
+                self.jobs.task_done()
+    
+    def dispatch(self):
+        """Run callbacks for finished writes (call from the main thread); returns how many finished"""
+        count = 0
+        while True:
+            try:
+                callback, success, path, error = self.finished.get_nowait()
+            except queue.Empty:
+                return count
+            
+            count += 1
+            if not success:
+                print(f"Error writing {path}: {error}")
+            if callback:
+                callback(success, path, error)
+    
+    def flush(self):
+        """Block until every queued save is on disk (including writes queued by callbacks)"""
+        while True:
+            self.jobs.join()
+            if not self.dispatch():
+                return
+    
+    def shutdown(self):
+        """Finish pending writes and stop the thread"""
+        self.flush()
+        self.jobs.put(None)
+        self.thread.join()
+
+
+# Autosave: a full snapshot plus a journal of section deltas written since it
+AUTOSAVE_NAME = "autosave"
+JOURNAL_SECTIONS = ("player", "inventory", "resources", "ship", "ship_upgrades",
+                    "current_location", "game_flags", "visited_locations", "quests")
+JOURNAL_RECORD = struct.Struct("<II")  # payload size, crc32 of the payload
+JOURNAL_COMPACT_RECORDS = 50           # Fold the journal into a new snapshot after this many deltas
+
+
+class SaveJournal:
+    """Appends only the sections that changed since the last autosave; replays them on recovery"""
+    def __init__(self, save_folder, name=AUTOSAVE_NAME):
+        self.snapshot_path = os.path.join(save_folder, name + SAVE_EXTENSION)
+        self.journal_path = os.path.join(save_folder, name + ".journal")
+        
+        # Only touched from the writer thread once autosaving starts
+        self.last_sections = None  # {section: compact JSON as last written}
+        self.base = 0              # Id of the snapshot the journal applies to
+        self.records = 0
+    
+    def write(self, save_data):
+        """Write an autosave: a delta record, or a fresh snapshot when it's time to compact"""
+        sections = {name: json.dumps(save_data.get(name), separators=(',', ':'), sort_keys=True)
+                    for name in JOURNAL_SECTIONS}
+        
+        if self.last_sections is None or self.records >= JOURNAL_COMPACT_RECORDS:
+            self.compact(save_data)
+        else:
+            changed = {name: text for name, text in sections.items() if text != self.last_sections.get(name)}
+            if not changed:
+                return
+            
+            # Sections are embedded as already-serialized JSON text
+            payload = '{"base":%d,"meta":%s,"sections":{%s}}' % (
+                self.base,
+                json.dumps(save_data["meta"], separators=(',', ':')),
+                ','.join(f'{json.dumps(name)}:{text}' for name, text in changed.items())
+            )
+            payload = zlib.compress(payload.encode('utf-8'))
+            with open(self.journal_path, 'ab') as f:
+                f.write(JOURNAL_RECORD.pack(len(payload), zlib.crc32(payload)) + payload)
+                f.flush()
+                os.fsync(f.fileno())
+            self.records += 1
+        
+        self.last_sections = sections
+    
+    def compact(self, save_data):
+        """Replace the snapshot with the full state and start an empty journal"""
+        self.base += 1
+        save_data["meta"]["journal_base"] = self.base
+        write_file_atomic(self.snapshot_path, encode_save(save_data))
+        write_file_atomic(self.journal_path, b"")
+        self.records = 0
+    
+    def read_records(self):
+        """Yield intact journal records, stopping at the first torn or corrupt one"""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        
+        offset = 0
+        while offset + JOURNAL_RECORD.size <= len(data):
+            size, crc = JOURNAL_RECORD.unpack_from(data, offset)
+            payload = data[offset + JOURNAL_RECORD.size:offset + JOURNAL_RECORD.size + size]
+            if len(payload) != size or zlib.crc32(payload) != crc:
+                return  # Crashed mid-append; everything before this is good
+            yield json.loads(zlib.decompress(payload))
+            offset += JOURNAL_RECORD.size + size
+    
+    def recover(self):
+        """Latest autosave state: the snapshot with every journal record replayed (None if no autosave)"""
+        if not os.path.exists(self.snapshot_path):
+            return None
+        save_data = load_save_file(self.snapshot_path)
+        base = save_data["meta"].get("journal_base", 0)
+        
+        for record in self.read_records():
+            # Records from before the last compaction belong to an older snapshot
+            if record["base"] != base:
+                continue
+            save_data["meta"] = record["meta"]
+            save_data.update(record["sections"])
+        
+        save_data["meta"]["journal_base"] = base
+        return migrate_save(save_data)
+    
+    def resume(self):
+        """Carry on from an existing autosave (run on the writer thread)"""
+        save_data = self.recover()
+        if save_data is None:
+            return
+        self.base = save_data["meta"]["journal_base"]
+        self.records = sum(1 for record in self.read_records() if record["base"] == self.base)
+        self.last_sections = {name: json.dumps(save_data.get(name), separators=(',', ':'), sort_keys=True)
+                              for name in JOURNAL_SECTIONS}
+
 
 class SaveSystem:
     def __init__(self, game):
@@ -15,13 +238,86 @@ class SaveSystem:
         
         # Create saves directory if it doesn't exist
         Path(self.save_folder).mkdir(exist_ok=True)
+        
+        # Saves are written off the main thread
+        self.writer = SaveWriter()
+        self.pending_saves = 0  # Writes queued but not yet on disk
+        
+        # {filename: summary} and {filename: [mtime, size, ...] of the files it was read from}
+        self.index, self.index_stats = self.load_index()
+        
+        # Autosaves go to a journal; pick up where the last session left it
+        self.journal = SaveJournal(self.save_folder)
+        self.writer.submit_task(self.journal.resume, self.journal.journal_path)
+        self.loading = False
+    
+    def attach_event_bus(self, event_bus):
+        """Autosave whenever the player docks somewhere or a quest starts or finishes"""
+        for event_type in (LOCATION_ENTERED, QUEST_STARTED, QUEST_COMPLETED):
+            event_bus.subscribe(event_type, lambda event_type, payload: self.autosave())
+    
+    def autosave(self):
+        """Snapshot the game and append what changed to the autosave journal"""
+        if self.loading:
+            return False  # Restoring a save fires the same events
+        save_data = self.create_save_data()
+        save_data["meta"]["save_name"] = AUTOSAVE_NAME
+        self.writer.submit_task(lambda: self.journal.write(save_data), self.journal.journal_path)
+        return True
+    
+    def load_index(self):
+        """Read the save index as (summaries, file stats) - empty if missing or from another version"""
+        try:
+            with open(os.path.join(self.save_folder, SAVE_INDEX_FILE), 'r') as f:
+                data = json.load(f)
+            if data.get("version") == SAVE_INDEX_VERSION:
+                return data["saves"], data["stats"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, AttributeError):
+            pass
+        return {}, {}
+    
+    def write_index(self):
+        """Write the index in the background (entries are replaced, never mutated, so shallow copies are a snapshot)"""
+        index_data = {"version": SAVE_INDEX_VERSION, "saves": dict(self.index), "stats": dict(self.index_stats)}
+        self.writer.submit(os.path.join(self.save_folder, SAVE_INDEX_FILE), index_data,
+                           encode=lambda data: json.dumps(data, separators=(',', ':')).encode('utf-8'))
+    
+    def file_stats(self, filename, stat=None):
+        """[mtime, size] of a save file - plus its journal's for the autosave, whose deltas change the listing"""
+        if stat is None:
+            stat = os.stat(os.path.join(self.save_folder, filename))
+        stats = [stat.st_mtime_ns, stat.st_size]
+        if filename == os.path.basename(self.journal.snapshot_path):
+            try:
+                journal_stat = os.stat(self.journal.journal_path)
+                stats += [journal_stat.st_mtime_ns, journal_stat.st_size]
+            except FileNotFoundError:
+                pass
+        return stats
+    
+    def read_summary(self, filename, path):
+        """Read a save's listing summary from disk"""
+        if filename == os.path.basename(self.journal.snapshot_path):
+            # The snapshot's own meta is stale once deltas have been appended
+            return dict(build_meta(self.journal.recover()), filename=filename)
+        if filename.endswith(SAVE_EXTENSION):
+            # Binary saves keep it in a small block up front
+            return dict(read_save_meta(path), filename=filename)
+        with open(path, 'r') as f:
+            return save_summary(filename, json.load(f))
+    
+    def index_save(self, filename, summary):
+        """Record a save's summary against the file's current mtime and size"""
+        self.index[filename] = summary
+        self.index_stats[filename] = self.file_stats(filename)
     
     def create_save_data(self):
         """Create a dictionary containing all game state data to be saved"""
+        # Every container is built fresh, so the background writer can encode it while the game runs
         save_data = {
             # Meta information
             "meta": {
-                "version": "0.1",
+                "schema": SAVE_SCHEMA_VERSION,
                 "timestamp": datetime.datetime.now().isoformat(),
                 "save_name": f"save_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
             },
@@ -53,15 +349,7 @@ class SaveSystem:
             },
             
             # Ship data
-            "ship": {
-                # Get ship attributes from space travel if it exists
-                "hull_strength": getattr(self.game.space_travel, 'ship', {}).hull_strength if hasattr(self.game, 'space_travel') and hasattr(self.game.space_travel, 'ship') else 100,
-                "shield_strength": getattr(self.game.space_travel, 'ship', {}).shield_strength if hasattr(self.game, 'space_travel') and hasattr(self.game.space_travel, 'ship') else 0,
-                "thrust_power": getattr(self.game.space_travel, 'thrust_power', 0.1) if hasattr(self.game, 'space_travel') else 0.1,
-                "rotation_speed": getattr(self.game.space_travel, 'rotation_speed', 3) if hasattr(self.game, 'space_travel') else 3,
-                "max_speed": getattr(self.game.space_travel, 'max_speed', 5) if hasattr(self.game, 'space_travel') else 5,
-                # Add other ship attributes
-            },
+            "ship": self.get_ship_state(),
             
             # Game state flags 
             "game_flags": {
@@ -71,33 +359,45 @@ class SaveSystem:
             },
             
             # Visited locations
-            "visited_locations": getattr(self.game, 'visited_locations', []),
+            "visited_locations": list(getattr(self.game, 'visited_locations', [])),
+            
+            # Purchased ship upgrade levels
+            "ship_upgrades": dict(getattr(self.game, 'ship_upgrades', {})),
+            
+            # Active quest progress and completed quests
+            "quests": self.game.quest_manager.get_state() if hasattr(self.game, 'quest_manager') else {},
             
         }
     
         # Save player inventory if it exists
         if hasattr(self.game.player, 'inventory') and hasattr(self.game.player.inventory, 'items'):
-            # Convert inventory items to serializable format
+            # Catalog items only need their instance state (id, quantity, durability)
             for item in self.game.player.inventory.items:
-                item_data = {
-                    "id": item.id,
-                    "name": item.name,
-                    "type": getattr(item, 'type', 'item'),
-                    "quantity": getattr(item, 'quantity', 1),
-                    "value": getattr(item, 'value', 0)
-                }
-                save_data["inventory"]["items"].append(item_data)
-    
-        # Save collected resources if they exist
-        if hasattr(self.game, 'space_travel') and hasattr(self.game.space_travel, 'asteroid_field'):
-            resources = self.game.space_travel.asteroid_field.get_collected_resources()
-            save_data["resources"] = resources
+                save_data["inventory"]["items"].append(item.to_save())
+    
+        # Save collected resources (the game and the asteroid field share one dict)
+        save_data["resources"] = dict(getattr(self.game, 'collected_resources', {}))
     
         return save_data
+    
+    def get_ship_state(self):
+        """Ship stats from the space scene, or the restored ones it hasn't been built to use yet"""
+        space_travel = getattr(self.game, 'space_travel', None)
+        if space_travel is None:
+            return dict(getattr(self.game, 'pending_ship_state', None) or {})
+        
+        return {
+            "hull_strength": space_travel.ship.hull_strength,
+            "shield_strength": space_travel.ship.shield_strength,
+            "thrust_power": space_travel.thrust_power,
+            "rotation_speed": space_travel.rotation_speed,
+            "max_speed": space_travel.max_speed,
+            # Add other ship attributes
+        }
 
-    def save_game(self, save_name=None):
-        """Save the current game state to a file"""
-        # Create the save data
+    def save_game(self, save_name=None, callback=None, wait=False):
+        """Snapshot the game state now and write it in the background"""
+        # Create the save data (a fresh snapshot, so later changes can't leak into the write)
         save_data = self.create_save_data()
         
         # Use provided save name or generate one
@@ -105,19 +405,42 @@ class SaveSystem:
             save_data["meta"]["save_name"] = save_name
         
         # Generate filename
-        filename = f"{save_data['meta']['save_name']}.json"
+        filename = f"{save_data['meta']['save_name']}{SAVE_EXTENSION}"
         save_path = os.path.join(self.save_folder, filename)
         
-        try:
-            # Write to file
-            with open(save_path, 'w') as f:
-                json.dump(save_data, f, indent=2)
-            
-            print(f"Game saved successfully to {save_path}")
-            return True
-        except Exception as e:
-            print(f"Error saving game: {e}")
-            return False
+        summary = save_summary(filename, save_data)
+        
+        def on_complete(success, path, error):
+            self.pending_saves -= 1
+            if success:
+                print(f"Game saved successfully to {path}")
+                self.index_save(filename, summary)
+                
+                # The new binary save supersedes an old JSON save of the same name
+                legacy_path = path[:-len(SAVE_EXTENSION)] + LEGACY_SAVE_EXTENSION
+                if os.path.exists(legacy_path):
+                    os.remove(legacy_path)
+                    self.index.pop(os.path.basename(legacy_path), None)
+                    self.index_stats.pop(os.path.basename(legacy_path), None)
+                
+                self.write_index()
+            if callback:
+                callback(success, path, error)
+        
+        self.pending_saves += 1
+        self.writer.submit(save_path, save_data, on_complete, encode_save)
+        
+        if wait:
+            self.writer.flush()
+        return True
+    
+    def update(self):
+        """Deliver finished saves to their callbacks (call once per frame)"""
+        return self.writer.dispatch()
+    
+    def shutdown(self):
+        """Wait for pending saves before the game exits"""
+        self.writer.shutdown()
 
     def load_game(self, filename):
         """Load a game state from a file"""
@@ -128,9 +451,12 @@ class SaveSystem:
             return False
         
         try:
-            # Read the save file
-            with open(save_path, 'r') as f:
-                save_data = json.load(f)
+            # Read the save file (either format), migrated to the current schema
+            if filename == AUTOSAVE_NAME + SAVE_EXTENSION:
+                self.writer.flush()  # Pending autosaves first
+                save_data = self.journal.recover()  # Snapshot plus journal
+            else:
+                save_data = load_save_file(save_path)
             
             # Apply the loaded data to restore game state
             self.apply_save_data(save_data)
@@ -143,6 +469,13 @@ class SaveSystem:
 
     def apply_save_data(self, save_data):
         """Apply loaded save data to the game state"""
+        self.loading = True
+        try:
+            self._apply_save_data(save_data)
+        finally:
+            self.loading = False
+    
+    def _apply_save_data(self, save_data):
         # Restore player data
         if "player" in save_data:
             # Position
@@ -161,63 +494,73 @@ class SaveSystem:
         # Restore inventory if player has inventory system
         if "inventory" in save_data and hasattr(self.game.player, 'inventory'):
             # Clear current inventory
-            if hasattr(self.game.player.inventory, 'items'):
-                self.game.player.inventory.items = []
+            self.game.player.inventory.clear()
             
-            # Add saved items
-            from item_inventory import Item
+            # Rebuild saved items, then add them in one batch
+            from item_inventory import Item, item_registry
+            items = []
             for item_data in save_data["inventory"].get("items", []):
+                # Instance-state entries come back from the catalog definition
+                if "name" not in item_data:
+                    item = item_registry.restore(item_data)
+                    if item is not None:
+                        items.append(item)
+                        continue
+                
+                # Saved items with a quantity are stacks
                 item = Item(
                     item_data.get("id", "unknown"),
                     item_data.get("name", "Unknown Item"),
                     "A saved item",
-                    item_data.get("value", 0)
+                    item_data.get("value", 0),
+                    type=item_data.get("type", "item"),
+                    stackable="quantity" in item_data
                 )
-            
-                # Set type if specified
-                if "type" in item_data:
-                    item.type = item_data["type"]
                 
                 # Set quantity if specified
                 if "quantity" in item_data:
                     item.quantity = item_data["quantity"]
-                    item.stackable = True
             
-                # Add to inventory
-                self.game.player.inventory.add_item(item)
+                items.append(item)
+            
+            if not self.game.player.inventory.add_items(items):
+                # Over capacity/weight (e.g. limits changed) - keep as much as fits
+                print("Saved inventory doesn't fit, restoring what we can")
+                for item in items:
+                    self.game.player.inventory.add_item(item)
     
-        # Restore resources
-        if "resources" in save_data:
-            # Ensure space travel system exists
-            if not hasattr(self.game, 'space_travel'):
-                self.game.enter_space()  # Initialize if needed
-                self.game.game_state = GameState.OVERWORLD  # But return to overworld state
+        # Restore resources into the shared cargo dict (in place, so the asteroid field sees them too)
+        self.game.collected_resources.clear()
+        self.game.collected_resources.update(save_data["resources"])
         
-            # Apply saved resources to asteroid field
-            if hasattr(self.game, 'space_travel') and hasattr(self.game.space_travel, 'asteroid_field'):
-                self.game.space_travel.asteroid_field.collected_resources = save_data["resources"]
-            
-            # Restore current location
-            if "current_location" in save_data:
-                location_id = save_data["current_location"]["id"]
-            
-                # Set docked location if applicable
-                if "docked_location" in save_data["current_location"] and save_data["current_location"]["docked_location"]:
-                    self.game.docked_location = save_data["current_location"]["docked_location"]
-            
-                # Load the location
-                self.game.load_location(location_id)
+        # Restore upgrade levels and quest progress (before the location, whose NPCs offer quests from it)
+        self.game.ship_upgrades = save_data["ship_upgrades"]
+        if hasattr(self.game, 'quest_manager'):
+            self.game.quest_manager.restore_state(save_data["quests"], self.game.player)
         
-        # Restore ship data if space travel exists
-        if "ship" in save_data and hasattr(self.game, 'space_travel') and hasattr(self.game.space_travel, 'ship'):
-            # Ship stats
-            self.game.space_travel.ship.hull_strength = save_data["ship"].get("hull_strength", 100)
-            self.game.space_travel.ship.shield_strength = save_data["ship"].get("shield_strength", 0)
-            
-            # Movement properties
-            self.game.space_travel.thrust_power = save_data["ship"].get("thrust_power", 0.1)
-            self.game.space_travel.rotation_speed = save_data["ship"].get("rotation_speed", 3)
-            self.game.space_travel.max_speed = save_data["ship"].get("max_speed", 5)
+        # Restore current location
+        location_id = save_data["current_location"]["id"]
+        
+        # Set docked location if applicable
+        if save_data["current_location"]["docked_location"]:
+            self.game.docked_location = save_data["current_location"]["docked_location"]
+            self.game.sync_map_location()
+        
+        # Load the location (only if we're not already there - then just re-bind its NPCs' quests)
+        if not self.game.current_level or self.game.current_level.get("name") != location_id:
+            self.game.load_location(location_id)
+        elif hasattr(self.game, 'refresh_npc_quests'):
+            self.game.refresh_npc_quests()
+        
+        # Ship data waits for the space scene unless it already exists
+        self.game.pending_ship_state = save_data["ship"]
+        if getattr(self.game, 'space_travel', None) is not None:
+            apply_ship_state(self.game.space_travel, self.game.pending_ship_state)
+            self.game.pending_ship_state = None
+        
+        # Anything the merchant had listed is out of date now
+        if hasattr(self.game, 'merchant_system'):
+            self.game.merchant_system.refresh_items_list(self.game)
         
         # Restore game flags
         if "game_flags" in save_data:
@@ -232,28 +575,32 @@ class SaveSystem:
         self.game.game_state = GameState.OVERWORLD
 
     def get_available_saves(self):
-        """Get a list of available save files"""
+        """Get a list of available save files (from the index; only changed files are read)"""
         saves = []
+        seen = set()
+        changed = False
         
         # Check each file in the saves directory
-        for filename in os.listdir(self.save_folder):
-            if filename.endswith('.json'):
+        with os.scandir(self.save_folder) as entries:
+            for entry in entries:
+                if not entry.name.endswith((SAVE_EXTENSION, LEGACY_SAVE_EXTENSION)):
+                    continue
+                filename = entry.name
+                seen.add(filename)
+                
+                # Index entries are only trusted while the file is unchanged
+                stats = self.file_stats(filename, entry.stat())
+                cached = self.index.get(filename)
+                if cached and self.index_stats.get(filename) == stats:
+                    saves.append(cached)
+                    continue
+                
                 try:
-                    # Read basic metadata
-                    save_path = os.path.join(self.save_folder, filename)
-                    with open(save_path, 'r') as f:
-                        save_data = json.load(f)
-                    
-                    # Extract useful info
-                    save_info = {
-                        "filename": filename,
-                        "save_name": save_data["meta"].get("save_name", filename),
-                        "timestamp": save_data["meta"].get("timestamp", "Unknown"),
-                        "location": save_data["current_location"].get("id", "Unknown"),
-                        "credits": save_data["player"].get("credits", 0)
-                    }
-                    
-                    saves.append(save_info)
+                    summary = self.read_summary(filename, entry.path)
+                    self.index[filename] = summary
+                    self.index_stats[filename] = stats
+                    saves.append(summary)
+                    changed = True
                 except:
                     # If there's an error reading the file, just use the filename
                     saves.append({
@@ -264,29 +611,43 @@ class SaveSystem:
                         "credits": 0
                     })
         
+        # Forget saves that were deleted
+        for filename in list(self.index):
+            if filename not in seen:
+                del self.index[filename]
+                self.index_stats.pop(filename, None)
+                changed = True
+        
+        if changed:
+            self.write_index()
+        
         # Sort by timestamp (newest first)
         saves.sort(key=lambda x: x["timestamp"], reverse=True)
         return saves
 
-    def quick_save(self):
+    def quick_save(self, callback=None):
         """Perform a quick save"""
         save_name = "quicksave"
-        return self.save_game(save_name)
+        return self.save_game(save_name, callback)
 
     def quick_load(self):
         """Load the most recent quicksave"""
-        saves = self.get_available_saves()
-        
-        # Find quicksave files
-        quicksaves = [save for save in saves if save["save_name"] == "quicksave"]
+        # Quick saves always overwrite the same file, so there's nothing to search for
+        self.writer.flush()  # A quick save may still be on its way to disk
+        for extension in (SAVE_EXTENSION, LEGACY_SAVE_EXTENSION):
+            filename = "quicksave" + extension
+            if os.path.exists(os.path.join(self.save_folder, filename)):
+                return self.load_game(filename)
         
-        if quicksaves:
-            # Sort by timestamp and load the most recent
-            quicksaves.sort(key=lambda x: x["timestamp"], reverse=True)
-            return self.load_game(quicksaves[0]["filename"])
-        else:
-            print("No quicksave found")
-            return False
+        print("No quicksave found")
+        return False
+    
+    def export_save(self, filename):
+        """Write a save out as readable JSON (saves/exports/) for debugging"""
+        self.writer.flush()
+        json_path = export_json(os.path.join(self.save_folder, filename))
+        print(f"Exported {filename} to {json_path}")
+        return json_path
 
 # Example method to add to your main game class to use the save system
 def add_save_system(self):
@@ -358,10 +719,10 @@ class SaveLoadMenu:
                 if event.key == pygame.K_RETURN:
                     # Save with current name
                     if self.input_text:
-                        game.save_system.save_game(self.input_text)
+                        game.save_system.save_game(self.input_text,
+                                                   lambda success, path, error: self.refresh_save_list(game))
                         self.input_active = False
                         self.input_text = ""
-                        self.refresh_save_list(game)
                 elif event.key == pygame.K_BACKSPACE:
                     self.input_text = self.input_text[:-1]
                 else:
@@ -392,8 +753,8 @@ class SaveLoadMenu:
                     else:
                         # Overwrite existing save
                         selected_save = self.save_items[self.selected_index - 1]  # -1 because "New Save" is at index 0
-                        game.save_system.save_game(selected_save["save_name"])
-                        self.refresh_save_list(game)
+                        game.save_system.save_game(selected_save["save_name"],
+                                                   lambda success, path, error: self.refresh_save_list(game))
                 
                 elif game.game_state == GameState.LOAD_MENU and self.save_items:
                     # Load selected save
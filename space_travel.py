@@ -1,8 +1,58 @@
 import pygame
 import math
 import random
+from array import array
 
 from asteroid import AsteroidField, ResourceRegistry, Asteroid, ResourceParticle
+from event_system import RESOURCE_COLLECTED, ASTEROID_DESTROYED
+
+# Shared grayscale palette so stars store a brightness byte instead of a color tuple
+STAR_COLORS = tuple((b, b, b) for b in range(256))
+
+class StarField:
+    """Array-backed background stars (one packed record per star instead of a dict)"""
+    __slots__ = ('xs', 'ys', 'sizes', 'brightness')
+    
+    def __init__(self):
+        self.xs = array('i')
+        self.ys = array('i')
+        self.sizes = array('B')
+        self.brightness = array('B')
+    
+    def add_star(self, x, y, size, brightness):
+        """Append a star record"""
+        self.xs.append(x)
+        self.ys.append(y)
+        self.sizes.append(size)
+        self.brightness.append(brightness)
+    
+    def __len__(self):
+        return len(self.xs)
+    
+    def __getitem__(self, index):
+        """Return a star in the old dict form (for debugging and older callers)"""
+        return {
+            'pos': [self.xs[index], self.ys[index]],
+            'size': self.sizes[index],
+            'color': STAR_COLORS[self.brightness[index]]
+        }
+    
+    def __iter__(self):
+        for i in range(len(self.xs)):
+            yield self[i]
+    
+    def draw(self, screen, camera_offset, view_width, view_height):
+        """Draw the stars that fall inside the view"""
+        cam_x = int(camera_offset[0])
+        cam_y = int(camera_offset[1])
+        colors = STAR_COLORS
+        draw_circle = pygame.draw.circle
+        for x, y, size, brightness in zip(self.xs, self.ys, self.sizes, self.brightness):
+            screen_x = x - cam_x
+            screen_y = y - cam_y
+            # Only draw if on screen
+            if 0 <= screen_x < view_width and 0 <= screen_y < view_height:
+                draw_circle(screen, colors[brightness], (screen_x, screen_y), size)
 
 # Space Travel MVP
 class SpaceTravel:
@@ -27,7 +77,7 @@ class SpaceTravel:
         self.friction = 0.98  # Slows ship gradually
         
         # Background stars
-        self.stars = []
+        self.stars = StarField()
         self.generate_stars(1500)  # Generate 1500 stars
         
         # Locations 
@@ -47,21 +97,21 @@ class SpaceTravel:
         self.weapon_damage = 30
         self.weapon_cooldown = 250  # milliseconds
         self.last_weapon_fire = 0
+        
+        # Game event bus (set by the game) for quest tracking
+        self.event_bus = None
+        self.location = "space"  # Location reported with mining events (open space)
 
     def generate_stars(self, count):
         """Generate random stars for the background"""
-        self.stars = []
+        self.stars = StarField()
         for _ in range(count):
             # Stars are positioned in world space
             x = random.randint(-5000, 5000)
             y = random.randint(-5000, 5000)
             size = random.randint(1, 3)
             brightness = random.randint(100, 255)
-            self.stars.append({
-                'pos': [x, y],
-                'size': size,
-                'color': (brightness, brightness, brightness)
-            })
+            self.stars.add_star(x, y, size, brightness)
         print(f"Generated {count} stars for space background")
     
     def add_location(self, location_id, name, x, y, color=(200, 200, 200)):
@@ -135,6 +185,9 @@ class SpaceTravel:
             if collected:
                 for resource_name, amount in collected:
                     print(f"Collected {amount} {resource_name}")
+                    if self.event_bus:
+                        self.event_bus.publish(RESOURCE_COLLECTED, resource=resource_name, amount=amount,
+                                                    location=self.location)
 
         # Check for nearby locations
         self.near_location = None
@@ -153,15 +206,7 @@ class SpaceTravel:
         screen.fill((0, 0, 0))
     
         # Draw stars
-        for star in self.stars:
-            # Convert world position to screen position
-            screen_x = int(star['pos'][0] - self.camera_offset[0])
-            screen_y = int(star['pos'][1] - self.camera_offset[1])
-        
-            # Only draw if on screen
-            if (0 <= screen_x < self.screen_width and 
-                0 <= screen_y < self.screen_height):
-                pygame.draw.circle(screen, star['color'], (screen_x, screen_y), star['size'])
+        self.stars.draw(screen, self.camera_offset, self.screen_width, self.screen_height)
     
         # Draw asteroid field
         if hasattr(self, 'asteroid_field'):
@@ -236,6 +281,9 @@ class SpaceTravel:
             destroyed_asteroids = self.asteroid_field.handle_weapon_hit(end_x, end_y, 15, self.weapon_damage)
             if destroyed_asteroids:
                 print(f"Hit {len(destroyed_asteroids)} asteroids!")
+                if self.event_bus:
+                    self.event_bus.publish(ASTEROID_DESTROYED, amount=len(destroyed_asteroids),
+                                                location=self.location)
         else:
             print("No asteroid field available")
         
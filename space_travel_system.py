@@ -4,6 +4,24 @@
 import pygame
 import math
 import random
+from collections import OrderedDict
+
+from event_scheduler import EventScheduler
+from quadtree import QuadTree, point_box, segment_box
+from route_planner import RoutePlanner
+
+# System map rendering
+MAP_TILE_SIZE = 256         # Pixels per side of a pre-rendered background tile
+MAX_MAP_TILES = 160         # Tiles kept across all zoom levels before the oldest are dropped
+MAX_LAYER_SIZE = 2048       # Largest zoom (in pixels across) that still caches connections as one layer
+MAP_ZOOM_STEPS = [1.0, 1.5, 2.0, 3.0, 4.0, 6.0, 8.0]  # Zoom levels, as multiples of the fit-to-view scale
+LABEL_CELL = 16             # Label density grid (pixels); a label is skipped if its cells are taken
+
+# Orbiting locations only re-measure a connection once it drifts this far (map units) from its stored length
+ROUTE_REMEASURE_THRESHOLD = 10
+
+# Travel events that stop the ship until the encounter is resolved
+ENCOUNTER_EVENTS = ["pirate_encounter", "syndicate_patrol", "military_inspection"]
 
 class Location:
     def __init__(self, name, description, map_file, position=(0, 0), faction=None):
@@ -17,10 +35,18 @@ class Location:
         self.available_quests = []
         self.available_services = []  # "shop", "repair", "fuel", etc.
         self.connected_locations = {}  # {location_id: distance}
+        self.system_map = None  # Set when added to a map, so connection changes reach its route cache
     
     def add_connection(self, location_id, distance):
         """Add a connected location that can be traveled to directly"""
         self.connected_locations[location_id] = distance
+        if self.system_map:
+            self.system_map.invalidate_routes()
+    
+    def remove_connection(self, location_id):
+        """Remove a direct connection"""
+        if self.connected_locations.pop(location_id, None) is not None and self.system_map:
+            self.system_map.invalidate_routes()
 
 
 class SystemMap:
@@ -31,10 +57,71 @@ class SystemMap:
         self.background = None
         self.player_location = None
         self.font = pygame.font.Font(None, 24)
+        self.route_planner = RoutePlanner(self)
+        self.route_version = 0  # Bumped when connection distances change
+        self.travel_options = {}  # {(metric, source): (route_version, options)}
+        
+        # Pre-rendered layers: background/rings/sun as tiles per zoom level, connections per scale and layout
+        self.layout_version = 0  # Bumped when locations move or connections change
+        self.tiles = OrderedDict()  # {(scale, column, row): surface}, least recently used first
+        self.tiles_key = None
+        self.background_mips = None  # [(scale, surface)] halving from the full background
+        self.spatial_index = None  # Quadtree of locations and connection segments
+        self.spatial_index_version = -1
+        self.connection_layer = None
+        self.connection_layer_key = None
+        self.label_surfaces = {}  # {location_id: (name, text, shadow)}
     
     def add_location(self, location_id, location):
         """Add a location to the system map"""
         self.locations[location_id] = location
+        location.system_map = self
+        self.invalidate_routes()
+    
+    def invalidate_routes(self):
+        """Drop cached routes after the map's connections change"""
+        self.route_planner.invalidate()
+        self.route_version += 1
+        self.layout_version += 1
+    
+    def update_positions(self, positions):
+        """Move locations ({location_id: (x, y)}) and re-measure only the connections touching them"""
+        changed = False
+        for location_id, position in positions.items():
+            location = self.locations.get(location_id)
+            if location:
+                location.position = position
+        
+        for location_id in positions:
+            location = self.locations.get(location_id)
+            if not location:
+                continue
+            for connected_id in location.connected_locations:
+                connected = self.locations.get(connected_id)
+                if not connected:
+                    continue
+                dx = location.position[0] - connected.position[0]
+                dy = location.position[1] - connected.position[1]
+                distance = int(math.sqrt(dx*dx + dy*dy))
+                
+                # Connections are usually two-way; keep both directions in step
+                if abs(location.connected_locations[connected_id] - distance) > ROUTE_REMEASURE_THRESHOLD:
+                    location.connected_locations[connected_id] = distance
+                    changed = True
+                if abs(connected.connected_locations.get(location_id, distance) - distance) > ROUTE_REMEASURE_THRESHOLD:
+                    connected.connected_locations[location_id] = distance
+                    changed = True
+        
+        # Routes only need replanning when a distance noticeably changed
+        if changed:
+            self.invalidate_routes()
+        else:
+            self.layout_version += 1  # Connection lines still follow the planets
+        return changed
+    
+    def find_route(self, destination_id, metric="distance", origin_id=None):
+        """Best route from the player's location (or origin_id); metric is distance, cost or danger"""
+        return self.route_planner.find_route(origin_id or self.player_location, destination_id, metric)
     
     def set_player_location(self, location_id):
         """Set the player's current location"""
@@ -43,93 +130,236 @@ class SystemMap:
             return True
         return False
     
-    def get_travel_options(self):
-        """Get locations the player can travel to from current location"""
+    def get_travel_options(self, metric="distance"):
+        """Get every location the player can reach, with the best route there (cached; don't modify it)"""
         if not self.player_location or self.player_location not in self.locations:
             return {}
         
-        current_location = self.locations[self.player_location]
-        options = {}
-        
-        for connected_id, distance in current_location.connected_locations.items():
-            if connected_id in self.locations:
-                options[connected_id] = {
-                    "location": self.locations[connected_id],
-                    "distance": distance,
-                    "cost": self._calculate_travel_cost(distance, self.locations[connected_id])
-                }
+        # Reused until a connection changes (moving planets only count once they drift past the threshold)
+        key = (metric, self.player_location)
+        cached = self.travel_options.get(key)
+        if cached is not None and cached[0] == self.route_version:
+            return cached[1]
         
+        options = {}
+        for destination_id, route in self.route_planner.reachable_routes(self.player_location, metric).items():
+            options[destination_id] = {
+                "location": self.locations[destination_id],
+                "distance": route["distance"],
+                "cost": route["cost"],
+                "danger": route["danger"],
+                "route": route["path"],
+                "legs": route["legs"]
+            }
+        
+        self.travel_options[key] = (self.route_version, options)
         return options
     
-    def travel_to(self, location_id):
-        """Travel to a new location if it's connected to current location"""
-        if not self.player_location:
-            # First-time initialization
-            return self.set_player_location(location_id)
-        
-        travel_options = self.get_travel_options()
-        if location_id in travel_options:
-            self.player_location = location_id
-            return True
-        
-        return False
-    
     def _calculate_travel_cost(self, distance, destination):
         """Calculate the cost to travel to a destination"""
         base_cost = distance * 10  # 10 credits per distance unit
         return base_cost + destination.travel_cost
     
-    def draw(self, screen, offset=(0, 0), scale=1.0):
-        """Draw the system map on the screen, 3/16/25"""
+    def get_background_mip(self, scale):
+        """Smallest pre-shrunk copy of the background that still has enough pixels for a scale"""
+        if self.background_mips is None or self.background_mips[0][1] is not self.background:
+            # Build the chain once: full size, half, quarter... down to a small thumbnail
+            mips = [(self.background.get_width() / self.width, self.background)]
+            surface = self.background
+            while surface.get_width() > 64 and surface.get_height() > 64:
+                surface = pygame.transform.smoothscale(surface, (surface.get_width() // 2, surface.get_height() // 2))
+                mips.append((surface.get_width() / self.width, surface))
+            self.background_mips = mips
+        
+        for mip_scale, surface in reversed(self.background_mips):
+            if mip_scale >= scale:
+                return mip_scale, surface
+        return self.background_mips[0]
+    
+    def render_tile(self, scale, column, row):
+        """Background, orbital rings and sun for one tile of the map at a zoom level"""
+        tile = pygame.Surface((MAP_TILE_SIZE, MAP_TILE_SIZE))
+        left = column * MAP_TILE_SIZE
+        top = row * MAP_TILE_SIZE
+        
         # Draw background if available
         if self.background:
-            scaled_bg = pygame.transform.scale(self.background, 
-                                              (int(self.width * scale), int(self.height * scale)))
-            screen.blit(scaled_bg, offset)
+            mip_scale, mip = self.get_background_mip(scale)
+            source = pygame.Rect(int(left * mip_scale / scale), int(top * mip_scale / scale),
+                                 math.ceil(MAP_TILE_SIZE * mip_scale / scale) + 1,
+                                 math.ceil(MAP_TILE_SIZE * mip_scale / scale) + 1).clip(mip.get_rect())
+            tile.fill((0, 0, 0))
+            if source.width and source.height:
+                size = (max(1, round(source.width * scale / mip_scale)), max(1, round(source.height * scale / mip_scale)))
+                tile.blit(pygame.transform.smoothscale(mip.subsurface(source), size),
+                          (source.x * scale / mip_scale - left, source.y * scale / mip_scale - top))
         else:
             # Create a space background
-            bg_rect = pygame.Rect(offset[0], offset[1], self.width * scale, self.height * scale)
-            pygame.draw.rect(screen, (5, 5, 20), bg_rect)
+            tile.fill((5, 5, 20))
     
         # Draw orbital rings if defined
-        center_x = offset[0] + (self.width/2) * scale
-        center_y = offset[1] + (self.height/2) * scale
+        center_x = (self.width/2) * scale - left
+        center_y = (self.height/2) * scale - top
+        nearest_x = max(0, min(MAP_TILE_SIZE, center_x))
+        nearest_y = max(0, min(MAP_TILE_SIZE, center_y))
+        nearest = math.hypot(nearest_x - center_x, nearest_y - center_y)
+        farthest = max(math.hypot(x - center_x, y - center_y)
+                       for x in (0, MAP_TILE_SIZE) for y in (0, MAP_TILE_SIZE))
     
         if hasattr(self, 'orbital_rings'):
             for radius in self.orbital_rings:
                 # Draw as a dotted circle
                 scaled_radius = radius * scale
-                points = 72  # number of points to approximate the circle
+                if not nearest - 2 <= scaled_radius <= farthest + 2:
+                    continue  # Ring doesn't cross this tile
+                
+                # Keep the dots about as far apart at every zoom level
+                points = max(72, int(2 * math.pi * scaled_radius / 6))
                 for i in range(points):
                     if i % 3 == 0:  # Skip every third point for dotted effect
                         continue
                     angle = 2 * math.pi * i / points
                     x1 = center_x + scaled_radius * math.cos(angle)
                     y1 = center_y + scaled_radius * math.sin(angle)
-                
-                    # Draw a small point or line segment
-                    pygame.draw.circle(screen, (50, 50, 80), (int(x1), int(y1)), 1)
+                    if -2 <= x1 <= MAP_TILE_SIZE + 2 and -2 <= y1 <= MAP_TILE_SIZE + 2:
+                        pygame.draw.circle(tile, (50, 50, 80), (int(x1), int(y1)), 1)
     
         # Draw the sun at the center
-        pygame.draw.circle(screen, (255, 255, 100), (int(center_x), int(center_y)), int(15 * scale))
-        pygame.draw.circle(screen, (255, 200, 0), (int(center_x), int(center_y)), int(10 * scale))
+        pygame.draw.circle(tile, (255, 255, 100), (int(center_x), int(center_y)), int(15 * scale))
+        pygame.draw.circle(tile, (255, 200, 0), (int(center_x), int(center_y)), int(10 * scale))
+        
+        return tile
     
+    def get_tile(self, scale, column, row):
+        """A cached tile, rendering it the first time that zoom level shows it"""
+        key = (self.background, tuple(getattr(self, 'orbital_rings', ())))
+        if key != self.tiles_key:
+            self.tiles.clear()
+            self.tiles_key = key
+        
+        tile_key = (scale, column, row)
+        tile = self.tiles.get(tile_key)
+        if tile is None:
+            tile = self.render_tile(scale, column, row)
+            self.tiles[tile_key] = tile
+            if len(self.tiles) > MAX_MAP_TILES:
+                self.tiles.popitem(last=False)
+        else:
+            self.tiles.move_to_end(tile_key)
+        return tile
+    
+    def get_spatial_index(self):
+        """Quadtree of locations and connections, rebuilt when the layout changes"""
+        if self.spatial_index is not None and self.spatial_index_version == self.layout_version:
+            return self.spatial_index
+        
+        index = QuadTree((0, 0, self.width, self.height))
+        for loc_id, location in self.locations.items():
+            index.insert(("location", loc_id), point_box(*location.position))
+            for connected_id in location.connected_locations:
+                connected = self.locations.get(connected_id)
+                if connected is None:
+                    continue
+                # Two-way connections are drawn once
+                if connected_id < loc_id and loc_id in connected.connected_locations:
+                    continue
+                index.insert(("route", loc_id, connected_id), segment_box(location.position, connected.position))
+        
+        self.spatial_index = index
+        self.spatial_index_version = self.layout_version
+        return index
+    
+    def get_visible(self, view_box):
+        """Ids of locations and (from, to) connections inside a box of map units"""
+        locations, routes = [], []
+        for item in self.get_spatial_index().query(view_box):
+            if item[0] == "location":
+                locations.append(item[1])
+            else:
+                routes.append(item[1:])
+        return locations, routes
+    
+    def get_connection_layer(self, scale):
+        """Connection lines, redrawn only when the scale or the layout changes"""
+        key = (scale, self.layout_version)
+        if self.connection_layer is not None and self.connection_layer_key == key:
+            return self.connection_layer
+        
+        size = (max(1, int(self.width * scale)), max(1, int(self.height * scale)))
+        layer = pygame.Surface(size, pygame.SRCALPHA)
+        
         # Draw connections between locations
         for loc_id, location in self.locations.items():
-            loc_pos = (offset[0] + location.position[0] * scale, 
-                     offset[1] + location.position[1] * scale)
+            loc_pos = (location.position[0] * scale, location.position[1] * scale)
         
             for connected_id in location.connected_locations:
                 if connected_id in self.locations:
                     connected_loc = self.locations[connected_id]
-                    connected_pos = (offset[0] + connected_loc.position[0] * scale,
-                                   offset[1] + connected_loc.position[1] * scale)
+                    connected_pos = (connected_loc.position[0] * scale,
+                                   connected_loc.position[1] * scale)
                 
                     # Draw line between locations
-                    pygame.draw.line(screen, (40, 40, 70), loc_pos, connected_pos, 1)
+                    pygame.draw.line(layer, (40, 40, 70), loc_pos, connected_pos, 1)
+        
+        self.connection_layer = layer
+        self.connection_layer_key = key
+        return layer
+    
+    def get_label(self, loc_id, location):
+        """Name and shadow text for a location, rendered once"""
+        label = self.label_surfaces.get(loc_id)
+        if label is None or label[0] != location.name:
+            label = (location.name,
+                     self.font.render(location.name, True, (255, 255, 255)),
+                     self.font.render(location.name, True, (0, 0, 0)))
+            self.label_surfaces[loc_id] = label
+        return label[1], label[2]
+    
+    def label_priority(self, loc_id):
+        """Sort key for labels: the player's location, then the best-connected hubs"""
+        location = self.locations[loc_id]
+        return (loc_id != self.player_location, -len(location.connected_locations), location.name)
+    
+    def draw(self, screen, offset=(0, 0), scale=1.0, view_rect=None):
+        """Draw the part of the system map inside view_rect (default: the whole screen), 3/16/25"""
+        view_rect = pygame.Rect(view_rect or screen.get_rect())
+        previous_clip = screen.get_clip()
+        screen.set_clip(view_rect.clip(previous_clip) if previous_clip else view_rect)
+        
+        # Visible part of the map, in map units (a margin keeps markers and labels at the edge)
+        margin = 40 / scale
+        view_box = ((view_rect.left - offset[0]) / scale - margin, (view_rect.top - offset[1]) / scale - margin,
+                    (view_rect.right - offset[0]) / scale + margin, (view_rect.bottom - offset[1]) / scale + margin)
+        
+        # Background tiles for this zoom level; only the ones on screen are drawn (or rendered)
+        map_pixels = (math.ceil(self.width * scale), math.ceil(self.height * scale))
+        first_column = max(0, int((view_rect.left - offset[0]) // MAP_TILE_SIZE))
+        last_column = min((map_pixels[0] - 1) // MAP_TILE_SIZE, int((view_rect.right - offset[0]) // MAP_TILE_SIZE))
+        first_row = max(0, int((view_rect.top - offset[1]) // MAP_TILE_SIZE))
+        last_row = min((map_pixels[1] - 1) // MAP_TILE_SIZE, int((view_rect.bottom - offset[1]) // MAP_TILE_SIZE))
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                tile_pos = (offset[0] + column * MAP_TILE_SIZE, offset[1] + row * MAP_TILE_SIZE)
+                area = pygame.Rect(0, 0, min(MAP_TILE_SIZE, map_pixels[0] - column * MAP_TILE_SIZE),
+                                   min(MAP_TILE_SIZE, map_pixels[1] - row * MAP_TILE_SIZE))
+                screen.blit(self.get_tile(scale, column, row), tile_pos, area)
+        
+        visible_locations, visible_routes = self.get_visible(view_box)
+        
+        # Connections: one cached layer while zoomed out, otherwise just the visible segments
+        if max(map_pixels) <= MAX_LAYER_SIZE:
+            screen.blit(self.get_connection_layer(scale), offset)
+        else:
+            for loc_id, connected_id in visible_routes:
+                start = self.locations[loc_id].position
+                end = self.locations[connected_id].position
+                pygame.draw.line(screen, (40, 40, 70),
+                                 (offset[0] + start[0] * scale, offset[1] + start[1] * scale),
+                                 (offset[0] + end[0] * scale, offset[1] + end[1] * scale), 1)
     
         # Draw locations
-        for loc_id, location in self.locations.items():
+        for loc_id in visible_locations:
+            location = self.locations[loc_id]
             loc_pos = (offset[0] + location.position[0] * scale, 
                      offset[1] + location.position[1] * scale)
         
@@ -142,41 +372,56 @@ class SystemMap:
             elif location.faction == "pallas":
                 color = (150, 0, 150)  # Purple for Pallas
         
-            # Draw location circle - highlight current location
+            # Draw location circle - highlight current location (markers stay readable when zoomed out)
             radius = 8 if loc_id == self.player_location else 5
-            pygame.draw.circle(screen, color, loc_pos, int(radius * scale))
+            pygame.draw.circle(screen, color, loc_pos, max(2, int(radius * scale)))
         
             # Add a pulsing highlight for the current location
             if loc_id == self.player_location:
                 pulse = (pygame.time.get_ticks() % 1000) / 1000.0
                 pulse_radius = (8 + 4 * pulse) * scale
-                pygame.draw.circle(screen, color, loc_pos, int(pulse_radius), 1)
+                pygame.draw.circle(screen, color, loc_pos, max(4, int(pulse_radius)), 1)
         
-            # Draw location name with shadow for better visibility
-            name_text = self.font.render(location.name, True, (255, 255, 255))
-            shadow_text = self.font.render(location.name, True, (0, 0, 0))
+        # Labels, most important first; any that would land on one already drawn are culled
+        taken = set()
+        for loc_id in sorted(visible_locations, key=self.label_priority):
+            location = self.locations[loc_id]
+            name_text, shadow_text = self.get_label(loc_id, location)
         
             # Offset based on map section to prevent overlap
             name_offset_y = 10
             if location.position[1] > self.height/2:
                 name_offset_y = -25  # Above the circle if in lower half
             
-            screen.blit(shadow_text, (loc_pos[0] - name_text.get_width() // 2 + 1, 
-                                    loc_pos[1] + name_offset_y + 1))
-            screen.blit(name_text, (loc_pos[0] - name_text.get_width() // 2, 
-                                  loc_pos[1] + name_offset_y))
+            label_x = offset[0] + location.position[0] * scale - name_text.get_width() // 2
+            label_y = offset[1] + location.position[1] * scale + name_offset_y
+            cells = {(x, y)
+                     for x in range(int(label_x // LABEL_CELL), int((label_x + name_text.get_width()) // LABEL_CELL) + 1)
+                     for y in range(int(label_y // LABEL_CELL), int((label_y + name_text.get_height()) // LABEL_CELL) + 1)}
+            if cells & taken:
+                continue
+            taken |= cells
+            
+            screen.blit(shadow_text, (label_x + 1, label_y + 1))
+            screen.blit(name_text, (label_x, label_y))
+        
+        screen.set_clip(previous_clip)
 
 
 class SpaceTravel:
-    def __init__(self, system_map, player):
+    def __init__(self, system_map, player, rng=None):
         self.system_map = system_map
         self.player = player
+        self.rng = rng or random  # Pass a random.Random to replay a trip
         self.travel_state = "idle"  # "idle", "traveling", "encounter"
         self.travel_progress = 0.0  # 0.0 to 1.0
         self.travel_speed = 0.05  # Progress increment per update
         self.destination = None
         self.origin = None
-        self.travel_events = []
+        self.travel_events = EventScheduler()  # Keyed by trip progress
+        self.current_encounter = None
+        self.event_log = []  # (progress, event type) for everything that happened this trip
+        self.dry_run = False  # Simulated trips don't charge the player or move them on the map
         
         # For visual effect during travel
         self.stars = []
@@ -187,34 +432,35 @@ class SpaceTravel:
                 random.random() + 0.5    # speed
             ])
     
-    def start_travel(self, destination_id):
-        """Start traveling to a new location"""
+    def start_travel(self, destination_id, metric="distance"):
+        """Start traveling to a new location along the best route by metric"""
         if self.travel_state != "idle":
             return False
         
-        travel_options = self.system_map.get_travel_options()
+        travel_options = self.system_map.get_travel_options(metric)
         if destination_id not in travel_options:
             return False
         
         travel_info = travel_options[destination_id]
         travel_cost = travel_info["cost"]
         
-        # Check if player can afford travel
-        if self.player.credits < travel_cost:
-            return False
-        
-        # Deduct credits
-        self.player.credits -= travel_cost
+        if not self.dry_run:
+            # Check if player can afford travel
+            if self.player.credits < travel_cost:
+                return False
+            
+            # Deduct credits
+            self.player.credits -= travel_cost
         
         # Start travel
         self.travel_state = "traveling"
         self.travel_progress = 0.0
         self.destination = destination_id
         self.origin = self.system_map.player_location
+        self.event_log = []
         
-        # Generate random events based on distance and danger
-        self._generate_travel_events(travel_info["distance"], 
-                                    self.system_map.locations[destination_id].danger_level)
+        # Generate random events based on distance and the most dangerous stop on the way
+        self._generate_travel_events(travel_info["distance"], travel_info["danger"])
         
         return True
     
@@ -233,60 +479,111 @@ class SpaceTravel:
                     star[0] = 800
                     star[1] = random.randint(0, 600)
             
-            # Check for events at certain progress points
-            for event in self.travel_events[:]:
-                if event["progress"] <= self.travel_progress:
-                    self.travel_events.remove(event)
-                    self._handle_travel_event(event)
+            # Handle events the ship has reached (stops early for an encounter)
+            self._run_due_events()
             
             # Check if travel is complete
-            if self.travel_progress >= 1.0:
+            if self.travel_state == "traveling" and self.travel_progress >= 1.0:
                 self.complete_travel()
         
         elif self.travel_state == "encounter":
-            # Handle encounter state
-            # This would be implemented based on your encounter system
+            # Travel is held until the encounter system calls resume_travel()
             pass
     
+    def _run_due_events(self):
+        """Handle queued events up to the current progress, in order"""
+        while True:
+            due = self.travel_events.pop_next(self.travel_progress)
+            if due is None:
+                return
+            progress, event = due
+            self.event_log.append((progress, event["type"]))
+            self._handle_travel_event(event)
+            if self.travel_state == "encounter":
+                self.travel_progress = progress  # The ship stops where it was intercepted
+                return
+    
+    def resume_travel(self):
+        """Carry on after an encounter"""
+        if self.travel_state == "encounter":
+            self.travel_state = "traveling"
+            self.current_encounter = None
+            self.travel_events.resume()
+    
+    def fast_forward(self, progress=1.0):
+        """Skip ahead, resolving every event on the way; stops early at an encounter"""
+        if self.travel_state != "traveling":
+            return
+        self.travel_progress = max(self.travel_progress, min(progress, 1.0))
+        self._run_due_events()
+        if self.travel_state == "traveling" and self.travel_progress >= 1.0:
+            self.complete_travel()
+    
+    def cancel_events(self, event_type):
+        """Drop every upcoming event of one type (e.g. a scanner steering around debris)"""
+        return self.travel_events.cancel_where(lambda event: event["type"] == event_type)
+    
+    def simulate_trip(self, destination_id, resolve_encounter=None, metric="distance"):
+        """Fly a whole trip without drawing; returns the event log, or None if the trip can't start"""
+        # resolve_encounter(trip, event) decides each encounter; the trip then carries on unless it was cancelled.
+        # A separate dry-run SpaceTravel flies it, so credits, the map and any trip in progress are untouched
+        trip = SpaceTravel(self.system_map, self.player, self.rng)
+        trip.dry_run = True
+        if not trip.start_travel(destination_id, metric):
+            return None
+        
+        while trip.travel_state != "idle":
+            trip.fast_forward()
+            if trip.travel_state == "encounter":
+                if resolve_encounter:
+                    resolve_encounter(trip, trip.current_encounter)
+                trip.resume_travel()
+        
+        return trip.event_log
+    
     def complete_travel(self):
         """Complete travel and arrive at destination"""
         if self.destination:
-            self.system_map.set_player_location(self.destination)
+            if not self.dry_run:
+                self.system_map.set_player_location(self.destination)
             self.travel_state = "idle"
             self.destination = None
             self.origin = None
-            self.travel_events = []
+            self.current_encounter = None
+            self.travel_events.clear()
+            self.travel_events.resume()
     
     def cancel_travel(self):
         """Cancel travel and return to origin"""
         if self.origin:
-            self.system_map.set_player_location(self.origin)
+            if not self.dry_run:
+                self.system_map.set_player_location(self.origin)
             self.travel_state = "idle"
             self.destination = None
             self.origin = None
-            self.travel_events = []
+            self.current_encounter = None
+            self.travel_events.clear()
+            self.travel_events.resume()
     
     def _generate_travel_events(self, distance, danger_level):
-        """Generate random events during travel"""
-        self.travel_events = []
+        """Generate random events during travel (the whole trip's timeline is queued up front)"""
+        self.travel_events.clear()
+        self.travel_events.resume()
         
         # Number of potential events based on distance and danger
         num_events = int(distance / 20) + int(danger_level / 2)
         
         for _ in range(num_events):
             # Only generate an event if random check passes
-            if random.random() < 0.3 + (danger_level / 20):
-                progress = random.uniform(0.2, 0.9)
+            if self.rng.random() < 0.3 + (danger_level / 20):
+                progress = self.rng.uniform(0.2, 0.9)
                 event_type = self._get_random_event_type(danger_level)
                 
-                self.travel_events.append({
+                self.travel_events.schedule(progress, {
                     "progress": progress,
                     "type": event_type,
                     "handled": False
                 })
-        
-        # Sort events by progress
-        self.travel_events.sort(key=lambda x: x["progress"])
     
     def _get_random_event_type(self, danger_level):
         """Get a random event type based on danger level"""
@@ -298,16 +595,18 @@ class SpaceTravel:
         if danger_level > 6:
             possible_events.extend(["syndicate_patrol", "military_inspection"])
         
-        return random.choice(possible_events)
+        return self.rng.choice(possible_events)
     
     def _handle_travel_event(self, event):
         """Handle a travel event"""
         event_type = event["type"]
+        event["handled"] = True
         
-        if event_type in ["pirate_encounter", "syndicate_patrol", "military_inspection"]:
+        if event_type in ENCOUNTER_EVENTS:
             # These events pause travel for an encounter
             self.travel_state = "encounter"
-            # Additional encounter handling would go here
+            self.current_encounter = event
+            self.travel_events.pause()
         
         # Other events might just have effects without pausing
         elif event_type == "asteroid_field":
@@ -392,3 +691,6 @@ class SpaceTravel:
 # 
 # # Create space travel system
 # space_travel = SpaceTravel(system_map, player)
+# 
+# # Fly a trip headless (e.g. to tune encounter rates)
+# log = SpaceTravel(system_map, player, random.Random(7)).simulate_trip("pallas")
@@ -0,0 +1,224 @@
+# Asteroid Frontier RPG
+# String Tables and Localization
+
+import json
+import os
+import struct
+from array import array
+
+# Compact table file: header, (count + 1) uint32 offsets, then one UTF-8 blob
+STRING_TABLE_MAGIC = b"AFST"
+STRING_TABLE_VERSION = 1
+STRING_TABLE_HEADER = struct.Struct("<4sHHI")  # magic, version, section number, count
+
+# String ids are (section number << SECTION_SHIFT) | index within the section
+SECTION_SHIFT = 16
+SECTION_MASK = (1 << SECTION_SHIFT) - 1
+
+STRINGS_DIR = os.path.join('assets', 'strings')
+
+
+def location_section(location_id):
+    """Section name holding the NPC lines for a location"""
+    return f"location_{location_id}"
+
+
+class StringTable:
+    """Build-time table: interns strings of one section to small integer ids"""
+    def __init__(self, name, number):
+        self.name = name
+        self.number = number
+        self.strings = []
+        self.index = {}  # {text: id}
+
+    def intern(self, text):
+        """Get the id for text, adding it if needed"""
+        string_id = self.index.get(text)
+        if string_id is None:
+            if len(self.strings) > SECTION_MASK:
+                raise ValueError(f"String section '{self.name}' is full")
+            string_id = (self.number << SECTION_SHIFT) | len(self.strings)
+            self.strings.append(text)
+            self.index[text] = string_id
+        return string_id
+
+    def to_bytes(self):
+        """Encode as the compact on-disk format"""
+        blob = bytearray()
+        offsets = array('I', [0])
+        for text in self.strings:
+            blob += text.encode('utf-8')
+            offsets.append(len(blob))
+        header = STRING_TABLE_HEADER.pack(STRING_TABLE_MAGIC, STRING_TABLE_VERSION, self.number, len(self.strings))
+        return header + offsets.tobytes() + bytes(blob)
+
+
+class PackedStringTable:
+    """Runtime table: offsets plus one bytes blob, strings decoded only when asked for"""
+    __slots__ = ('number', 'count', 'offsets', 'blob')
+
+    def __init__(self, number, offsets, blob):
+        self.number = number
+        self.count = len(offsets) - 1
+        self.offsets = offsets
+        self.blob = blob
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decode a table written by StringTable.to_bytes()"""
+        magic, version, number, count = STRING_TABLE_HEADER.unpack_from(data, 0)
+        if magic != STRING_TABLE_MAGIC or version != STRING_TABLE_VERSION:
+            raise ValueError("Not a string table (or unsupported version)")
+
+        start = STRING_TABLE_HEADER.size
+        end = start + (count + 1) * 4
+        offsets = array('I')
+        offsets.frombytes(data[start:end])
+        return cls(number, offsets, bytes(data[end:]))
+
+    def get(self, index):
+        """Decode the string at an index within this section"""
+        return self.blob[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+
+
+class StringTableBuilder:
+    """Collects every player-visible string into numbered sections and writes them per language"""
+    def __init__(self):
+        self.sections = {}  # {name: StringTable}, in section-number order
+
+    def section(self, name):
+        """Get (or create) a section by name"""
+        table = self.sections.get(name)
+        if table is None:
+            table = StringTable(name, len(self.sections))
+            self.sections[name] = table
+        return table
+
+    def intern(self, section_name, text):
+        """Intern text into a section and return its id"""
+        return self.section(section_name).intern(text)
+
+    def write(self, language="en", directory=STRINGS_DIR):
+        """Write one .strtab file per section plus the manifest"""
+        language_dir = os.path.join(directory, language)
+        os.makedirs(language_dir, exist_ok=True)
+
+        for name, table in self.sections.items():
+            with open(os.path.join(language_dir, f"{name}.strtab"), 'wb') as file:
+                file.write(table.to_bytes())
+
+        with open(os.path.join(language_dir, 'manifest.json'), 'w') as file:
+            json.dump({"sections": list(self.sections)}, file, indent=2)
+
+        return len(self.sections)
+
+
+class Localization:
+    """Looks up string ids for one language, loading sections only when first used"""
+    def __init__(self, language="en", directory=STRINGS_DIR, fallback="en"):
+        self.language = language
+        self.directory = directory
+        self.fallback = fallback
+        self.section_names = None  # Loaded from the manifest on first use
+        self.tables = {}  # {section number: PackedStringTable}
+
+    @property
+    def available(self):
+        """Whether string tables have been built for this language (or its fallback)"""
+        return self._load_manifest() is not None
+
+    def _load_manifest(self):
+        if self.section_names is None:
+            for language in (self.language, self.fallback):
+                try:
+                    with open(os.path.join(self.directory, language, 'manifest.json'), 'r') as file:
+                        self.section_names = json.load(file)["sections"]
+                        break
+                except (FileNotFoundError, json.JSONDecodeError, KeyError):
+                    continue
+        return self.section_names
+
+    def _load_section(self, number):
+        """Read a section for the current language, falling back to the source language"""
+        name = self._load_manifest()[number]
+        for language in (self.language, self.fallback):
+            try:
+                with open(os.path.join(self.directory, language, f"{name}.strtab"), 'rb') as file:
+                    table = PackedStringTable.from_bytes(file.read())
+                self.tables[number] = table
+                return table
+            except FileNotFoundError:
+                continue
+        raise KeyError(f"Missing string section '{name}'")
+
+    def get(self, string_id):
+        """Get the text for a string id"""
+        number = string_id >> SECTION_SHIFT
+        table = self.tables.get(number)
+        if table is None:
+            table = self._load_section(number)
+        return table.get(string_id & SECTION_MASK)
+
+    def resolve(self, value):
+        """Text for ids, anything else passes through unchanged"""
+        if isinstance(value, int):
+            return self.get(value)
+        return value
+
+    def load_section(self, name):
+        """Load a section ahead of time (e.g. on entering a location)"""
+        names = self._load_manifest()
+        if names and name in names:
+            number = names.index(name)
+            if number not in self.tables:
+                self._load_section(number)
+            return True
+        return False
+
+    def unload_section(self, name):
+        """Drop a section so text memory tracks what's in use"""
+        names = self._load_manifest()
+        if names and name in names:
+            self.tables.pop(names.index(name), None)
+
+    def set_language(self, language):
+        """Switch language; sections reload lazily"""
+        self.language = language
+        self.section_names = None
+        self.tables.clear()
+
+
+def build_string_tables(npcs_data, quests_data, items_data, language="en"):
+    """Intern all game text into sections, write the tables and a dialogue pack that uses their ids"""
+    from dialogue_quest_system import DialogueCompiler
+
+    builder = StringTableBuilder()
+    builder.section("ui")  # Shared dialogue/menu strings first so they get section 0
+
+    # Quest and item text each get a section
+    for quest_data in quests_data:
+        builder.intern("quests", quest_data.get("title", ""))
+        builder.intern("quests", quest_data.get("description", ""))
+        for objective in quest_data.get("objectives", []):
+            text = objective.get("description", "") if isinstance(objective, dict) else objective
+            builder.intern("quests", text)
+
+    for item_data in items_data:
+        builder.intern("items", item_data.get("name", ""))
+        builder.intern("items", item_data.get("description", ""))
+
+    # NPC lines are grouped by location so they can be loaded with the map
+    pack = DialogueCompiler.build_pack(npcs_data, builder)
+
+    builder.write(language)
+    with open(os.path.join('assets', 'dialogues', 'dialogue_pack.json'), 'w') as file:
+        json.dump(pack, file, separators=(',', ':'))
+
+    return builder
+
+
+# Example usage:
+# builder = build_string_tables(npcs_data, quests_data, items_data)
+# strings = Localization("en")
+# strings.load_section(location_section("psyche_township"))
+# text = strings.get(string_id)
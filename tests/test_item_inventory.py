@@ -0,0 +1,36 @@
+# Asteroid Frontier RPG
+# Inventory tests
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from item_inventory import Inventory, Item
+
+
+def make_inventory(*item_ids):
+    inventory = Inventory()
+    for item_id in item_ids:
+        inventory.add_item(Item(item_id, item_id.title(), "", 1))
+    return inventory
+
+
+def test_remove_middle_slot_keeps_order():
+    inventory = make_inventory("wrench", "medkit", "scanner", "rope", "fuel_cell")
+    
+    removed = inventory.remove_item(1)
+    
+    assert removed.id == "medkit"
+    assert [item.id for item in inventory.items] == ["wrench", "scanner", "rope", "fuel_cell"]
+    # Slot lookups follow the shifted items
+    for index, item in enumerate(inventory.items):
+        assert inventory.slot_index[id(item)] == index
+
+
+def test_remove_by_id_keeps_order():
+    inventory = make_inventory("wrench", "medkit", "scanner", "rope")
+    
+    assert inventory.remove_item_by_id("scanner") == 1
+    assert [item.id for item in inventory.items] == ["wrench", "medkit", "rope"]
+    assert inventory.find_item("rope") is inventory.items[2]
@@ -0,0 +1,75 @@
+# Asteroid Frontier RPG
+# Text Layout Cache
+
+from collections import OrderedDict
+
+import pygame
+
+
+def wrap_words(text, font, max_width):
+    """Greedy word wrap measuring each word once instead of every candidate line"""
+    space_width = font.size(' ')[0]
+    lines = []
+    current_line = []
+    current_width = 0
+
+    for word in text.split(' '):
+        word_width = font.size(word)[0]
+        test_width = current_width + space_width + word_width if current_line else word_width
+        if test_width <= max_width or not current_line:
+            current_line.append(word)
+            current_width = test_width
+        else:
+            lines.append(' '.join(current_line))
+            current_line = [word]
+            current_width = word_width
+
+    if current_line:
+        lines.append(' '.join(current_line))
+
+    return lines
+
+
+class TextLayoutCache:
+    """LRU cache of layouts keyed by whatever identifies them, e.g. (text, font, width)"""
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key, build):
+        """Return the cached layout for key, calling build() on a miss"""
+        layout = self.entries.get(key)
+        if layout is not None:
+            self.entries.move_to_end(key)
+            return layout
+
+        layout = build()
+        self.entries[key] = layout
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)  # Drop the least recently used
+        return layout
+
+    def wrap(self, text, font, max_width):
+        """Cached line breaks for text"""
+        return self.get(("wrap", text, font, max_width), lambda: tuple(wrap_words(text, font, max_width)))
+
+    def render_lines(self, text, font, max_width, color):
+        """Cached (lines, surfaces) for wrapped text"""
+        def build():
+            lines = self.wrap(text, font, max_width)
+            return lines, tuple(font.render(line, True, color) for line in lines)
+        return self.get(("render", text, font, max_width, color), build)
+
+    def clear(self):
+        """Forget every cached layout (e.g. after a font change)"""
+        self.entries.clear()
+
+
+# Shared cache for UI text
+text_layout_cache = TextLayoutCache()
+
+
+# Example usage:
+# lines, surfaces = text_layout_cache.render_lines("Welcome to Psyche Township.", font, 400, (255, 255, 255))
+# for i, surface in enumerate(surfaces):
+#     screen.blit(surface, (20, 50 + i * 30))